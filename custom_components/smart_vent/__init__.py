@@ -1,74 +1,391 @@
 """Smart Ventilation Controller for Home Assistant."""
 import logging
+import os
+from typing import Any
 
 import voluptuous as vol
 
-from datetime import timedelta
-
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_state_change_event, async_track_time_interval
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import (
+    ConfigEntryError,
+    HomeAssistantError,
+    ServiceValidationError,
+)
 from homeassistant.helpers.discovery import async_load_platform
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 
 from .const import (
+    BOOST_CONTROL_CLOSED_LOOP,
+    BOOST_CONTROL_FIXED,
     DOMAIN,
+    DEFAULT_AIRFLOW_BUDGET,
     DEFAULT_CHECK_INTERVAL,
+    DEFAULT_SCHEDULING,
     DEFAULT_MAX_BOOSTS_PER_DAY,
+    DEFAULT_RESEND_INTERVAL,
     DEFAULT_AUTO_BOOST_DURATION,
+    DEFAULT_AUTO_BOOST_TRIGGER,
+    DEFAULT_BOOST_AIRFLOW,
+    DEFAULT_BOOST_CONTROL,
+    DEFAULT_HUMIDITY_FILTER,
+    DEFAULT_HUMIDITY_FUSION,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_MID_CONTROL,
+    DEFAULT_SETTLE_TIME,
     DEFAULT_SPEEDS,
+    DEFAULT_STARTUP_TIMEOUT,
+    DEFAULT_SWITCH_POSITIONS,
+    DEFAULT_ZONE_ID,
+    EXPORT_CSV,
+    EXPORT_DIRECTORY,
+    EXPORT_FORMATS,
+    FUSION_POLICIES,
+    MAX_SWITCH_INPUTS,
+    MID_CONTROL_FIXED,
+    MID_CONTROL_PROPORTIONAL,
+    MODE_BOOST,
+    MODE_LOW,
+    MODE_MID,
+    SCHEDULING_EVENT,
+    SCHEDULING_INTERVAL,
+    TRACE_MODES,
+    TRIGGER_DELTA,
+    TRIGGER_LEVEL,
+    TRIGGER_RATE,
+    WEEKDAYS,
 )
+from . import clock
 from .coordinator import SmartVentCoordinator
+from .diagnostics import manager_diagnostics, zone_diagnostics
+from .history import RECORD, export
+from .manager import SmartVentManager
 
 _LOGGER = logging.getLogger(__name__)
 
-# Configuration schema
-CONFIG_SCHEMA = vol.Schema(
+PLATFORMS = [Platform.FAN, Platform.BINARY_SENSOR, Platform.SENSOR]
+
+# Auto-boost humidity trigger schema
+AUTO_BOOST_TRIGGER_SCHEMA = vol.Schema(
+    {
+        vol.Optional("type", default=DEFAULT_AUTO_BOOST_TRIGGER["type"]): vol.In(
+            [TRIGGER_LEVEL, TRIGGER_RATE, TRIGGER_DELTA]
+        ),
+        vol.Optional(
+            "threshold", default=DEFAULT_AUTO_BOOST_TRIGGER["threshold"]
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+        vol.Optional("rate", default=DEFAULT_AUTO_BOOST_TRIGGER["rate"]): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=50)
+        ),
+        vol.Optional("delta", default=DEFAULT_AUTO_BOOST_TRIGGER["delta"]): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=100)
+        ),
+        vol.Optional("window", default=DEFAULT_AUTO_BOOST_TRIGGER["window"]): vol.All(
+            vol.Coerce(int), vol.Range(min=3, max=1000)
+        ),
+        vol.Optional("max_age", default=DEFAULT_AUTO_BOOST_TRIGGER["max_age"]): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=1440)
+        ),
+    }
+)
+
+def _validate_boost_durations(value: dict[str, Any]) -> dict[str, Any]:
+    """Ensure the minimum boost duration does not exceed the maximum."""
+    if value["min_duration"] > value["max_duration"]:
+        raise vol.Invalid("min_duration must not be greater than max_duration")
+    return value
+
+
+# Auto-boost control schema
+BOOST_CONTROL_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("mode", default=DEFAULT_BOOST_CONTROL["mode"]): vol.In(
+                [BOOST_CONTROL_FIXED, BOOST_CONTROL_CLOSED_LOOP]
+            ),
+            vol.Optional(
+                "off_threshold", default=DEFAULT_BOOST_CONTROL["off_threshold"]
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Optional(
+                "baseline_margin", default=DEFAULT_BOOST_CONTROL["baseline_margin"]
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+            vol.Optional(
+                "min_duration", default=DEFAULT_BOOST_CONTROL["min_duration"]
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+            vol.Optional(
+                "max_duration", default=DEFAULT_BOOST_CONTROL["max_duration"]
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=240)),
+        }
+    ),
+    _validate_boost_durations,
+)
+
+# Mid position speed control schema
+MID_CONTROL_SCHEMA = vol.Schema(
     {
-        DOMAIN: vol.Schema(
+        vol.Optional("mode", default=DEFAULT_MID_CONTROL["mode"]): vol.In(
+            [MID_CONTROL_FIXED, MID_CONTROL_PROPORTIONAL]
+        ),
+        vol.Optional("setpoint", default=DEFAULT_MID_CONTROL["setpoint"]): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional("kp", default=DEFAULT_MID_CONTROL["kp"]): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional("ki", default=DEFAULT_MID_CONTROL["ki"]): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional("step", default=DEFAULT_MID_CONTROL["step"]): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+        vol.Optional(
+            "min_interval", default=DEFAULT_MID_CONTROL["min_interval"]
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+    }
+)
+
+# Humidity input filter schema
+HUMIDITY_FILTER_SCHEMA = vol.Schema(
+    {
+        vol.Optional("deadband", default=DEFAULT_HUMIDITY_FILTER["deadband"]): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=20)
+        ),
+        vol.Optional(
+            "min_interval", default=DEFAULT_HUMIDITY_FILTER["min_interval"]
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+        vol.Optional("median", default=DEFAULT_HUMIDITY_FILTER["median"]): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=15)
+        ),
+        vol.Optional(
+            "stale_timeout", default=DEFAULT_HUMIDITY_FILTER["stale_timeout"]
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+    }
+)
+
+# Multi-sensor humidity fusion schema
+HUMIDITY_FUSION_SCHEMA = vol.Schema(
+    {
+        vol.Optional("policy", default=DEFAULT_HUMIDITY_FUSION["policy"]): vol.In(
+            FUSION_POLICIES
+        ),
+        vol.Optional("weights", default=DEFAULT_HUMIDITY_FUSION["weights"]): vol.All(
+            cv.ensure_list, [vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False))]
+        ),
+    }
+)
+
+
+def _validate_fusion_weights(value: dict[str, Any]) -> dict[str, Any]:
+    """Ensure fusion weights, if given, match the humidity sensors."""
+    weights = value["humidity_fusion"]["weights"]
+    if weights and len(weights) != len(value["humidity_sensor"]):
+        raise vol.Invalid("humidity_fusion weights must match the number of humidity sensors")
+    return value
+
+
+def _validate_switch_inputs(value: dict[str, Any]) -> dict[str, Any]:
+    """Collect the switch inputs into 'inputs' and check the position map.
+
+    Either 'inputs' or the classic 'input_0'/'input_1' pair must be given.
+    Positions are patterns with one '0' or '1' per input; without a map the
+    classic 3-position layout on two inputs is used.
+    """
+    value = dict(value)
+    pair = [value.pop(key) for key in ("input_0", "input_1") if key in value]
+    if "inputs" in value:
+        if pair:
+            raise vol.Invalid("Use either 'inputs' or 'input_0'/'input_1', not both")
+    elif len(pair) == 2:
+        value["inputs"] = pair
+    else:
+        raise vol.Invalid("Both 'input_0' and 'input_1' (or a list of 'inputs') are required")
+
+    count = len(value["inputs"])
+    positions = value.get("positions")
+    if positions is None:
+        if count != 2:
+            raise vol.Invalid("'positions' is required unless exactly two inputs are used")
+        value["positions"] = dict(DEFAULT_SWITCH_POSITIONS)
+        return value
+
+    for pattern in positions:
+        if len(pattern) != count or pattern.strip("01"):
+            raise vol.Invalid(
+                f"Switch position '{pattern}' must have one '0' or '1' per input "
+                f"({count}); quote patterns in YAML, e.g. \"01\""
+            )
+    return value
+
+
+# Time-of-day schedule entry schema (speeds override the zone speeds)
+SCHEDULE_ENTRY_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): cv.string,
+        vol.Optional("days", default=list(WEEKDAYS)): vol.All(
+            cv.ensure_list, [vol.In(WEEKDAYS)]
+        ),
+        vol.Required("start"): cv.time,
+        vol.Required("end"): cv.time,
+        vol.Optional("speeds", default={}): vol.Schema(
             {
-                vol.Required("fan_entity"): cv.entity_id,
-                vol.Required("humidity_sensor"): cv.entity_id,
-                vol.Required("input_0"): cv.entity_id,
-                vol.Required("input_1"): cv.entity_id,
-                vol.Optional("speeds", default=DEFAULT_SPEEDS): vol.Schema(
-                    {
-                        vol.Required("low"): vol.All(
-                            vol.Coerce(int), vol.Range(min=0, max=100)
-                        ),
-                        vol.Required("mid"): vol.All(
-                            vol.Coerce(int), vol.Range(min=0, max=100)
-                        ),
-                        vol.Required("boost"): vol.All(
-                            vol.Coerce(int), vol.Range(min=0, max=100)
-                        ),
-                    }
-                ),
-                vol.Optional(
-                    "check_interval", default=DEFAULT_CHECK_INTERVAL
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
-                vol.Optional(
-                    "max_boosts_per_day", default=DEFAULT_MAX_BOOSTS_PER_DAY
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
-                vol.Optional(
-                    "auto_boost_duration", default=DEFAULT_AUTO_BOOST_DURATION
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+                vol.Optional(mode): vol.All(vol.Coerce(int), vol.Range(min=0, max=100))
+                for mode in ("low", "mid", "boost")
             }
+        ),
+        vol.Optional("auto_boost", default=True): cv.boolean,
+    }
+)
+SCHEDULE_SCHEMA = vol.All(cv.ensure_list, [SCHEDULE_ENTRY_SCHEMA])
+
+# Per-zone configuration schema
+ZONE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("name"): cv.string,
+            vol.Required("fan_entity"): cv.entity_id,
+            vol.Required("humidity_sensor"): cv.entity_ids,
+            vol.Optional("input_0"): cv.entity_id,
+            vol.Optional("input_1"): cv.entity_id,
+            vol.Optional("inputs"): vol.All(
+                cv.entity_ids, vol.Length(min=1, max=MAX_SWITCH_INPUTS)
+            ),
+            vol.Optional("positions"): {cv.string: vol.In([MODE_LOW, MODE_MID, MODE_BOOST])},
+            vol.Optional("settle_time", default=DEFAULT_SETTLE_TIME): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=10)
+            ),
+            vol.Optional("speeds", default=DEFAULT_SPEEDS): vol.Schema(
+                {
+                    vol.Required("low"): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=100)
+                    ),
+                    vol.Required("mid"): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=100)
+                    ),
+                    vol.Required("boost"): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=100)
+                    ),
+                }
+            ),
+            vol.Optional(
+                "max_boosts_per_day", default=DEFAULT_MAX_BOOSTS_PER_DAY
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+            vol.Optional(
+                "auto_boost_duration", default=DEFAULT_AUTO_BOOST_DURATION
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+            vol.Optional(
+                "resend_interval", default=DEFAULT_RESEND_INTERVAL
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            vol.Optional(
+                "auto_boost_trigger", default=DEFAULT_AUTO_BOOST_TRIGGER
+            ): AUTO_BOOST_TRIGGER_SCHEMA,
+            vol.Optional(
+                "boost_control", default=DEFAULT_BOOST_CONTROL
+            ): BOOST_CONTROL_SCHEMA,
+            vol.Optional("mid_control", default=DEFAULT_MID_CONTROL): MID_CONTROL_SCHEMA,
+            vol.Optional(
+                "humidity_filter", default=DEFAULT_HUMIDITY_FILTER
+            ): HUMIDITY_FILTER_SCHEMA,
+            vol.Optional(
+                "humidity_fusion", default=DEFAULT_HUMIDITY_FUSION
+            ): HUMIDITY_FUSION_SCHEMA,
+            vol.Optional("boost_airflow", default=DEFAULT_BOOST_AIRFLOW): vol.All(
+                vol.Coerce(float), vol.Range(min=0, min_included=False)
+            ),
+            # Replaces the shared schedule for this zone
+            vol.Optional("schedule"): SCHEDULE_SCHEMA,
+            vol.Optional("history_size", default=DEFAULT_HISTORY_SIZE): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=1000000)
+            ),
+            # Fan power in watts per speed percentage, for the energy sensor
+            vol.Optional("power_curve"): vol.All(
+                {
+                    vol.All(vol.Coerce(int), vol.Range(min=0, max=100)): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    )
+                },
+                vol.Length(min=1),
+            ),
+        }
+    ),
+    _validate_fusion_weights,
+    _validate_switch_inputs,
+)
+
+
+# Options shared by all zones rather than set per zone
+SHARED_OPTIONS = ("check_interval", "scheduling", "airflow_budget", "startup_timeout")
+
+
+def _single_zone_to_list(value: Any) -> Any:
+    """Wrap a legacy single-zone configuration block into the zones layout."""
+    if isinstance(value, dict) and "zones" not in value:
+        zone = dict(value)
+        shared = {key: zone.pop(key) for key in SHARED_OPTIONS if key in zone}
+        return {**shared, "zones": [zone]}
+    return value
+
+
+def _validate_zone_names(value: dict[str, Any]) -> dict[str, Any]:
+    """Ensure zones can be told apart when more than one is configured."""
+    zones = value["zones"]
+    if len(zones) == 1:
+        return value
+
+    zone_ids = []
+    for zone in zones:
+        if "name" not in zone:
+            raise vol.Invalid("Every zone needs a 'name' when multiple zones are configured")
+        zone_ids.append(slugify(zone["name"]))
+
+    if len(set(zone_ids)) != len(zone_ids):
+        raise vol.Invalid("Zone names must be unique")
+    return value
+
+
+# Configuration schema
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.All(
+            _single_zone_to_list,
+            vol.Schema(
+                {
+                    vol.Optional(
+                        "check_interval", default=DEFAULT_CHECK_INTERVAL
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                    vol.Optional("scheduling", default=DEFAULT_SCHEDULING): vol.In(
+                        [SCHEDULING_INTERVAL, SCHEDULING_EVENT]
+                    ),
+                    vol.Optional(
+                        "airflow_budget", default=DEFAULT_AIRFLOW_BUDGET
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        "startup_timeout", default=DEFAULT_STARTUP_TIMEOUT
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional("schedule", default=[]): SCHEDULE_SCHEMA,
+                    vol.Required("zones"): vol.All(
+                        cv.ensure_list, vol.Length(min=1), [ZONE_SCHEMA]
+                    ),
+                }
+            ),
+            _validate_zone_names,
         )
     },
     extra=vol.ALLOW_EXTRA,
 )
 
 
-async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
-    """Set up the Smart Ventilation Controller component."""
-    if DOMAIN not in config:
-        return True
-
-    conf = config[DOMAIN]
-
+def _create_zone(
+    hass: HomeAssistant,
+    zone_conf: dict[str, Any],
+    check_interval: int,
+    schedule: list[dict[str, Any]],
+) -> SmartVentCoordinator | None:
+    """Validate a zone configuration and create its coordinator."""
     # Validate fan entity type (but don't check if it exists yet - it may load later)
-    fan_entity = conf["fan_entity"]
+    fan_entity = zone_conf["fan_entity"]
 
     # Check if entity is fan or light type based on entity_id format
     if not (fan_entity.startswith("fan.") or fan_entity.startswith("light.")):
@@ -77,7 +394,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             "Light entities are typically used for Shelly Dimmers controlling fans.",
             fan_entity
         )
-        return False
+        return None
 
     # Log the entity type and note that it may not be available yet
     entity_type = "light" if fan_entity.startswith("light.") else "fan"
@@ -96,84 +413,193 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             fan_entity
         )
 
-    # Create the coordinator
-    coordinator = SmartVentCoordinator(
+    name = zone_conf.get("name")
+    zone_id = slugify(name) if name else DEFAULT_ZONE_ID
+
+    return SmartVentCoordinator(
         hass=hass,
         fan_entity=fan_entity,
-        humidity_sensor=conf["humidity_sensor"],
-        input_0=conf["input_0"],
-        input_1=conf["input_1"],
-        speeds=conf["speeds"],
-        check_interval=conf["check_interval"],
-        max_boosts_per_day=conf["max_boosts_per_day"],
-        auto_boost_duration=conf["auto_boost_duration"],
+        humidity_sensor=zone_conf["humidity_sensor"],
+        inputs=zone_conf["inputs"],
+        speeds=zone_conf["speeds"],
+        check_interval=check_interval,
+        max_boosts_per_day=zone_conf["max_boosts_per_day"],
+        auto_boost_duration=zone_conf["auto_boost_duration"],
+        resend_interval=zone_conf["resend_interval"],
+        auto_boost_trigger=zone_conf["auto_boost_trigger"],
+        boost_control=zone_conf["boost_control"],
+        mid_control=zone_conf["mid_control"],
+        humidity_filter=zone_conf["humidity_filter"],
+        humidity_fusion=zone_conf["humidity_fusion"],
+        boost_airflow=zone_conf["boost_airflow"],
+        schedule=zone_conf.get("schedule", schedule),
+        switch_positions=zone_conf["positions"],
+        settle_time=zone_conf["settle_time"],
+        history_size=zone_conf["history_size"],
+        power_curve=zone_conf.get("power_curve"),
+        zone_id=zone_id,
+        name=name,
     )
 
-    # Store coordinator in hass.data
-    hass.data[DOMAIN] = coordinator
 
-    # Perform first refresh of coordinator data and start polling
-    await coordinator.async_refresh()
+def _entry_zone_config(entry: ConfigEntry) -> tuple[dict[str, Any], int]:
+    """Build the validated zone configuration and check interval of a config entry.
+
+    The entry data holds the entities picked in the config flow, the options
+    the tunables of the options flow; everything else takes the YAML defaults.
+    """
+    zone_conf = dict(entry.data)
+    options = entry.options
+    if options:
+        zone_conf.update(
+            speeds={mode: options[f"speed_{mode}"] for mode in ("low", "mid", "boost")},
+            max_boosts_per_day=options["max_boosts_per_day"],
+            auto_boost_duration=options["auto_boost_duration"],
+            resend_interval=options["resend_interval"],
+            auto_boost_trigger={
+                "type": options["trigger_type"],
+                "threshold": options["trigger_threshold"],
+                "rate": options["trigger_rate"],
+                "delta": options["trigger_delta"],
+            },
+            boost_control={
+                "mode": options["boost_control"],
+                "off_threshold": options["off_threshold"],
+            },
+        )
+    check_interval = int(options.get("check_interval", DEFAULT_CHECK_INTERVAL))
+    return ZONE_SCHEMA(zone_conf), check_interval
 
-    # Set up state change listeners for input entities
-    @callback
-    def async_state_changed_listener(event):
-        """Handle state changes of monitored entities."""
-        entity_id = event.data.get("entity_id")
-        new_state = event.data.get("new_state")
 
-        # Ignore transitions to unavailable/unknown states during startup
-        if new_state and new_state.state in ("unavailable", "unknown", None):
-            _LOGGER.debug("Ignoring state change to %s for %s", new_state.state, entity_id)
-            return
+async def _async_get_manager(
+    hass: HomeAssistant,
+    scheduling: str = DEFAULT_SCHEDULING,
+    airflow_budget: float = DEFAULT_AIRFLOW_BUDGET,
+    startup_timeout: int = DEFAULT_STARTUP_TIMEOUT,
+) -> SmartVentManager:
+    """Return the zone manager, creating and starting it on first use.
 
-        _LOGGER.debug("State change detected for %s, triggering immediate refresh", entity_id)
-        # Use async_refresh() instead of async_request_refresh() to bypass debounce
-        hass.async_create_task(coordinator.async_refresh())
+    The YAML configuration, if any, is set up first and decides the shared
+    options; zones from config entries join the same manager.
+    """
+    manager = hass.data.get(DOMAIN)
+    if manager is None:
+        manager = SmartVentManager(hass, scheduling, airflow_budget, startup_timeout)
+        hass.data[DOMAIN] = manager
+        await manager.async_start()
+    return manager
 
-    # Listen for changes to input sensors
-    async_track_state_change_event(
-        hass,
-        [conf["input_0"], conf["input_1"], conf["humidity_sensor"]],
-        async_state_changed_listener,
-    )
 
-    # Set up periodic polling for checking conditions (auto-boost timers, etc.)
-    @callback
-    def async_periodic_update(now):
-        """Periodic update callback."""
-        _LOGGER.debug("Periodic update triggered (every %d seconds)", conf["check_interval"])
-        hass.async_create_task(coordinator.async_refresh())
-
-    async_track_time_interval(
-        hass,
-        async_periodic_update,
-        timedelta(seconds=conf["check_interval"]),
-    )
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Smart Ventilation Controller component."""
+    _async_register_services(hass)
+
+    if DOMAIN not in config:
+        return True
+
+    conf = config[DOMAIN]
 
-    # Load the fan platform
-    hass.async_create_task(
-        async_load_platform(
-            hass,
-            "fan",
-            DOMAIN,
-            {"coordinator": coordinator},
-            config,
+    # Create one coordinator per zone
+    zones = []
+    for zone_conf in conf["zones"]:
+        coordinator = _create_zone(
+            hass, zone_conf, conf["check_interval"], conf["schedule"]
         )
+        if coordinator is None:
+            return False
+        zones.append(coordinator)
+
+    manager = await _async_get_manager(
+        hass, conf["scheduling"], conf["airflow_budget"], conf["startup_timeout"]
     )
 
-    # Load the binary_sensor platform
-    hass.async_create_task(
-        async_load_platform(
-            hass,
-            "binary_sensor",
-            DOMAIN,
-            {"coordinator": coordinator},
-            config,
+    # Restore the zones and start listening; the first decisions wait for
+    # Home Assistant to finish starting, so setup does not block the boot
+    await manager.async_add_zones(zones)
+
+    # Load the entity platforms for the YAML zones
+    for platform in PLATFORMS:
+        hass.async_create_task(
+            async_load_platform(
+                hass,
+                platform,
+                DOMAIN,
+                {"manager": manager, "zones": zones},
+                config,
+            )
         )
+
+    _LOGGER.info("Smart Ventilation Controller component loaded")
+    for coordinator in zones:
+        _LOGGER.debug(
+            "Zone '%s' configuration: fan=%s, humidity=%s, inputs=%s",
+            coordinator.zone_id,
+            coordinator.fan_entity,
+            ", ".join(coordinator.humidity_sensors),
+            "/".join(coordinator.inputs),
+        )
+
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up the zone of a config entry."""
+    started = clock.monotonic()
+    zone_conf, check_interval = _entry_zone_config(entry)
+    zone_id = slugify(zone_conf["name"])
+
+    manager = await _async_get_manager(hass)
+    if zone_id in manager.zones:
+        raise ConfigEntryError(f"Zone '{zone_id}' is already configured")
+
+    coordinator = _create_zone(hass, zone_conf, check_interval, [])
+    if coordinator is None:
+        raise ConfigEntryError(f"Fan entity '{zone_conf['fan_entity']}' is not a fan or light")
+
+    await manager.async_add_zones([coordinator])
+    entry.runtime_data = coordinator
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    _LOGGER.debug(
+        "Zone '%s' set up in %.0f ms", zone_id, (clock.monotonic() - started) * 1000
     )
+    return True
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload the zone of a config entry, keeping its runtime state."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+    hass.data[DOMAIN].async_remove_zone(entry.runtime_data.zone_id)
+    return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the saved state of a deleted zone."""
+    manager = hass.data.get(DOMAIN)
+    if manager is not None:
+        manager.async_forget_zone(slugify(entry.data["name"]))
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the zone after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the services; they address the zones of the running manager."""
+
+    def _zones_for_call(call) -> list[SmartVentCoordinator]:
+        """Resolve the zones targeted by a service call."""
+        zone_id = call.data.get("zone")
+        manager = hass.data.get(DOMAIN)
+        zones = manager.get_zones(zone_id) if manager is not None else []
+        if not zones:
+            _LOGGER.error("Unknown zone '%s'", zone_id)
+        return zones
 
-    # Register services
     async def handle_set_mode(call):
         """Handle the set_mode service call."""
         mode = call.data.get("mode")
@@ -183,25 +609,108 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             _LOGGER.error("Invalid mode '%s'. Must be one of: low, mid, boost", mode)
             return
 
-        _LOGGER.info("Service call: set_mode to '%s'", mode)
-        await coordinator.set_mode(mode)
+        for coordinator in _zones_for_call(call):
+            _LOGGER.info("Service call: set_mode to '%s' (zone '%s')", mode, coordinator.zone_id)
+            await coordinator.set_mode(mode)
+            coordinator.async_update_listeners()
 
     hass.services.async_register(DOMAIN, "set_mode", handle_set_mode)
 
     async def handle_force_boost(call):
         """Handle the force_boost service call."""
-        _LOGGER.info("Service call: force_boost")
-        await coordinator.force_boost()
+        for coordinator in _zones_for_call(call):
+            _LOGGER.info("Service call: force_boost (zone '%s')", coordinator.zone_id)
+            await coordinator.force_boost()
+            coordinator.async_update_listeners()
 
     hass.services.async_register(DOMAIN, "force_boost", handle_force_boost)
 
-    _LOGGER.info("Smart Ventilation Controller component loaded")
-    _LOGGER.debug(
-        "Configuration: fan=%s, humidity=%s, inputs=%s/%s",
-        conf["fan_entity"],
-        conf["humidity_sensor"],
-        conf["input_0"],
-        conf["input_1"],
+    async def handle_set_trace(call):
+        """Handle the set_trace service call."""
+        mode = call.data.get("mode")
+        interval = call.data.get("interval")
+
+        # Validate mode
+        if mode not in TRACE_MODES:
+            _LOGGER.error(
+                "Invalid trace mode '%s'. Must be one of: %s", mode, ", ".join(TRACE_MODES)
+            )
+            return
+
+        for coordinator in _zones_for_call(call):
+            _LOGGER.info("Service call: set_trace to '%s' (zone '%s')", mode, coordinator.zone_id)
+            coordinator.tracer.configure(mode, interval)
+
+    hass.services.async_register(DOMAIN, "set_trace", handle_set_trace)
+
+    async def handle_get_diagnostics(call: ServiceCall) -> ServiceResponse:
+        """Handle the get_diagnostics service call."""
+        manager = hass.data.get(DOMAIN)
+        if call.data.get("zone") is None and manager is not None:
+            return manager_diagnostics(manager)
+        return {
+            "zones": {
+                coordinator.zone_id: zone_diagnostics(coordinator)
+                for coordinator in _zones_for_call(call)
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_diagnostics",
+        handle_get_diagnostics,
+        supports_response=SupportsResponse.ONLY,
     )
 
-    return True
+    async def handle_export_history(call: ServiceCall) -> ServiceResponse:
+        """Handle the export_history service call."""
+        file_format = call.data.get("format", EXPORT_CSV)
+        directory = call.data.get("directory")
+
+        # Validate format and directory
+        if file_format not in EXPORT_FORMATS:
+            raise ServiceValidationError(
+                f"Invalid export format '{file_format}'. Must be one of: "
+                f"{', '.join(EXPORT_FORMATS)}"
+            )
+        if directory is None:
+            directory = hass.config.path(EXPORT_DIRECTORY)
+        elif not hass.config.is_allowed_path(directory):
+            raise ServiceValidationError(
+                f"Directory '{directory}' is not in allowlist_external_dirs"
+            )
+
+        stamp = clock.now().strftime("%Y%m%d_%H%M%S")
+        files = {}
+        for coordinator in _zones_for_call(call):
+            zone_id = coordinator.zone_id
+            path = os.path.join(directory, f"{zone_id}_{stamp}.{file_format}")
+            # Copy on the event loop, decode and write in the executor
+            data = coordinator.history.snapshot()
+            try:
+                await hass.async_add_executor_job(
+                    export, path, file_format, data, zone_id, len(coordinator.inputs)
+                )
+            except ImportError as err:
+                raise HomeAssistantError(
+                    "Parquet export needs the pyarrow package"
+                ) from err
+            except OSError as err:
+                raise HomeAssistantError(f"Failed to write {path}: {err}") from err
+
+            records = len(data) // RECORD.size
+            _LOGGER.info(
+                "Service call: export_history wrote %d record(s) of zone '%s' to %s",
+                records,
+                zone_id,
+                path,
+            )
+            files[zone_id] = {"path": path, "records": records}
+        return {"files": files}
+
+    hass.services.async_register(
+        DOMAIN,
+        "export_history",
+        handle_export_history,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
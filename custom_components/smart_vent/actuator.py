@@ -0,0 +1,334 @@
+"""Fan actuator for Smart Ventilation Controller.
+
+Wraps the service calls that set the speed of the real fan and suppresses
+writes that would not change anything on the device.
+
+Commands are dispatched by a per-device background worker, so callers never
+wait on device I/O. Only the latest requested speed is kept: a newer command
+replaces one that has not been sent yet. Failed writes are retried with
+exponential backoff and every call is bounded by a timeout.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from . import clock
+from .metrics import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum difference (in percent) between the commanded and the reported
+# speed that is still considered "in sync". Light entities report brightness
+# on a 0-255 scale, so converting back to percent can be off by one.
+DRIFT_TOLERANCE = 1
+
+# Per-call timeout for the speed service call, in seconds
+WRITE_TIMEOUT = 10
+
+# Retry policy for failed writes: delays of 1, 2, 4, 8, 16 seconds
+MAX_RETRIES = 5
+BACKOFF_BASE = 1
+BACKOFF_MAX = 60
+
+
+class FanActuator:
+    """Send speed commands to one fan or light entity, skipping redundant writes.
+
+    The actuator remembers the last commanded percentage and compares it to
+    what the device currently reports. A write is only sent when the target
+    differs from the last command, when the device has drifted away from it,
+    or when the last command is older than the resend interval.
+
+    The zone reconciles its target speed on every evaluation, so drift is
+    corrected at the next timer or deadline evaluation, and includes
+    next_resend() in its deadline so the periodic resend happens on time
+    even without any other evaluation.
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: str, resend_interval: int) -> None:
+        """Initialize the actuator.
+
+        Args:
+            hass: Home Assistant instance
+            entity_id: fan.* or light.* entity to control
+            resend_interval: Seconds after which an unchanged command is resent
+                anyway (0 disables periodic resends)
+        """
+        self.hass = hass
+        self.entity_id = entity_id
+        self.resend_interval = resend_interval
+        self.is_light_entity = entity_id.startswith("light.")
+
+        # Last command sent to the device
+        self.last_commanded: int | None = None
+        self._last_commanded_at: float | None = None
+        # Last time a command was queued, sent or not
+        self._last_request_at: float | None = None
+
+        # Latest requested speed that has not been written yet
+        self._pending: int | None = None
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        # Counters
+        self.writes_sent = 0
+        self.writes_suppressed = 0
+        self.writes_failed = 0
+        self.writes_dropped = 0
+
+        # Duration of the blocking service calls, including failed ones
+        self.write_latency = LatencyHistogram()
+
+    @property
+    def observed_percentage(self) -> int | None:
+        """Return the speed the device currently reports, or None if unknown."""
+        state = self.hass.states.get(self.entity_id)
+        if state is None or state.state in ("unavailable", "unknown"):
+            return None
+        if state.state == "off":
+            return 0
+
+        if self.is_light_entity:
+            brightness = state.attributes.get("brightness")
+            if brightness is None:
+                return None
+            return round(brightness * 100 / 255)
+
+        percentage = state.attributes.get("percentage")
+        return int(percentage) if percentage is not None else None
+
+    def needs_write(self, percentage: int) -> bool:
+        """Return True if a command for this percentage has to be sent.
+
+        Args:
+            percentage: Target fan speed percentage (0-100)
+        """
+        observed = self.observed_percentage
+        in_sync = observed is not None and abs(observed - percentage) <= DRIFT_TOLERANCE
+
+        if self.last_commanded is None:
+            # Nothing commanded yet (e.g. after a restart): only write if the
+            # device is not already where we want it
+            return not in_sync
+
+        if self.last_commanded != percentage or not in_sync:
+            return True
+
+        if self.resend_interval and self._last_commanded_at is not None:
+            age = clock.monotonic() - self._last_commanded_at
+            return age >= self.resend_interval
+
+        return False
+
+    def next_resend(self) -> float | None:
+        """Return the monotonic time the last command is due to be resent.
+
+        Counted from the last write, or from the last queued command if that
+        is later, so a device that fails to follow is not retried on every
+        deadline. None if periodic resends are
+        disabled, nothing was commanded yet or the device is unavailable.
+        """
+        if not self.resend_interval or self.last_commanded is None:
+            return None
+        if self.observed_percentage is None:
+            return None
+        return max(self._last_commanded_at or 0.0, self._last_request_at) + self.resend_interval
+
+    @callback
+    def async_reconcile(self, percentage: int) -> None:
+        """Queue the target speed if the device drifted or a resend is due.
+
+        Called on every evaluation. Nothing is queued while a command is
+        still on its way or the device is unavailable.
+
+        Args:
+            percentage: Target fan speed percentage (0-100)
+        """
+        if self._pending is not None:
+            return
+        state = self.hass.states.get(self.entity_id)
+        if state is None or state.state in ("unavailable", "unknown"):
+            return
+        if self.needs_write(percentage):
+            _LOGGER.debug("Reconciling %s to %d%%", self.entity_id, percentage)
+            self.async_request(percentage)
+
+    @callback
+    def async_request(self, percentage: int) -> None:
+        """Queue a speed command without waiting for the device.
+
+        A command still waiting to be sent is replaced by the newer one.
+
+        Args:
+            percentage: Fan speed percentage (0-100)
+        """
+        self._pending = percentage
+        self._last_request_at = clock.monotonic()
+        self._wake.set()
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_worker(), f"smart_vent actuator {self.entity_id}"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the worker and drop any queued command."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending = None
+
+    async def _async_worker(self) -> None:
+        """Send queued commands, retrying failures with exponential backoff."""
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            attempt = 0
+            while self._pending is not None:
+                target = self._pending
+                if await self._async_write(target):
+                    attempt = 0
+                    if self._pending == target:
+                        self._pending = None
+                    continue
+
+                attempt += 1
+                if attempt > MAX_RETRIES:
+                    self.writes_dropped += 1
+                    _LOGGER.error(
+                        "Giving up setting %s to %d%% after %d retries",
+                        self.entity_id,
+                        target,
+                        MAX_RETRIES,
+                    )
+                    if self._pending == target:
+                        self._pending = None
+                    attempt = 0
+                    continue
+
+                delay = min(BACKOFF_BASE * 2 ** (attempt - 1), BACKOFF_MAX)
+                _LOGGER.debug(
+                    "Retrying %s in %d s (attempt %d/%d)",
+                    self.entity_id,
+                    delay,
+                    attempt,
+                    MAX_RETRIES,
+                )
+                if await self._async_backoff(delay):
+                    attempt = 0
+
+    async def _async_backoff(self, delay: float) -> bool:
+        """Wait before retrying, but let a newer command cut the wait short.
+
+        Args:
+            delay: Seconds to wait
+
+        Returns:
+            True if a newer command was queued during the wait
+        """
+        try:
+            async with asyncio.timeout(delay):
+                await self._wake.wait()
+        except TimeoutError:
+            pass
+        if not self._wake.is_set():
+            return False
+        self._wake.clear()
+        return True
+
+    async def _async_write(self, percentage: int) -> bool:
+        """Set the fan speed, unless the device already runs at that speed.
+
+        Supports both fan entities (using fan.set_percentage) and light entities
+        (using light.turn_on with brightness_pct) for Shelly Dimmers.
+
+        Args:
+            percentage: Fan speed percentage (0-100)
+
+        Returns:
+            True if the command is done (sent, suppressed or not retryable),
+            False if it failed and should be retried
+        """
+        # Check if fan entity exists
+        fan_state = self.hass.states.get(self.entity_id)
+        if fan_state is None:
+            _LOGGER.error("Fan entity %s not found, cannot set speed", self.entity_id)
+            return True
+
+        # Check if fan is available
+        if fan_state.state in ("unavailable", "unknown"):
+            self.writes_failed += 1
+            _LOGGER.warning(
+                "Fan entity %s is unavailable (state: %s), speed change delayed",
+                self.entity_id,
+                fan_state.state,
+            )
+            return False
+
+        if not self.needs_write(percentage):
+            self.writes_suppressed += 1
+            _LOGGER.debug(
+                "%s already at %d%%, write suppressed", self.entity_id, percentage
+            )
+            return True
+
+        if self.is_light_entity:
+            # For light entities (Shelly Dimmers), use light.turn_on with brightness_pct
+            service_domain = "light"
+            service_name = "turn_on"
+            service_data = {
+                "entity_id": self.entity_id,
+                "brightness_pct": percentage,
+            }
+        else:
+            # For fan entities, use fan.set_percentage
+            service_domain = "fan"
+            service_name = "set_percentage"
+            service_data = {
+                "entity_id": self.entity_id,
+                "percentage": percentage,
+            }
+
+        # Call the appropriate service
+        try:
+            with self.write_latency.time():
+                async with asyncio.timeout(WRITE_TIMEOUT):
+                    await self.hass.services.async_call(
+                        service_domain,
+                        service_name,
+                        service_data,
+                        blocking=True,
+                    )
+        except Exception as err:
+            self.writes_failed += 1
+            _LOGGER.error(
+                "Failed to set speed for %s to %d%%: %s",
+                self.entity_id,
+                percentage,
+                err or type(err).__name__,
+            )
+            return False
+
+        self.writes_sent += 1
+        self.last_commanded = percentage
+        self._last_commanded_at = clock.monotonic()
+        entity_type = "Light" if self.is_light_entity else "Fan"
+        _LOGGER.info("%s speed set to %d%%", entity_type, percentage)
+        return True
+
+    def as_dict(self) -> dict:
+        """Return the write counters and latency for diagnostics."""
+        return {
+            "entity_id": self.entity_id,
+            "last_commanded": self.last_commanded,
+            "pending": self._pending,
+            "writes_sent": self.writes_sent,
+            "writes_suppressed": self.writes_suppressed,
+            "writes_failed": self.writes_failed,
+            "writes_dropped": self.writes_dropped,
+            "write_latency": self.write_latency.as_dict(),
+        }
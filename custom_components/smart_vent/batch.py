@@ -0,0 +1,466 @@
+"""Vectorized batch evaluation for Smart Ventilation Controller.
+
+Applies the rules of the decision kernel (kernel.decide) to many zones at
+once. Zone state is kept in columnar NumPy arrays (mode codes, boost
+deadlines, daily counters) and one evaluation updates all zones in a fixed
+number of array operations, which suits a central controller for thousands
+of vents or backtesting a month of sensor history.
+
+The batch engine is a second implementation of the kernel rules, so it is
+fuzzed against the scalar kernel on every change. The test suite runs a
+short cross-check (tests/test_batch.py) without Home Assistant; the full
+run goes through the package, whose __init__ sets up the integration, so it
+needs a Home Assistant development environment (homeassistant and NumPy
+installed):
+
+    python -m custom_components.smart_vent.batch --zones 2000 --steps 500
+
+NumPy is optional: Home Assistant never imports this module, and the
+evaluator raises ImportError when it is used without NumPy installed.
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Mapping, Sequence
+import math
+import random
+import time
+from typing import Any
+
+from .const import DEFAULT_BOOST_CONTROL, TRIGGER_DELTA, TRIGGER_RATE
+from .kernel import (
+    BoostKind,
+    KernelConfig,
+    Mode,
+    ZoneInputs,
+    ZoneState,
+    decide,
+    force_boost,
+    set_mode,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Marker for unset integer columns (no day yet, no saved mode)
+UNSET = -1
+
+
+def _require_numpy() -> None:
+    """Raise a helpful error if NumPy is not installed."""
+    if np is None:
+        raise ImportError("Batch evaluation requires NumPy (pip install numpy)")
+
+
+def humidity_signals(
+    ewma: Any,
+    baseline: Any,
+    slope: Any,
+    trigger: Mapping[str, Any],
+    boost_control: Mapping[str, Any] = DEFAULT_BOOST_CONTROL,
+) -> tuple[Any, Any]:
+    """Evaluate the humidity trigger and recovery rules for many zones.
+
+    Vectorized form of SmartVentCoordinator._humidity_trigger_met() and
+    _humidity_recovered(). Unavailable values are NaN and never trigger or
+    recover. Option values may be scalars or per-zone arrays.
+
+    Args:
+        ewma: Smoothed humidity per zone
+        baseline: Baseline humidity per zone
+        slope: Humidity trend per zone in percent per minute
+        trigger: auto_boost_trigger options (type, threshold, rate, delta)
+        boost_control: boost_control options (off_threshold, baseline_margin)
+
+    Returns:
+        Tuple of (boost_trigger, humidity_recovered) boolean arrays
+    """
+    _require_numpy()
+    ewma = np.asarray(ewma, dtype=np.float64)
+    baseline = np.asarray(baseline, dtype=np.float64)
+    slope = np.asarray(slope, dtype=np.float64)
+
+    if trigger["type"] == TRIGGER_RATE:
+        boost_trigger = slope >= trigger["rate"]
+    elif trigger["type"] == TRIGGER_DELTA:
+        boost_trigger = ewma - baseline >= trigger["delta"]
+    else:
+        boost_trigger = ewma > trigger["threshold"]
+
+    humidity_recovered = (ewma <= boost_control["off_threshold"]) | (
+        ewma <= baseline + boost_control["baseline_margin"]
+    )
+    return boost_trigger, humidity_recovered
+
+
+class BatchEvaluator:
+    """Columnar state of many zones, evaluated with the kernel rules.
+
+    Unset times are NaN and unset modes and days are UNSET (-1), where the
+    scalar ZoneState uses None.
+    """
+
+    def __init__(
+        self,
+        configs: Sequence[KernelConfig],
+        states: Sequence[ZoneState] | None = None,
+    ) -> None:
+        """Initialize the evaluator.
+
+        Args:
+            configs: Kernel configuration per zone
+            states: Initial state per zone (defaults to ZoneState())
+        """
+        _require_numpy()
+        size = len(configs)
+        self.size = size
+        self._index = np.arange(size)
+
+        # Static configuration
+        self.speeds = np.array([config.speeds for config in configs], dtype=np.int16).reshape(
+            size, len(Mode)
+        )
+        self.max_boosts = np.array([c.max_boosts_per_day for c in configs], dtype=np.int32)
+        self.closed_loop = np.array([c.closed_loop for c in configs], dtype=bool)
+        self.boost_duration = np.array(
+            [c.auto_boost_duration for c in configs], dtype=np.float64
+        )
+        self.min_boost_duration = np.array(
+            [c.min_boost_duration for c in configs], dtype=np.float64
+        )
+        # Length of a new auto-boost: the closed-loop cap or the fixed duration
+        self.auto_boost_length = np.where(
+            self.closed_loop,
+            np.array([c.max_boost_duration for c in configs], dtype=np.float64),
+            self.boost_duration,
+        )
+
+        # Zone state columns
+        self.mode = np.zeros(size, dtype=np.int8)
+        self.boost_kind = np.zeros(size, dtype=np.int8)
+        self.boost_start = np.full(size, np.nan)
+        self.boost_end = np.full(size, np.nan)
+        self.boost_count = np.zeros(size, dtype=np.int32)
+        self.day = np.full(size, UNSET, dtype=np.int64)
+        self.mode_before_boost = np.full(size, UNSET, dtype=np.int8)
+        self.last_switch_mode = np.full(size, UNSET, dtype=np.int8)
+
+        if states is not None:
+            for index, state in enumerate(states):
+                self.set_state(index, state)
+
+    def __len__(self) -> int:
+        """Return the number of zones."""
+        return self.size
+
+    @property
+    def speed(self) -> Any:
+        """Return the fan speed of every zone's current mode."""
+        return self.speeds[self._index, self.mode]
+
+    @property
+    def boost_active(self) -> Any:
+        """Return a mask of zones with a running boost."""
+        return self.boost_kind != BoostKind.NONE
+
+    def set_state(self, index: int, state: ZoneState) -> None:
+        """Store a scalar zone state in the columns."""
+        self.mode[index] = state.mode
+        self.boost_kind[index] = state.boost_kind
+        self.boost_start[index] = math.nan if state.boost_start is None else state.boost_start
+        self.boost_end[index] = math.nan if state.boost_end is None else state.boost_end
+        self.boost_count[index] = state.boost_count
+        self.day[index] = UNSET if state.day is None else state.day
+        self.mode_before_boost[index] = (
+            UNSET if state.mode_before_boost is None else state.mode_before_boost
+        )
+        self.last_switch_mode[index] = (
+            UNSET if state.last_switch_mode is None else state.last_switch_mode
+        )
+
+    def get_state(self, index: int) -> ZoneState:
+        """Return the state of one zone as a scalar ZoneState."""
+
+        def _time(value: float) -> float | None:
+            return None if math.isnan(value) else float(value)
+
+        def _mode(value: int) -> Mode | None:
+            return None if value == UNSET else Mode(int(value))
+
+        return ZoneState(
+            mode=Mode(int(self.mode[index])),
+            boost_kind=BoostKind(int(self.boost_kind[index])),
+            boost_start=_time(self.boost_start[index]),
+            boost_end=_time(self.boost_end[index]),
+            boost_count=int(self.boost_count[index]),
+            day=None if self.day[index] == UNSET else int(self.day[index]),
+            mode_before_boost=_mode(self.mode_before_boost[index]),
+            last_switch_mode=_mode(self.last_switch_mode[index]),
+        )
+
+    def _clear_boost(self, mask: Any) -> None:
+        """Clear the boost fields of the masked zones."""
+        self.boost_kind[mask] = BoostKind.NONE
+        self.boost_start[mask] = np.nan
+        self.boost_end[mask] = np.nan
+        self.mode_before_boost[mask] = UNSET
+
+    def evaluate(
+        self,
+        now: Any,
+        day: Any,
+        switch_mode: Any,
+        boost_trigger: Any = False,
+        humidity_recovered: Any = False,
+    ) -> Any:
+        """Evaluate one step for all zones, like kernel.decide() per zone.
+
+        Inputs may be scalars (shared by all zones) or per-zone arrays.
+
+        Args:
+            now: Current time in seconds
+            day: Ordinal of the current local day
+            switch_mode: Mode code selected by the switch
+            boost_trigger: Humidity calls for an auto-boost
+            humidity_recovered: Humidity is back to normal
+
+        Returns:
+            Boolean mask of zones that emitted a fan command; their new
+            speed is in `speed`
+        """
+        size = self.size
+        now = np.broadcast_to(np.asarray(now, dtype=np.float64), size)
+        day = np.broadcast_to(np.asarray(day, dtype=np.int64), size)
+        switch_mode = np.broadcast_to(np.asarray(switch_mode, dtype=np.int8), size)
+        boost_trigger = np.broadcast_to(np.asarray(boost_trigger, dtype=bool), size)
+        humidity_recovered = np.broadcast_to(np.asarray(humidity_recovered, dtype=bool), size)
+        old_mode = self.mode.copy()
+
+        # Reset the daily counter on a new day
+        new_day = self.day != day
+        self.boost_count[new_day] = 0
+        self.day[:] = day
+
+        # Check if the boost is over (NaN deadlines never compare true)
+        kind = self.boost_kind
+        active = kind != BoostKind.NONE
+        early_end = (
+            active
+            & self.closed_loop
+            & (kind == BoostKind.AUTO)
+            & (now >= self.boost_start + self.min_boost_duration)
+            & humidity_recovered
+        )
+        expired = early_end | (active & (now >= self.boost_end))
+        return_mode = np.where(
+            ~early_end & (kind == BoostKind.MANUAL) & (self.mode_before_boost != UNSET),
+            self.mode_before_boost,
+            np.int8(Mode.MID),
+        )
+        self._clear_boost(expired)
+
+        # Moving the switch cancels a manual boost
+        self._clear_boost(
+            (self.boost_kind == BoostKind.MANUAL)
+            & (self.last_switch_mode != UNSET)
+            & (switch_mode != self.last_switch_mode)
+        )
+        self.last_switch_mode[:] = switch_mode
+
+        # Branches in kernel priority order; a manual boost keeps everything
+        follow = (self.boost_kind != BoostKind.MANUAL) & ~expired
+        to_low = follow & (switch_mode == Mode.LOW)
+        to_boost = follow & (switch_mode == Mode.BOOST)
+        in_mid = follow & (switch_mode == Mode.MID) & (self.boost_kind != BoostKind.AUTO)
+        start = in_mid & boost_trigger & (self.boost_count < self.max_boosts)
+        to_mid = in_mid & ~start
+
+        self._clear_boost(to_low | to_boost)
+        self.mode[expired] = return_mode[expired]
+        self.mode[to_low] = Mode.LOW
+        self.mode[to_boost | start] = Mode.BOOST
+        self.mode[to_mid] = Mode.MID
+
+        self.boost_kind[start] = BoostKind.AUTO
+        self.boost_start[start] = now[start]
+        self.boost_end[start] = now[start] + self.auto_boost_length[start]
+        self.boost_count[start] += 1
+
+        return (self.mode != old_mode) | start
+
+    def set_mode(self, mask: Any, mode: Mode) -> Any:
+        """Select a mode for the masked zones, like kernel.set_mode().
+
+        Returns:
+            Boolean mask of zones that emitted a fan command
+        """
+        mask = np.broadcast_to(np.asarray(mask, dtype=bool), self.size)
+        self._clear_boost(mask)
+        changed = mask & (self.mode != mode)
+        self.mode[mask] = mode
+        return changed
+
+    def force_boost(self, mask: Any, now: float) -> Any:
+        """Start a manual boost in the masked zones, like kernel.force_boost().
+
+        Returns:
+            Boolean mask of zones that emitted a fan command
+        """
+        mask = np.broadcast_to(np.asarray(mask, dtype=bool), self.size).copy()
+        self.mode_before_boost[mask] = self.mode[mask]
+        self.mode[mask] = Mode.BOOST
+        self.boost_kind[mask] = BoostKind.MANUAL
+        self.boost_start[mask] = now
+        self.boost_end[mask] = now + self.boost_duration[mask]
+        return mask
+
+
+class CrossCheckError(Exception):
+    """The batch evaluator and the scalar kernel disagree.
+
+    Attributes:
+        step: Step in which the implementations first disagree
+        mismatches: Description of every zone that differs in that step
+    """
+
+    def __init__(self, step: int, mismatches: list[str]) -> None:
+        """Initialize the error.
+
+        Args:
+            step: Step in which the implementations first disagree
+            mismatches: Description of every differing zone
+        """
+        super().__init__(
+            f"{len(mismatches)} zone(s) differ in step {step}, first: {mismatches[0]}"
+        )
+        self.step = step
+        self.mismatches = mismatches
+
+
+def cross_check(
+    zones: int = 1000,
+    steps: int = 200,
+    seed: int = 0,
+) -> tuple[int, float, float]:
+    """Fuzz the batch evaluator against the scalar kernel.
+
+    Random fleets get random switch moves, humidity signals, forced boosts
+    and mode service calls over several simulated days. After every step the
+    state and the emitted commands of every zone must match.
+
+    Args:
+        zones: Number of zones
+        steps: Number of evaluation steps
+        seed: Random seed
+
+    Returns:
+        Tuple of (zone evaluations, scalar seconds, batch seconds)
+
+    Raises:
+        CrossCheckError: If the two implementations disagree
+    """
+    _require_numpy()
+    rng = random.Random(seed)
+    configs = [
+        KernelConfig(
+            speeds=(rng.choice((10, 20)), rng.choice((40, 50)), 100),
+            max_boosts_per_day=rng.randint(0, 5),
+            auto_boost_duration=rng.choice((300, 1200)),
+            closed_loop=rng.random() < 0.5,
+            min_boost_duration=rng.choice((0, 300)),
+            max_boost_duration=rng.choice((1200, 2400)),
+        )
+        for _ in range(zones)
+    ]
+    states = [ZoneState() for _ in range(zones)]
+    batch = BatchEvaluator(configs, states)
+    switch = np.array([rng.randrange(len(Mode)) for _ in range(zones)], dtype=np.int8)
+    now = 0.0
+    scalar_seconds = batch_seconds = 0.0
+
+    for step in range(steps):
+        now += rng.choice((1, 20, 60, 600, 3600))
+        day = int(now // 86400)
+        mismatches = []
+
+        # Occasional service calls, applied to both implementations
+        service = rng.random()
+        if service < 0.05:
+            mask = np.array([rng.random() < 0.1 for _ in range(zones)])
+            mode = Mode(rng.randrange(len(Mode)))
+            changed = batch.set_mode(mask, mode)
+            for index in np.flatnonzero(mask):
+                states[index], commands = set_mode(configs[index], states[index], mode)
+                if bool(commands) != changed[index]:
+                    mismatches.append(f"zone {index}: set_mode commands differ")
+        elif service < 0.1:
+            mask = np.array([rng.random() < 0.1 for _ in range(zones)])
+            batch.force_boost(mask, now)
+            for index in np.flatnonzero(mask):
+                states[index], _ = force_boost(configs[index], states[index], now)
+
+        moved = np.array([rng.random() < 0.05 for _ in range(zones)])
+        switch[moved] = [rng.randrange(len(Mode)) for _ in range(int(moved.sum()))]
+        trigger = np.array([rng.random() < 0.3 for _ in range(zones)])
+        recovered = np.array([rng.random() < 0.3 for _ in range(zones)])
+
+        started = time.perf_counter()
+        changed = batch.evaluate(now, day, switch, trigger, recovered)
+        batch_seconds += time.perf_counter() - started
+
+        speeds = batch.speed
+        started = time.perf_counter()
+        results = [
+            decide(
+                configs[index],
+                states[index],
+                ZoneInputs(
+                    now=now,
+                    day=day,
+                    switch_mode=Mode(int(switch[index])),
+                    boost_trigger=bool(trigger[index]),
+                    humidity_recovered=bool(recovered[index]),
+                ),
+            )
+            for index in range(zones)
+        ]
+        scalar_seconds += time.perf_counter() - started
+
+        for index, (state, commands) in enumerate(results):
+            states[index] = state
+            batch_state = batch.get_state(index)
+            if batch_state != state:
+                mismatches.append(f"zone {index}: batch {batch_state} != kernel {state}")
+            elif bool(commands) != changed[index]:
+                mismatches.append(f"zone {index}: commands differ")
+            elif commands and commands[-1] != speeds[index]:
+                mismatches.append(f"zone {index}: speed {speeds[index]} != {commands[-1]}")
+        if mismatches:
+            raise CrossCheckError(step, mismatches)
+
+    return zones * steps, scalar_seconds, batch_seconds
+
+
+def main() -> None:
+    """Run the cross-check and benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--zones", type=int, default=1000, help="Number of zones")
+    parser.add_argument("--steps", type=int, default=200, help="Evaluation steps")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    try:
+        evaluations, scalar_seconds, batch_seconds = cross_check(
+            args.zones, args.steps, args.seed
+        )
+    except CrossCheckError as err:
+        parser.exit(1, f"Scalar and batch disagree: {err}\n")
+    print(f"Zone evaluations:    {evaluations} (scalar and batch agree)")
+    print(f"Scalar kernel:       {scalar_seconds:.3f} s ({evaluations / scalar_seconds:,.0f}/s)")
+    print(f"Batch evaluator:     {batch_seconds:.3f} s ({evaluations / batch_seconds:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
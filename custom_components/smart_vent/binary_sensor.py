@@ -2,15 +2,13 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -24,9 +22,18 @@ async def async_setup_platform(
     if discovery_info is None:
         return
 
-    coordinator = discovery_info["coordinator"]
-    _LOGGER.info("Auto Boost binary sensor created")
-    async_add_entities([SmartVentAutoBoostSensor(coordinator)], True)
+    zones = discovery_info["zones"]
+    _LOGGER.info("Auto Boost binary sensors created for %d zone(s)", len(zones))
+    async_add_entities([SmartVentAutoBoostSensor(coordinator) for coordinator in zones])
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the auto-boost binary sensor of a config entry zone."""
+    async_add_entities([SmartVentAutoBoostSensor(entry.runtime_data)])
 
 
 class SmartVentAutoBoostSensor(CoordinatorEntity, BinarySensorEntity):
@@ -35,36 +42,56 @@ class SmartVentAutoBoostSensor(CoordinatorEntity, BinarySensorEntity):
     def __init__(self, coordinator) -> None:
         """Initialize the auto-boost sensor."""
         super().__init__(coordinator)
-        self._attr_name = "Smart Vent Auto Boost"
-        self._attr_unique_id = "smart_vent_auto_boost"
-
-    @property
-    def is_on(self) -> bool:
-        """Return true if auto-boost is active."""
-        return self.coordinator.auto_boost_active
-
-    @property
-    def icon(self) -> str:
-        """Return the icon to use in the frontend."""
-        if self.is_on:
-            return "mdi:fan-plus"
-        return "mdi:fan"
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return additional state attributes."""
+        if coordinator.zone_name is None:
+            # Single unnamed zone keeps the original entity identity
+            self._attr_name = "Smart Vent Auto Boost"
+            self._attr_unique_id = "smart_vent_auto_boost"
+        else:
+            self._attr_name = f"Smart Vent {coordinator.zone_name} Auto Boost"
+            self._attr_unique_id = f"smart_vent_{coordinator.zone_id}_auto_boost"
+        self._attr_is_on = None
+        self._attr_extra_state_attributes = {}
+        self._last_available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Build the initial state and attributes once the entity is added."""
+        await super().async_added_to_hass()
+        self._async_update_attrs()
+
+    def _async_update_attrs(self) -> bool:
+        """Rebuild the state and attributes from the coordinator.
+
+        The boost end is a fixed timestamp rather than a countdown, so the
+        attributes only change when a boost starts or ends or the counter
+        moves.
+
+        Returns:
+            True if the state or an attribute changed
+        """
+        coordinator = self.coordinator
+        is_on = coordinator.auto_boost_active
         attributes = {
-            "boosts_used_today": self.coordinator.auto_boost_count_today,
-            "max_boosts_per_day": self.coordinator.max_boosts_per_day,
+            "boosts_used_today": coordinator.auto_boost_count_today,
+            "max_boosts_per_day": coordinator.max_boosts_per_day,
         }
+        start_time = coordinator.auto_boost_start_time
+        end_time = coordinator.auto_boost_end_time
+        if is_on and start_time is not None:
+            attributes["boost_start_time"] = start_time.isoformat()
+        if is_on and end_time is not None:
+            attributes["boost_end_time"] = end_time.isoformat()
 
-        # Add time remaining if boost is active
-        if self.coordinator.auto_boost_active and self.coordinator.auto_boost_end_time:
-            now = datetime.now()
-            time_remaining = self.coordinator.auto_boost_end_time - now
-            if time_remaining.total_seconds() > 0:
-                attributes["time_remaining_seconds"] = int(time_remaining.total_seconds())
-                attributes["time_remaining_minutes"] = round(time_remaining.total_seconds() / 60, 1)
-                attributes["boost_end_time"] = self.coordinator.auto_boost_end_time.isoformat()
+        if is_on == self._attr_is_on and attributes == self._attr_extra_state_attributes:
+            return False
+        self._attr_is_on = is_on
+        self._attr_icon = "mdi:fan-plus" if is_on else "mdi:fan"
+        self._attr_extra_state_attributes = attributes
+        return True
 
-        return attributes
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it or an attribute changed."""
+        available = self.available
+        if self._async_update_attrs() or available != self._last_available:
+            self._last_available = available
+            self.async_write_ha_state()
@@ -0,0 +1,274 @@
+"""Whole-house airflow budget for Smart Ventilation Controller.
+
+Every zone limits only its own boosts per day. When several bathrooms boost
+at once, the shared supply and exhaust ducts saturate and the total power
+spikes. The budget caps the combined airflow of all boosting zones: a zone
+whose humidity calls for an auto-boost must be granted its share first.
+Requests that do not fit wait in a queue ordered by humidity severity, and
+the zone keeps running at mid meanwhile. When a boost ends, the freed
+airflow goes to the most severe waiting zones, which are woken up for an
+evaluation.
+
+Boosts the user asks for (switch in boost, force_boost service) are never
+refused, but their airflow counts against the budget.
+
+The queue is a binary heap with lazy deletion, so requests, withdrawals and
+grants are O(log n) in the number of waiting zones.
+
+Times are monotonic seconds passed in by the caller, so the budget runs on
+the same clock as the zones; the module never reads a clock.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import heapq
+import itertools
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Airflow is a float sum; allow a boost that fits exactly
+EPSILON = 1e-9
+
+# Fields of a queue entry (a list, so an entry can be invalidated in place)
+_PRIORITY, _SEQ, _ZONE, _AIRFLOW, _QUEUED_AT, _VALID = range(6)
+
+
+class AirflowBudget:
+    """Allocate a shared airflow (or power) budget to boosting zones."""
+
+    def __init__(self, capacity: float, wake: Callable[[str], None]) -> None:
+        """Initialize the budget.
+
+        Args:
+            capacity: Total airflow all boosting zones may use together
+            wake: Called with a zone id when a queued request was granted
+        """
+        self.capacity = capacity
+        self._wake = wake
+        self._listeners: list[Callable[[], None]] = []
+
+        # Airflow held by each boosting (or granted) zone and their sum
+        self._held: dict[str, float] = {}
+        self.load = 0.0
+
+        # Waiting requests: heap ordered by (-severity, arrival) plus the
+        # valid entry of each zone; replaced entries stay in the heap until
+        # they reach the top or the heap is compacted
+        self._heap: list[list[Any]] = []
+        self._queued: dict[str, list[Any]] = {}
+        self._seq = itertools.count()
+
+        # Telemetry
+        self.requests = 0
+        self.granted = 0
+        self.queued = 0
+        self.granted_from_queue = 0
+        self.withdrawn = 0
+        self.forced = 0
+        self.peak_load = 0.0
+        self.max_queue_length = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def queue_length(self) -> int:
+        """Return the number of zones waiting for a boost."""
+        return len(self._queued)
+
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener whenever the load or the queue changes.
+
+        Returns:
+            Callback that removes the listener
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def request(self, zone_id: str, airflow: float, severity: float, now: float) -> bool:
+        """Ask for the airflow of an auto-boost.
+
+        Called on every evaluation in which the zone would start an
+        auto-boost; a waiting zone only moves in the queue when its severity
+        changed.
+
+        Args:
+            zone_id: Requesting zone
+            airflow: Airflow the boost needs
+            severity: Priority of the request (higher is served first)
+            now: Current monotonic time
+
+        Returns:
+            True if the zone may boost now
+        """
+        if zone_id in self._held:
+            return True
+
+        entry = self._queued.get(zone_id)
+        if entry is not None and entry[_PRIORITY] == -severity:
+            return False
+
+        if entry is None:
+            self.requests += 1
+            queued_at = now
+        else:
+            entry[_VALID] = False
+            queued_at = entry[_QUEUED_AT]
+        new_entry = self._push(zone_id, airflow, severity, queued_at)
+        self._grant_waiting(now, requester=zone_id)
+
+        if zone_id in self._held:
+            if entry is None:
+                self.granted += 1
+            else:
+                self._record_wait(new_entry, now)
+            self._notify()
+            return True
+        if entry is None:
+            self.queued += 1
+            self.max_queue_length = max(self.max_queue_length, len(self._queued))
+            _LOGGER.info(
+                "Zone '%s' auto-boost queued, airflow budget in use: %.1f/%.1f",
+                zone_id,
+                self.load,
+                self.capacity,
+            )
+            self._notify()
+        return False
+
+    def withdraw(self, zone_id: str, now: float) -> None:
+        """Drop the waiting request of a zone that no longer needs a boost.
+
+        Args:
+            zone_id: Zone whose request is dropped
+            now: Current monotonic time
+        """
+        entry = self._queued.pop(zone_id, None)
+        if entry is None:
+            return
+        entry[_VALID] = False
+        self.withdrawn += 1
+        # The withdrawn request may have blocked smaller ones behind it
+        self._grant_waiting(now)
+        self._notify()
+
+    def update(self, zone_id: str, boosting: bool, airflow: float, now: float) -> None:
+        """Account for the current mode of a zone after every evaluation.
+
+        A zone that boosts without a grant (switch, service, restored state)
+        takes its airflow anyway; a zone that stopped boosting, or did not use
+        its grant, hands its airflow to the waiting zones.
+
+        Args:
+            zone_id: Zone that was evaluated
+            boosting: The zone is in boost mode
+            airflow: Airflow of the zone's boost
+            now: Current monotonic time
+        """
+        if boosting == (zone_id in self._held):
+            return
+
+        if boosting:
+            entry = self._queued.pop(zone_id, None)
+            if entry is not None:
+                entry[_VALID] = False
+            self.forced += 1
+            self._hold(zone_id, airflow)
+        else:
+            self.load -= self._held.pop(zone_id)
+            if not self._held:
+                # Drop accumulated rounding errors
+                self.load = 0.0
+            self._grant_waiting(now)
+        self._notify()
+
+    def _push(
+        self, zone_id: str, airflow: float, severity: float, queued_at: float
+    ) -> list[Any]:
+        """Add or replace the waiting request of a zone and return its entry."""
+        entry = [-severity, next(self._seq), zone_id, airflow, queued_at, True]
+        self._queued[zone_id] = entry
+        heapq.heappush(self._heap, entry)
+        # Keep replaced entries from piling up behind a blocked head
+        if len(self._heap) > 2 * len(self._queued) + 32:
+            self._heap = list(self._queued.values())
+            heapq.heapify(self._heap)
+        return entry
+
+    def _hold(self, zone_id: str, airflow: float) -> None:
+        """Assign airflow to a zone."""
+        self._held[zone_id] = airflow
+        self.load += airflow
+        self.peak_load = max(self.peak_load, self.load)
+
+    def _grant_waiting(self, now: float, requester: str | None = None) -> None:
+        """Grant waiting requests in priority order while they fit.
+
+        Strict priority: a request that does not fit blocks the ones behind
+        it, so a large zone is not starved by smaller ones. A request larger
+        than the whole budget is granted once nothing else is running.
+
+        Args:
+            now: Current monotonic time
+            requester: Zone currently evaluating; it learns about its grant
+                from the return value of request() instead of a wake-up
+        """
+        heap = self._heap
+        while heap:
+            entry = heap[0]
+            if not entry[_VALID]:
+                heapq.heappop(heap)
+                continue
+            airflow = entry[_AIRFLOW]
+            if self._held and self.load + airflow > self.capacity + EPSILON:
+                break
+
+            heapq.heappop(heap)
+            zone_id = entry[_ZONE]
+            del self._queued[zone_id]
+            self._hold(zone_id, airflow)
+
+            if zone_id == requester:
+                continue
+            self._record_wait(entry, now)
+            _LOGGER.info("Zone '%s' auto-boost granted from the queue", zone_id)
+            self._wake(zone_id)
+
+    def _record_wait(self, entry: list[Any], now: float) -> None:
+        """Count a grant of a request that had to wait."""
+        waited = now - entry[_QUEUED_AT]
+        self.granted_from_queue += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def _notify(self) -> None:
+        """Inform the listeners about a change."""
+        for listener in list(self._listeners):
+            listener()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the budget state and telemetry for diagnostics."""
+        waiting = sorted(self._queued.values())
+        return {
+            "capacity": self.capacity,
+            "load": round(self.load, 3),
+            "peak_load": round(self.peak_load, 3),
+            "boosting": dict(self._held),
+            "queue": [
+                {"zone": entry[_ZONE], "severity": -entry[_PRIORITY]} for entry in waiting
+            ],
+            "requests": self.requests,
+            "granted": self.granted,
+            "queued": self.queued,
+            "granted_from_queue": self.granted_from_queue,
+            "withdrawn": self.withdrawn,
+            "forced": self.forced,
+            "max_queue_length": self.max_queue_length,
+            "wait_mean_s": (
+                round(self.wait_total / self.granted_from_queue, 1)
+                if self.granted_from_queue
+                else None
+            ),
+            "wait_max_s": round(self.wait_max, 1),
+        }
@@ -0,0 +1,50 @@
+"""Clocks for Smart Ventilation Controller.
+
+Durations (boost expiry, minimum boost time, deadlines) are measured on the
+monotonic clock, so an NTP step or a DST change can neither end a boost
+early nor extend it. Calendar decisions (the daily boost counter, midnight)
+use the local date in Home Assistant's configured time zone. Wall-clock
+datetimes only appear at the edges: persisted state and entity attributes.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import time
+
+import homeassistant.util.dt as dt_util
+
+
+def monotonic() -> float:
+    """Return the monotonic time in seconds, the time base of the kernel."""
+    return time.monotonic()
+
+
+def now() -> datetime:
+    """Return the current time in Home Assistant's time zone."""
+    return dt_util.now()
+
+
+def day(value: datetime) -> int:
+    """Return the ordinal of the local day, used for the daily reset."""
+    return value.date().toordinal()
+
+
+def next_midnight(value: datetime) -> datetime:
+    """Return the start of the next local day (DST aware)."""
+    return dt_util.start_of_local_day(value.date() + timedelta(days=1))
+
+
+def to_datetime(timestamp: float) -> datetime:
+    """Return the local wall-clock time of a monotonic timestamp."""
+    return dt_util.now() + timedelta(seconds=timestamp - time.monotonic())
+
+
+def from_datetime(value: datetime) -> float:
+    """Return the monotonic timestamp of a wall-clock time.
+
+    Naive values, as stored by older versions, are taken as system local
+    time.
+    """
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return time.monotonic() + (value - dt_util.now()).total_seconds()
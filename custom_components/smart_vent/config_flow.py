@@ -1 +1,177 @@
-"""Config flow for Smart Ventilation Controller (placeholder for future UI configuration)."""
+"""Config flow for Smart Ventilation Controller.
+
+Every config entry is one zone. The user step picks the zone's entities; the
+options flow sets its speeds, thresholds and check interval. Saving the
+options reloads only that zone, which keeps its runtime state, so nothing
+requires a Home Assistant restart. Advanced settings (filters, fusion,
+schedules, airflow budget) remain YAML-only.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
+from homeassistant.helpers import selector
+from homeassistant.util import slugify
+
+from .const import (
+    BOOST_CONTROL_CLOSED_LOOP,
+    BOOST_CONTROL_FIXED,
+    DEFAULT_AUTO_BOOST_DURATION,
+    DEFAULT_AUTO_BOOST_TRIGGER,
+    DEFAULT_BOOST_CONTROL,
+    DEFAULT_CHECK_INTERVAL,
+    DEFAULT_MAX_BOOSTS_PER_DAY,
+    DEFAULT_RESEND_INTERVAL,
+    DEFAULT_SPEEDS,
+    DOMAIN,
+    TRIGGER_DELTA,
+    TRIGGER_LEVEL,
+    TRIGGER_RATE,
+)
+
+# Options flow fields with their defaults
+DEFAULT_OPTIONS = {
+    "speed_low": DEFAULT_SPEEDS["low"],
+    "speed_mid": DEFAULT_SPEEDS["mid"],
+    "speed_boost": DEFAULT_SPEEDS["boost"],
+    "check_interval": DEFAULT_CHECK_INTERVAL,
+    "max_boosts_per_day": DEFAULT_MAX_BOOSTS_PER_DAY,
+    "auto_boost_duration": DEFAULT_AUTO_BOOST_DURATION,
+    "resend_interval": DEFAULT_RESEND_INTERVAL,
+    "trigger_type": DEFAULT_AUTO_BOOST_TRIGGER["type"],
+    "trigger_threshold": DEFAULT_AUTO_BOOST_TRIGGER["threshold"],
+    "trigger_rate": DEFAULT_AUTO_BOOST_TRIGGER["rate"],
+    "trigger_delta": DEFAULT_AUTO_BOOST_TRIGGER["delta"],
+    "boost_control": DEFAULT_BOOST_CONTROL["mode"],
+    "off_threshold": DEFAULT_BOOST_CONTROL["off_threshold"],
+}
+
+USER_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): selector.TextSelector(),
+        vol.Required("fan_entity"): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=["fan", "light"])
+        ),
+        vol.Required("humidity_sensor"): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="sensor", device_class="humidity", multiple=True
+            )
+        ),
+        vol.Required("input_0"): selector.EntitySelector(),
+        vol.Required("input_1"): selector.EntitySelector(),
+    }
+)
+
+
+def _number(
+    minimum: float, maximum: float, unit: str | None = None, step: float = 1
+) -> selector.NumberSelector:
+    """Return a number box selector with the range of the YAML option."""
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=minimum,
+            max=maximum,
+            step=step,
+            unit_of_measurement=unit,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    )
+
+
+def _select(options: list[str], translation_key: str) -> selector.SelectSelector:
+    """Return a drop-down selector with translated options."""
+    return selector.SelectSelector(
+        selector.SelectSelectorConfig(options=options, translation_key=translation_key)
+    )
+
+
+def _options_schema(options: Mapping[str, Any]) -> vol.Schema:
+    """Return the options form, pre-filled with the current options."""
+    current = {**DEFAULT_OPTIONS, **options}
+
+    def _field(key: str) -> vol.Required:
+        return vol.Required(key, default=current[key])
+
+    return vol.Schema(
+        {
+            _field("speed_low"): _number(0, 100, "%"),
+            _field("speed_mid"): _number(0, 100, "%"),
+            _field("speed_boost"): _number(0, 100, "%"),
+            _field("check_interval"): _number(1, 3600, "s"),
+            _field("max_boosts_per_day"): _number(1, 100),
+            _field("auto_boost_duration"): _number(1, 120, "min"),
+            _field("resend_interval"): _number(0, 86400, "s"),
+            _field("trigger_type"): _select(
+                [TRIGGER_LEVEL, TRIGGER_RATE, TRIGGER_DELTA], "trigger_type"
+            ),
+            _field("trigger_threshold"): _number(0, 100, "%"),
+            _field("trigger_rate"): _number(0.1, 50, "%/min", 0.1),
+            _field("trigger_delta"): _number(1, 100, "%"),
+            _field("boost_control"): _select(
+                [BOOST_CONTROL_FIXED, BOOST_CONTROL_CLOSED_LOOP], "boost_control"
+            ),
+            _field("off_threshold"): _number(0, 100, "%"),
+        }
+    )
+
+
+class SmartVentConfigFlow(ConfigFlow, domain=DOMAIN):
+    """Create a zone from the UI."""
+
+    VERSION = 1
+
+    async def async_step_user(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Pick the name and entities of a new zone."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            zone_id = slugify(user_input["name"])
+            await self.async_set_unique_id(zone_id)
+            self._abort_if_unique_id_configured()
+
+            manager = self.hass.data.get(DOMAIN)
+            if manager is not None and zone_id in manager.zones:
+                # A YAML zone with the same name
+                errors["name"] = "zone_exists"
+            if not user_input["humidity_sensor"]:
+                errors["humidity_sensor"] = "no_humidity_sensor"
+            if not errors:
+                return self.async_create_entry(title=user_input["name"], data=user_input)
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=self.add_suggested_values_to_schema(USER_SCHEMA, user_input),
+            errors=errors,
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> SmartVentOptionsFlow:
+        """Return the options flow."""
+        return SmartVentOptionsFlow()
+
+
+class SmartVentOptionsFlow(OptionsFlow):
+    """Change the speeds, thresholds and check interval of a zone."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Show and save the zone options; saving reloads the zone."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init", data_schema=_options_schema(self.config_entry.options)
+        )
@@ -3,6 +3,9 @@
 # Component domain
 DOMAIN = "smart_vent"
 
+# Zone id used when a single unnamed zone is configured
+DEFAULT_ZONE_ID = "default"
+
 # Mode constants
 MODE_LOW = "low"
 MODE_MID = "mid"
@@ -15,11 +18,174 @@ DEFAULT_SPEEDS = {
     MODE_BOOST: 100,
 }
 
+# Switch positions of the classic 3-position switch on two inputs: one '0'
+# or '1' per input in input order (input_0 first)
+DEFAULT_SWITCH_POSITIONS = {
+    "00": MODE_LOW,
+    "10": MODE_MID,
+    "01": MODE_BOOST,
+}
+
+# Most binary inputs one switch may use (the position table has 2**n rows)
+MAX_SWITCH_INPUTS = 8
+
+# Seconds a new switch input combination must hold before it is used, so the
+# intermediate states of a moving switch cause no fan writes
+DEFAULT_SETTLE_TIME = 0.5
+
 # Default check interval in seconds
 DEFAULT_CHECK_INTERVAL = 20
 
+# Scheduling modes: fixed-interval polling or event-driven deadline scheduling
+SCHEDULING_INTERVAL = "interval"
+SCHEDULING_EVENT = "event"
+DEFAULT_SCHEDULING = SCHEDULING_INTERVAL
+
+# Seconds a zone waits after Home Assistant started for its fan and inputs to
+# report valid states before making its first decision anyway
+DEFAULT_STARTUP_TIMEOUT = 60
+
 # Default maximum number of automatic boost activations per day
 DEFAULT_MAX_BOOSTS_PER_DAY = 5
 
 # Default auto-boost duration in minutes
 DEFAULT_AUTO_BOOST_DURATION = 20
+
+# Default interval in seconds after which an unchanged fan command is resent
+DEFAULT_RESEND_INTERVAL = 600
+
+# Whole-house airflow budget shared by all boosting zones (0 = unlimited) and
+# the default airflow one zone's boost takes from it, in the same unit
+DEFAULT_AIRFLOW_BUDGET = 0
+DEFAULT_BOOST_AIRFLOW = 1
+
+# Auto-boost humidity trigger types
+TRIGGER_LEVEL = "level"
+TRIGGER_RATE = "rate"
+TRIGGER_DELTA = "delta"
+
+# Default auto-boost humidity trigger: smoothed humidity above 80%. The mean
+# and trend cover at most `window` samples of the last `max_age` minutes
+DEFAULT_AUTO_BOOST_TRIGGER = {
+    "type": TRIGGER_LEVEL,
+    "threshold": 80,
+    "rate": 1.0,
+    "delta": 10,
+    "window": 12,
+    "max_age": 10,
+}
+
+# Auto-boost control modes: fixed duration or closed loop on humidity recovery
+BOOST_CONTROL_FIXED = "fixed"
+BOOST_CONTROL_CLOSED_LOOP = "closed_loop"
+
+# Default auto-boost control (durations in minutes, thresholds in %)
+DEFAULT_BOOST_CONTROL = {
+    "mode": BOOST_CONTROL_FIXED,
+    "off_threshold": 70,
+    "baseline_margin": 3,
+    "min_duration": 5,
+    "max_duration": 40,
+}
+
+# Speed control in the mid switch position: fixed mid speed or PI control
+MID_CONTROL_FIXED = "fixed"
+MID_CONTROL_PROPORTIONAL = "proportional"
+
+# Default mid control (setpoint in %, step in %, min_interval in seconds)
+DEFAULT_MID_CONTROL = {
+    "mode": MID_CONTROL_FIXED,
+    "setpoint": 60,
+    "kp": 2.0,
+    "ki": 0.1,
+    "step": 5,
+    "min_interval": 60,
+}
+
+# Sources that request a zone evaluation, counted in the zone metrics
+REFRESH_STARTUP = "startup"
+REFRESH_TIMER = "timer"
+REFRESH_DEADLINE = "deadline"
+REFRESH_STATE = "state"
+REFRESH_SERVICE = "service"
+REFRESH_BUDGET = "budget"
+REFRESH_SCHEDULE = "schedule"
+REFRESH_SOURCES = (
+    REFRESH_STARTUP,
+    REFRESH_TIMER,
+    REFRESH_DEADLINE,
+    REFRESH_STATE,
+    REFRESH_SERVICE,
+    REFRESH_BUDGET,
+    REFRESH_SCHEDULE,
+)
+
+# Per-zone decision trace modes (see tracing.py)
+TRACE_OFF = "off"
+TRACE_CHANGES = "changes"
+TRACE_SAMPLED = "sampled"
+TRACE_ALL = "all"
+TRACE_MODES = (TRACE_OFF, TRACE_CHANGES, TRACE_SAMPLED, TRACE_ALL)
+DEFAULT_TRACE_MODE = TRACE_CHANGES
+
+# Default seconds between sampled records of unchanged evaluations
+DEFAULT_TRACE_INTERVAL = 60
+
+# What caused a decision recorded in the decision history (see history.py);
+# the index is stored in the record, so only append new triggers
+HISTORY_SWITCH = "switch"
+HISTORY_AUTO_BOOST = "auto_boost"
+HISTORY_BOOST_END = "boost_end"
+HISTORY_SET_MODE = "set_mode"
+HISTORY_FORCE_BOOST = "force_boost"
+HISTORY_SCHEDULE = "schedule"
+HISTORY_MID_CONTROL = "mid_control"
+HISTORY_MANUAL_SPEED = "manual_speed"
+HISTORY_TRIGGERS = (
+    HISTORY_SWITCH,
+    HISTORY_AUTO_BOOST,
+    HISTORY_BOOST_END,
+    HISTORY_SET_MODE,
+    HISTORY_FORCE_BOOST,
+    HISTORY_SCHEDULE,
+    HISTORY_MID_CONTROL,
+    HISTORY_MANUAL_SPEED,
+)
+
+# Default number of decision records kept per zone (21 bytes each)
+DEFAULT_HISTORY_SIZE = 10000
+
+# File formats of the export_history service
+EXPORT_CSV = "csv"
+EXPORT_PARQUET = "parquet"
+EXPORT_FORMATS = (EXPORT_CSV, EXPORT_PARQUET)
+
+# Directory in the configuration directory that exports are written to
+# unless the service call names another (allowlisted) directory
+EXPORT_DIRECTORY = "smart_vent_history"
+
+# Default humidity input filter (deadband in %, times in seconds, median
+# over N readings; stale_timeout 0 disables stale detection)
+DEFAULT_HUMIDITY_FILTER = {
+    "deadband": 0.1,
+    "min_interval": 0,
+    "median": 1,
+    "stale_timeout": 3600,
+}
+
+# Multi-sensor humidity fusion policies (see fusion.py)
+FUSION_MAX = "max"
+FUSION_MEDIAN = "median"
+FUSION_WEIGHTED = "weighted"
+FUSION_FALLBACK = "fallback"
+FUSION_POLICIES = (FUSION_MAX, FUSION_MEDIAN, FUSION_WEIGHTED, FUSION_FALLBACK)
+
+# Default fusion of a zone's humidity sensors (weights only apply to the
+# weighted policy; empty means equal weights)
+DEFAULT_HUMIDITY_FUSION = {
+    "policy": FUSION_MAX,
+    "weights": [],
+}
+
+# Weekday names used by schedule entries, Monday first
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
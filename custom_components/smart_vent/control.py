@@ -0,0 +1,117 @@
+"""Proportional speed control for Smart Ventilation Controller.
+
+A PI controller that maps the humidity error in the mid switch position to
+a fan speed between the low and boost speeds. The output is quantized and
+rate limited, so small humidity changes don't turn into device writes.
+"""
+from __future__ import annotations
+
+# Longest time step integrated at once, in seconds. Bounds the jump of the
+# integral term after a long gap between samples (e.g. a sensor dropout).
+MAX_DT = 300
+
+
+class PIController:
+    """PI controller with anti-windup, output quantization and rate limiting."""
+
+    __slots__ = (
+        "setpoint",
+        "kp",
+        "ki",
+        "bias",
+        "output_min",
+        "output_max",
+        "step",
+        "min_interval",
+        "_integral",
+        "_last_update",
+        "_last_change",
+        "output",
+    )
+
+    def __init__(
+        self,
+        setpoint: float,
+        kp: float,
+        ki: float,
+        bias: float,
+        output_min: float,
+        output_max: float,
+        step: int,
+        min_interval: float,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            setpoint: Target humidity in percent
+            kp: Proportional gain (% speed per % humidity above setpoint)
+            ki: Integral gain (% speed per % humidity and minute)
+            bias: Output at zero error (normally the mid speed)
+            output_min: Lowest speed the controller may emit
+            output_max: Highest speed the controller may emit
+            step: Output quantization in percent
+            min_interval: Minimum seconds between two output changes
+        """
+        self.setpoint = setpoint
+        self.kp = kp
+        self.ki = ki
+        self.bias = bias
+        self.output_min = output_min
+        self.output_max = output_max
+        self.step = step
+        self.min_interval = min_interval
+        self._integral = 0.0
+        self._last_update: float | None = None
+        self._last_change: float | None = None
+        self.output: int | None = None
+
+    def reset(self) -> None:
+        """Forget the integral term and the last output."""
+        self._integral = 0.0
+        self._last_update = None
+        self._last_change = None
+        self.output = None
+
+    def _quantize(self, value: float) -> int:
+        """Round to the output step and clamp to the output range."""
+        quantized = round(value / self.step) * self.step
+        return int(min(self.output_max, max(self.output_min, quantized)))
+
+    def update(self, measurement: float, now: float) -> int | None:
+        """Feed a humidity measurement and return a new speed if it changed.
+
+        Args:
+            measurement: Current (smoothed) humidity in percent
+            now: Monotonic time in seconds
+
+        Returns:
+            New fan speed percentage, or None if the output stays the same
+        """
+        error = measurement - self.setpoint
+        dt = 0.0 if self._last_update is None else min(now - self._last_update, MAX_DT)
+        self._last_update = now
+
+        unclamped = self.bias + self.kp * error + self.ki * self._integral
+        # Anti-windup: stop integrating while the output is saturated in the
+        # direction the error would push it further
+        saturated = (unclamped >= self.output_max and error > 0) or (
+            unclamped <= self.output_min and error < 0
+        )
+        if not saturated:
+            self._integral += error * dt / 60
+
+        output = self._quantize(self.bias + self.kp * error + self.ki * self._integral)
+
+        if self.output is None:
+            self.output = output
+            self._last_change = now
+            return output
+
+        if abs(output - self.output) < self.step:
+            return None
+        if self._last_change is not None and now - self._last_change < self.min_interval:
+            return None
+
+        self.output = output
+        self._last_change = now
+        return output
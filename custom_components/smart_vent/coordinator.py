@@ -1,15 +1,73 @@
 """DataUpdateCoordinator for Smart Ventilation Controller."""
-from datetime import datetime, timedelta
+import asyncio
+from dataclasses import replace
+from datetime import date, datetime
 import logging
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from . import clock
+from .actuator import FanActuator
+from .budget import AirflowBudget
+from .const import (
+    BOOST_CONTROL_CLOSED_LOOP,
+    DEFAULT_AUTO_BOOST_TRIGGER,
+    DEFAULT_BOOST_AIRFLOW,
+    DEFAULT_BOOST_CONTROL,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_HUMIDITY_FILTER,
+    DEFAULT_HUMIDITY_FUSION,
+    DEFAULT_MID_CONTROL,
+    DEFAULT_RESEND_INTERVAL,
+    DEFAULT_SETTLE_TIME,
+    DEFAULT_SWITCH_POSITIONS,
+    DEFAULT_ZONE_ID,
+    DOMAIN,
+    HISTORY_AUTO_BOOST,
+    HISTORY_BOOST_END,
+    HISTORY_FORCE_BOOST,
+    HISTORY_MANUAL_SPEED,
+    HISTORY_MID_CONTROL,
+    HISTORY_SCHEDULE,
+    HISTORY_SET_MODE,
+    HISTORY_SWITCH,
+    MID_CONTROL_PROPORTIONAL,
+    REFRESH_SERVICE,
+    REFRESH_STARTUP,
+    REFRESH_STATE,
+    REFRESH_TIMER,
+    TRIGGER_DELTA,
+    TRIGGER_RATE,
+)
+from .control import PIController
+from .decoder import SwitchDecoder
+from .fusion import HumidityFusion
+from .history import DecisionHistory
+from .humidity import HumidityHistory
+from .kernel import (
+    MODE_LABELS,
+    BoostKind,
+    KernelConfig,
+    Mode,
+    ZoneInputs,
+    ZoneState,
+    decide,
+    force_boost as kernel_force_boost,
+    min_boost_end,
+    set_mode as kernel_set_mode,
+)
+from .metrics import ZoneMetrics
+from .schedule import Profile, ScheduleTable
+from .tracing import TRACE_LOGGER, DecisionTracer
+from .usage import PowerCurve, ZoneUsage
 
 _LOGGER = logging.getLogger(__name__)
 
+# Sensor states that carry no reading
+UNAVAILABLE_STATES = ("unavailable", "unknown", "none", "None")
+
 
 class SmartVentCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Smart Vent data and controlling the fan."""
@@ -18,471 +76,1032 @@ class SmartVentCoordinator(DataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         fan_entity: str,
-        humidity_sensor: str,
-        input_0: str,
-        input_1: str,
+        humidity_sensor: str | list[str],
+        inputs: list[str],
         speeds: dict[str, int],
         check_interval: int,
         max_boosts_per_day: int,
         auto_boost_duration: int,
+        resend_interval: int = DEFAULT_RESEND_INTERVAL,
+        auto_boost_trigger: dict[str, Any] | None = None,
+        boost_control: dict[str, Any] | None = None,
+        mid_control: dict[str, Any] | None = None,
+        humidity_filter: dict[str, Any] | None = None,
+        humidity_fusion: dict[str, Any] | None = None,
+        boost_airflow: float = DEFAULT_BOOST_AIRFLOW,
+        schedule: list[dict[str, Any]] | None = None,
+        switch_positions: dict[str, str] | None = None,
+        settle_time: float = DEFAULT_SETTLE_TIME,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        power_curve: dict[int, float] | None = None,
+        zone_id: str = DEFAULT_ZONE_ID,
+        name: str | None = None,
     ) -> None:
-        """Initialize the coordinator."""
+        """Initialize the coordinator.
+
+        Periodic refreshes are driven by the shared SmartVentManager timer,
+        so the coordinator itself does not schedule any updates.
+        """
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=check_interval),
+            name=f"{DOMAIN}_{zone_id}",
+            update_interval=None,
         )
 
+        # Zone identity
+        self.zone_id = zone_id
+        self.zone_name = name
+
         # Store configuration
         self.fan_entity = fan_entity
-        self.humidity_sensor = humidity_sensor
-        self.input_0 = input_0
-        self.input_1 = input_1
+        if isinstance(humidity_sensor, str):
+            humidity_sensor = [humidity_sensor]
+        self.humidity_sensors = list(humidity_sensor)
+        # Primary sensor, used in log messages
+        self.humidity_sensor = self.humidity_sensors[0]
+        # Switch inputs and the decoder of their combinations into modes
+        self.inputs = list(inputs)
+        self.switch_decoder = SwitchDecoder(
+            len(self.inputs), switch_positions or DEFAULT_SWITCH_POSITIONS, settle_time
+        )
         self.speeds = speeds
         self.check_interval = check_interval
         self.max_boosts_per_day = max_boosts_per_day
         self.auto_boost_duration = auto_boost_duration
 
-        # Initialize state tracking
-        self.current_mode = "low"
+        # Humidity trigger and rolling history of the humidity sensor
+        self.auto_boost_trigger = auto_boost_trigger or DEFAULT_AUTO_BOOST_TRIGGER
+        self.humidity_history = HumidityHistory(
+            self.auto_boost_trigger["window"],
+            self.auto_boost_trigger.get("max_age", DEFAULT_AUTO_BOOST_TRIGGER["max_age"]) * 60,
+        )
+
+        # Input stage in front of the history: every sensor is filtered on
+        # its own and only a meaningful change of the fused value reaches
+        # the history and triggers an evaluation
+        humidity_fusion = humidity_fusion or DEFAULT_HUMIDITY_FUSION
+        self.humidity = HumidityFusion(
+            self.humidity_sensors,
+            policy=humidity_fusion["policy"],
+            weights=humidity_fusion["weights"],
+            filter_options=humidity_filter or DEFAULT_HUMIDITY_FILTER,
+        )
+        self.humidity_stale = False
+
+        # Share of the whole-house airflow budget a boost of this zone takes;
+        # the manager attaches the shared budget if one is configured
+        self.boost_airflow = boost_airflow
+        self.budget: AirflowBudget | None = None
+
+        # Fixed-duration or closed-loop auto-boost control
+        self.boost_control = boost_control or DEFAULT_BOOST_CONTROL
+
+        # Optional PI control of the speed in the mid switch position
+        self.mid_control = mid_control or DEFAULT_MID_CONTROL
+        self.mid_controller: PIController | None = None
+        if self.mid_control["mode"] == MID_CONTROL_PROPORTIONAL:
+            self.mid_controller = PIController(
+                setpoint=self.mid_control["setpoint"],
+                kp=self.mid_control["kp"],
+                ki=self.mid_control["ki"],
+                bias=speeds["mid"],
+                output_min=speeds["low"],
+                output_max=speeds["boost"],
+                step=self.mid_control["step"],
+                min_interval=self.mid_control["min_interval"],
+            )
+
+        # Fan actuator with write suppression
+        self.actuator = FanActuator(hass, fan_entity, resend_interval)
+
+        # Static configuration and runtime state of the decision kernel
+        closed_loop = self.boost_control["mode"] == BOOST_CONTROL_CLOSED_LOOP
+        self.kernel_config = KernelConfig(
+            speeds=(speeds["low"], speeds["mid"], speeds["boost"]),
+            max_boosts_per_day=max_boosts_per_day,
+            auto_boost_duration=auto_boost_duration * 60,
+            closed_loop=closed_loop,
+            min_boost_duration=self.boost_control["min_duration"] * 60,
+            max_boost_duration=self.boost_control["max_duration"] * 60,
+        )
+        self.state = ZoneState()
         self.target_speed = speeds["low"]
+        # Wall-clock times of kernel timestamps, see _wall_time()
+        self._wall_times: dict[float, datetime] = {}
 
-        # Auto-boost tracking
-        self.auto_boost_active = False
-        self.auto_boost_end_time = None
-        self.auto_boost_count_today = 0
-        self.last_reset_date = None
+        # Time-of-day profiles; the manager activates them at transitions
+        self.schedule = ScheduleTable(schedule or [], speeds)
+        self.profile: Profile = self.schedule.default
 
-        # Manual boost tracking
-        self.manual_boost_active = False
-        self.mode_before_boost = None
-        self.last_switch_mode = None
+        # Set once the inputs are valid after startup, see async_start()
+        self.ready = False
+
+        # Single-flight evaluation pipeline: at most one evaluation running
+        # and at most one pending. A pending evaluation reads hass.states when
+        # it starts, so it always sees the latest inputs.
+        self._evaluation_task: asyncio.Task | None = None
+        self._evaluation_pending = False
+        self.evaluations_requested = 0
+        self.evaluations_run = 0
+
+        # Latency histograms and counters for diagnostics
+        self.metrics = ZoneMetrics()
+
+        # Compact per-evaluation decision records, switchable at runtime
+        self.tracer = DecisionTracer()
+
+        # Ring buffer of the decisions that changed the zone, for export
+        self.history = DecisionHistory(history_size)
+
+        # Time in each mode and estimated fan energy, published as statistics
+        self.usage = ZoneUsage(PowerCurve(power_curve) if power_curve else None)
 
         _LOGGER.info(
-            "SmartVentCoordinator initialized with fan=%s, humidity=%s, inputs=%s/%s",
+            "SmartVentCoordinator '%s' initialized with fan=%s, humidity=%s, inputs=%s",
+            zone_id,
             fan_entity,
             humidity_sensor,
-            input_0,
-            input_1,
+            "/".join(self.inputs),
         )
 
-    def _get_switch_state(self) -> tuple[str | None, str | None]:
-        """Get the current state of the two switch inputs.
+    @callback
+    def async_schedule_evaluation(self, source: str = REFRESH_TIMER) -> None:
+        """Request an evaluation, coalescing with any running or pending one.
 
-        Returns:
-            Tuple of (input_0_state, input_1_state) as strings ('on' or 'off')
-            Returns None for unavailable inputs
+        Bursts of requests collapse into at most one extra evaluation after
+        the one currently running.
+
+        Args:
+            source: What requested the evaluation (one of REFRESH_SOURCES)
+        """
+        self.evaluations_requested += 1
+        self.metrics.refresh_triggers[source] += 1
+        if self._evaluation_task is not None:
+            self._evaluation_pending = True
+            return
+        self._evaluation_task = self.hass.async_create_task(
+            self._async_run_evaluations()
+        )
+
+    async def async_evaluate(self, source: str = REFRESH_TIMER) -> None:
+        """Request an evaluation and wait until the pipeline is idle.
+
+        Args:
+            source: What requested the evaluation (one of REFRESH_SOURCES)
         """
-        state_0 = self.hass.states.get(self.input_0)
-        state_1 = self.hass.states.get(self.input_1)
+        self.async_schedule_evaluation(source)
+        if self._evaluation_task is not None:
+            # Unlike awaiting the task, wait() neither cancels it with the
+            # caller nor raises when the zone is stopped meanwhile
+            await asyncio.wait((self._evaluation_task,))
+
+    async def _async_run_evaluations(self) -> None:
+        """Run evaluations until no further request is pending."""
+        try:
+            while True:
+                self._evaluation_pending = False
+                self.evaluations_run += 1
+                with self.metrics.evaluation.time():
+                    await self.async_refresh()
+                if not self._evaluation_pending:
+                    break
+        finally:
+            self._evaluation_task = None
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel running and pending evaluations and stop the actuator."""
+        self._evaluation_pending = False
+        if self._evaluation_task is not None:
+            self._evaluation_task.cancel()
+        self.actuator.async_stop()
+
+    # Read-only views of the kernel state, used by entities and services
+
+    @property
+    def current_mode(self) -> str:
+        """Return the current mode name ('low', 'mid' or 'boost')."""
+        return self.state.mode.label
+
+    @property
+    def auto_boost_active(self) -> bool:
+        """Return True if an automatic or manual boost is running."""
+        return self.state.boost_active
+
+    @property
+    def manual_boost_active(self) -> bool:
+        """Return True if a manual (force_boost) boost is running."""
+        return self.state.boost_kind == BoostKind.MANUAL
+
+    @property
+    def auto_boost_count_today(self) -> int:
+        """Return the number of auto-boosts started today."""
+        return self.state.boost_count
+
+    @property
+    def auto_boost_start_time(self) -> datetime | None:
+        """Return when the running boost started."""
+        return self._wall_time(self.state.boost_start)
+
+    @property
+    def auto_boost_end_time(self) -> datetime | None:
+        """Return when the running boost will end at the latest."""
+        return self._wall_time(self.state.boost_end)
+
+    def _wall_time(self, timestamp: float | None) -> datetime | None:
+        """Return the local wall-clock time of a monotonic kernel timestamp.
+
+        The conversion is done once per timestamp: converting again on every
+        call would move the result by the time passed in between, and the
+        entity attributes built from it would never compare equal.
+        """
+        if timestamp is None:
+            return None
+        wall_time = self._wall_times.get(timestamp)
+        if wall_time is None:
+            # Only the start and end of the running boost are ever looked up
+            if len(self._wall_times) >= 4:
+                self._wall_times.clear()
+            wall_time = self._wall_times[timestamp] = clock.to_datetime(timestamp)
+        return wall_time
+
+    @property
+    def auto_boost_remaining(self) -> float | None:
+        """Return the seconds until the running boost ends at the latest."""
+        if self.state.boost_end is None:
+            return None
+        return max(0.0, self.state.boost_end - clock.monotonic())
+
+    def get_persistent_state(self) -> dict[str, Any]:
+        """Return the runtime state that must survive a restart."""
+        state = self.state
+        start_time = self.auto_boost_start_time
+        end_time = self.auto_boost_end_time
+        return {
+            "current_mode": self.current_mode,
+            "target_speed": self.target_speed,
+            "auto_boost_active": self.auto_boost_active,
+            "manual_boost_active": self.manual_boost_active,
+            "auto_boost_start_time": start_time.isoformat() if start_time else None,
+            "auto_boost_end_time": end_time.isoformat() if end_time else None,
+            "auto_boost_count_today": state.boost_count,
+            "last_reset_date": (
+                date.fromordinal(state.day).isoformat() if state.day is not None else None
+            ),
+            "mode_before_boost": (
+                state.mode_before_boost.label if state.mode_before_boost is not None else None
+            ),
+            "last_switch_mode": (
+                state.last_switch_mode.label if state.last_switch_mode is not None else None
+            ),
+            "usage": self.usage.as_dict(clock.monotonic()),
+        }
+
+    def restore_persistent_state(self, data: dict[str, Any]) -> None:
+        """Restore runtime state saved before a restart.
+
+        An expired boost is restored as well; the first evaluation ends it
+        through the regular timeout path.
 
-        # Debug: log the full state objects
-        if state_0 is None:
-            _LOGGER.debug("Input 0 entity '%s' not found in state registry", self.input_0)
-        else:
-            _LOGGER.debug("Input 0 state object: %s (state=%s)", state_0, state_0.state)
+        Args:
+            data: State previously returned by get_persistent_state()
+        """
 
-        if state_1 is None:
-            _LOGGER.debug("Input 1 entity '%s' not found in state registry", self.input_1)
-        else:
-            _LOGGER.debug("Input 1 state object: %s (state=%s)", state_1, state_1.state)
+        def _mode(value: Any) -> Mode | None:
+            return Mode.from_label(value) if value in MODE_LABELS else None
 
-        input_0_state = state_0.state if state_0 else None
-        input_1_state = state_1.state if state_1 else None
+        self.usage.restore(data.get("usage") or {})
 
-        _LOGGER.debug(
-            "Switch states: input_0=%s, input_1=%s", input_0_state, input_1_state
+        try:
+            start_time = data.get("auto_boost_start_time")
+            end_time = data.get("auto_boost_end_time")
+            reset_date = data.get("last_reset_date")
+            boost_start = (
+                clock.from_datetime(datetime.fromisoformat(start_time)) if start_time else None
+            )
+            boost_end = clock.from_datetime(datetime.fromisoformat(end_time)) if end_time else None
+            day = date.fromisoformat(reset_date).toordinal() if reset_date else None
+        except (TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid stored state for zone '%s': %s", self.zone_id, err)
+            return
+
+        boost_kind = BoostKind.NONE
+        if data.get("auto_boost_active") and boost_end is not None:
+            boost_kind = BoostKind.MANUAL if data.get("manual_boost_active") else BoostKind.AUTO
+            if boost_start is None:
+                # Stored before the start time was persisted; assume the boost
+                # ran for its full duration
+                config = self.kernel_config
+                duration = (
+                    config.max_boost_duration
+                    if config.closed_loop and boost_kind == BoostKind.AUTO
+                    else config.auto_boost_duration
+                )
+                boost_start = boost_end - duration
+
+        mode = _mode(data.get("current_mode")) or self.state.mode
+        self.state = ZoneState(
+            mode=mode,
+            boost_kind=boost_kind,
+            boost_start=boost_start if boost_kind != BoostKind.NONE else None,
+            boost_end=boost_end if boost_kind != BoostKind.NONE else None,
+            boost_count=int(data.get("auto_boost_count_today", 0)),
+            day=day,
+            mode_before_boost=_mode(data.get("mode_before_boost")),
+            last_switch_mode=_mode(data.get("last_switch_mode")),
         )
+        self.target_speed = data.get("target_speed", self.speeds[mode.label])
 
-        return input_0_state, input_1_state
+        _LOGGER.info(
+            "Zone '%s' state restored: mode=%s, boost_active=%s, boosts today=%d",
+            self.zone_id,
+            self.current_mode,
+            self.auto_boost_active,
+            self.auto_boost_count_today,
+        )
+
+    @property
+    def monitored_entities(self) -> list[str]:
+        """Return the entities whose state changes should trigger a refresh."""
+        return [*self.inputs, *self.humidity_sensors]
+
+    def unready_entities(self) -> list[str]:
+        """Return the fan and input entities that have no valid state yet."""
+        unready = []
+        for entity_id in (self.fan_entity, *self.monitored_entities):
+            state = self.hass.states.get(entity_id)
+            if state is None or state.state in UNAVAILABLE_STATES:
+                unready.append(entity_id)
+        return unready
+
+    async def async_start(self) -> None:
+        """Make the first decision; called once the inputs are valid.
+
+        Until then the zone only shows its restored state: it is not
+        evaluated and schedule profile changes only move the target speed.
+        If the first decision sends no command, the fan is brought to the
+        target speed; the actuator skips the write if it already runs at it.
+        """
+        self.ready = True
+        speed = self.target_speed
+        await self.async_evaluate(REFRESH_STARTUP)
+        if self.target_speed == speed:
+            self._set_fan_speed(speed)
 
     def _determine_switch_mode(self) -> str:
-        """Determine the mode based on switch position.
+        """Determine the mode based on the switch position.
 
-        Switch logic:
-        - off/off (0/0) → low
-        - on/off  (1/0) → mid
-        - off/on  (0/1) → boost
-        - on/on   (1/1) → invalid (returns low as safe fallback)
+        The input states are decoded through the compiled position table;
+        a new combination only counts once it has held for the settle time.
+        An unavailable input or a combination that is not a configured
+        position selects low as a safe fallback.
 
         Returns:
             Mode string: 'low', 'mid', or 'boost'
         """
-        state_0, state_1 = self._get_switch_state()
-
-        # Handle unavailable inputs
-        if state_0 is None or state_1 is None:
-            _LOGGER.warning(
-                "Switch inputs unavailable (input_0=%s, input_1=%s), defaulting to low",
-                state_0,
-                state_1,
-            )
-            return "low"
-
-        # Determine mode based on binary combination
-        if state_0 == "off" and state_1 == "off":
-            mode = "low"
-        elif state_0 == "on" and state_1 == "off":
-            mode = "mid"
-        elif state_0 == "off" and state_1 == "on":
-            mode = "boost"
-        elif state_0 == "on" and state_1 == "on":
-            # Invalid state - both inputs on
-            _LOGGER.error(
-                "Invalid switch state detected: input_0=on, input_1=on. "
-                "This should not happen with a 3-position switch. Defaulting to low mode."
-            )
-            mode = "low"
-        else:
-            # Unexpected state values (not 'on' or 'off')
-            # This is normal during HA startup when entities haven't initialized yet
-            _LOGGER.warning(
-                "Unexpected switch state values: input_0=%s, input_1=%s. Defaulting to low mode.",
-                state_0,
-                state_1,
+        decoder = self.switch_decoder
+        states = []
+        for entity_id in self.inputs:
+            state = self.hass.states.get(entity_id)
+            states.append(state.state if state else None)
+
+        changed = decoder.update(decoder.index(states), clock.monotonic())
+        mode = decoder.mode()
+        if mode is not None:
+            return mode.label
+
+        # Log once per adopted position, not on every evaluation
+        if changed:
+            pattern = decoder.pattern(decoder.position)
+            if pattern is None:
+                # Normal during HA startup when entities haven't initialized yet
+                _LOGGER.warning(
+                    "Switch inputs unavailable or unexpected (%s), defaulting to low",
+                    ", ".join(f"{entity_id}={state}" for entity_id, state in zip(self.inputs, states)),
+                )
+            else:
+                _LOGGER.error(
+                    "Invalid switch state detected: inputs %s (%s) are not a configured "
+                    "position. Defaulting to low mode.",
+                    pattern,
+                    "/".join(self.inputs),
+                )
+        return "low"
+
+    def _read_humidity(self, now: float, monotonic: float) -> float | None:
+        """Return the fused humidity, or None while no sensor is fresh.
+
+        A short dropout keeps the last filtered value of a sensor until it
+        has not reported for stale_timeout seconds, so a flaky BLE sensor
+        does not switch auto-boost off and on. The sensors are only read
+        again when one of them may have gone stale; unchanged reports count
+        through the state's last_reported timestamp. Readings the input
+        filters held back are passed on once their hold time is over.
+
+        Args:
+            now: Current time in seconds since the epoch
+            monotonic: Monotonic time, for the rolling history
+
+        Returns:
+            Humidity as float (0-100), or None if all sensors are stale
+        """
+        fusion = self.humidity
+        changed = fusion.refresh(now, self._source_reading)
+        if fusion.release(now):
+            changed = True
+        if changed and fusion.value is not None:
+            self.humidity_history.add(
+                fusion.value, monotonic, update_baseline=not self.auto_boost_active
             )
-            mode = "low"
+        # Samples of an earlier rise leave the trend even without new reports
+        self.humidity_history.expire(monotonic)
+
+        stale = fusion.value is None
+        if stale != self.humidity_stale:
+            self.humidity_stale = stale
+            if stale:
+                _LOGGER.warning(
+                    "Humidity sensor(s) %s unavailable or stale, auto-boost paused",
+                    ", ".join(self.humidity_sensors),
+                )
+            else:
+                _LOGGER.info(
+                    "Humidity sensor(s) %s reporting again", ", ".join(self.humidity_sensors)
+                )
+
+        return fusion.value
 
-        _LOGGER.debug("Determined switch mode: %s", mode)
-        return mode
+    def _source_reading(self, entity_id: str) -> tuple[float, float] | None:
+        """Return the reading and report time of one humidity sensor.
 
-    def _get_humidity(self) -> float | None:
-        """Get the current humidity value from the sensor.
+        Args:
+            entity_id: Humidity sensor
 
         Returns:
-            Humidity as float (0-100), or None if unavailable/invalid
+            Tuple of (humidity, last reported timestamp), or None if the
+            sensor is missing, unavailable or not numeric
         """
-        state = self.hass.states.get(self.humidity_sensor)
+        state = self.hass.states.get(entity_id)
+        if state is None or state.state in UNAVAILABLE_STATES:
+            return None
+        try:
+            return float(state.state), state.last_reported_timestamp
+        except (ValueError, TypeError):
+            return None
+
+    def _parse_humidity(self, entity_id: str, state: State | None) -> float | None:
+        """Convert a humidity sensor state to a float.
 
+        Args:
+            entity_id: Humidity sensor
+            state: State object of the humidity sensor (may be None)
+
+        Returns:
+            Humidity as float (0-100), or None if unavailable/invalid
+        """
         # Check if sensor exists
         if state is None:
-            _LOGGER.warning("Humidity sensor %s not found", self.humidity_sensor)
+            _LOGGER.warning("Humidity sensor %s not found", entity_id)
             return None
 
-        # Check if sensor is unavailable
-        if state.state in ("unavailable", "unknown", "none", "None"):
-            _LOGGER.warning(
+        # Check if sensor is unavailable; going stale is logged once by
+        # _read_humidity, so dropouts are not repeated here
+        if state.state in UNAVAILABLE_STATES:
+            _LOGGER.debug(
                 "Humidity sensor %s is unavailable (state: %s)",
-                self.humidity_sensor,
+                entity_id,
                 state.state,
             )
             return None
 
         # Try to convert to float
         try:
-            humidity = float(state.state)
-            _LOGGER.debug("Current humidity: %.1f%%", humidity)
-            return humidity
+            return float(state.state)
         except (ValueError, TypeError) as err:
             _LOGGER.error(
                 "Invalid humidity value from %s: %s (error: %s)",
-                self.humidity_sensor,
+                entity_id,
                 state.state,
                 err,
             )
             return None
 
-    def _reset_daily_counter_if_needed(self) -> None:
-        """Reset the auto-boost counter if a new day has started."""
-        current_date = datetime.now().date()
+    @callback
+    def async_input_changed(self, entity_id: str, new_state: State | None) -> None:
+        """Handle a state change of one of the zone's monitored entities.
 
-        if self.last_reset_date is None or current_date != self.last_reset_date:
-            self.auto_boost_count_today = 0
-            self.last_reset_date = current_date
-            _LOGGER.info("Daily auto-boost counter reset")
+        Humidity readings pass the sensor's input filter and the fusion
+        first; only a meaningful change of the fused value is recorded in the
+        rolling history and triggers an evaluation.
 
-    def _should_trigger_auto_boost(self) -> bool:
-        """Check if conditions are met to trigger automatic boost.
+        Args:
+            entity_id: Entity that changed
+            new_state: Its new state
+        """
+        fusion = self.humidity
+        if entity_id in fusion:
+            release = fusion.next_release()
+            humidity = self._parse_humidity(entity_id, new_state)
+            if humidity is None:
+                changed = fusion.mark_unavailable(entity_id)
+            else:
+                changed = fusion.add(entity_id, humidity, new_state.last_reported_timestamp)
+            if not changed:
+                # A newly held-back reading still needs an evaluation, which
+                # re-arms the zone deadline for its release
+                if fusion.next_release() == release:
+                    return
+                self.async_schedule_evaluation(REFRESH_STATE)
+                return
+            if fusion.value is not None:
+                # Keep the baseline at "normal" humidity while boosting
+                self.humidity_history.add(
+                    fusion.value,
+                    clock.monotonic(),
+                    update_baseline=not self.auto_boost_active,
+                )
+        elif new_state is not None and new_state.state in UNAVAILABLE_STATES:
+            # Switch inputs going unavailable (e.g. during startup) are
+            # handled by the next evaluation
+            return
+        self.async_schedule_evaluation(REFRESH_STATE)
+
+    def _humidity_trigger_met(self) -> bool:
+        """Check the configured humidity trigger against the rolling history.
 
         Returns:
-            True if auto-boost should be activated, False otherwise
+            True if humidity calls for an auto-boost
         """
-        # Already active
-        if self.auto_boost_active:
-            return False
+        history = self.humidity_history
+        trigger_type = self.auto_boost_trigger["type"]
 
-        # Check humidity
-        humidity = self._get_humidity()
-        if humidity is None:
-            _LOGGER.debug("Auto-boost check: humidity unavailable")
-            return False
+        if trigger_type == TRIGGER_RATE:
+            # Needs enough samples for a trend
+            slope = history.slope
+            return slope is not None and slope >= self.auto_boost_trigger["rate"]
 
-        if humidity <= 80:
-            _LOGGER.debug("Auto-boost check: humidity %.1f%% <= 80%%", humidity)
-            return False
+        if trigger_type == TRIGGER_DELTA:
+            return history.ewma - history.baseline >= self.auto_boost_trigger["delta"]
 
-        # Check daily limit
-        if self.auto_boost_count_today >= self.max_boosts_per_day:
-            _LOGGER.warning(
-                "Auto-boost check: daily limit reached (%d/%d)",
-                self.auto_boost_count_today,
-                self.max_boosts_per_day,
-            )
+        # Absolute level on the smoothed value, so one noisy sample can't trigger
+        return history.ewma > self.auto_boost_trigger["threshold"]
+
+    def _humidity_recovered(self) -> bool:
+        """Check if humidity is back to normal after a boost.
+
+        Humidity counts as recovered when the smoothed value has dropped below
+        the off threshold (hysteresis against the trigger threshold) or back
+        to within baseline_margin of the baseline. Only used by closed-loop
+        boost control, which also enforces the minimum boost duration.
+
+        Returns:
+            True if a closed-loop auto-boost can end now
+        """
+        history = self.humidity_history
+        if not history:
             return False
 
-        _LOGGER.debug("Auto-boost check: all conditions met (humidity: %.1f%%)", humidity)
-        return True
+        return (
+            history.ewma <= self.boost_control["off_threshold"]
+            or history.ewma <= history.baseline + self.boost_control["baseline_margin"]
+        )
 
-    async def _activate_auto_boost(self) -> None:
-        """Activate automatic boost mode."""
-        self.auto_boost_active = True
-        self.manual_boost_active = False
-        self.auto_boost_end_time = datetime.now() + timedelta(minutes=self.auto_boost_duration)
-        self.auto_boost_count_today += 1
+    def _build_inputs(
+        self, now: datetime, monotonic: float, switch_mode: str, humidity: float | None
+    ) -> ZoneInputs:
+        """Collect the kernel input snapshot for one evaluation.
 
-        # Set fan to boost speed
-        await self._set_fan_speed(self.speeds["boost"])
-        self.target_speed = self.speeds["boost"]
-        self.current_mode = "boost"
+        Without a current humidity reading nothing triggers or ends a boost;
+        a running closed-loop boost then ends at its maximum duration.
 
-        end_time_str = self.auto_boost_end_time.strftime("%H:%M")
-        _LOGGER.info(
-            "Auto-boost activated (%d/%d today), duration: %d min, will end at %s",
-            self.auto_boost_count_today,
-            self.max_boosts_per_day,
-            self.auto_boost_duration,
-            end_time_str,
+        Args:
+            now: Local time, for the daily counter
+            monotonic: Monotonic time, for boost durations
+            switch_mode: Mode selected by the switch
+            humidity: Current humidity, or None while stale
+        """
+        boost_trigger = False
+        humidity_recovered = False
+        if humidity is not None:
+            if (
+                not self.state.boost_active
+                and switch_mode == "mid"
+                and self.profile.auto_boost
+            ):
+                boost_trigger = self._humidity_trigger_met()
+            if self.state.boost_kind == BoostKind.AUTO and self.kernel_config.closed_loop:
+                humidity_recovered = self._humidity_recovered()
+
+        day = clock.day(now)
+        if self.budget is not None:
+            boost_trigger = self._budget_allows_boost(boost_trigger, day, monotonic)
+
+        return ZoneInputs(
+            now=monotonic,
+            day=day,
+            switch_mode=Mode.from_label(switch_mode),
+            boost_trigger=boost_trigger,
+            humidity_recovered=humidity_recovered,
         )
 
-    async def force_boost(self) -> None:
-        """Force boost mode activation via service call.
+    def _budget_allows_boost(self, boost_trigger: bool, day: int, monotonic: float) -> bool:
+        """Ask the airflow budget for a share when an auto-boost would start.
 
-        Does not check daily limit and does not increment counter.
-        Returns to previous mode after timeout.
+        A zone that is refused stays in mid and waits in the budget queue,
+        ordered by how far humidity is above its baseline; the budget wakes
+        it up as soon as enough airflow is free.
+
+        Args:
+            boost_trigger: Humidity calls for an auto-boost
+            day: Ordinal of the current local day
+            monotonic: Monotonic time, for the queue wait statistics
+
+        Returns:
+            True if the auto-boost may start
         """
-        # Save current mode to return to after timeout
-        self.mode_before_boost = self.current_mode
+        state = self.state
+        boosts_today = state.boost_count if state.day == day else 0
+        if not boost_trigger or boosts_today >= self.max_boosts_per_day:
+            self.budget.withdraw(self.zone_id, monotonic)
+            return False
 
-        # Cancel any existing boost
-        self._cancel_auto_boost()
+        history = self.humidity_history
+        return self.budget.request(
+            self.zone_id, self.boost_airflow, history.ewma - history.baseline, monotonic
+        )
+
+    def _apply(
+        self,
+        new_state: ZoneState,
+        commands: tuple[int, ...],
+        trigger: str | None = None,
+    ) -> None:
+        """Adopt a new kernel state, log the transition and send commands.
 
-        # Activate manual boost
-        self.auto_boost_active = True
-        self.manual_boost_active = True
-        self.auto_boost_end_time = datetime.now() + timedelta(minutes=self.auto_boost_duration)
+        Args:
+            new_state: State returned by the kernel
+            commands: Speed commands returned by the kernel
+            trigger: What caused the decision, for the decision history;
+                derived from the transition for regular evaluations
+        """
+        old_state = self.state
+        if self.budget is not None:
+            # Also returns a grant the kernel did not use
+            self.budget.update(
+                self.zone_id,
+                new_state.mode == Mode.BOOST,
+                self.boost_airflow,
+                clock.monotonic(),
+            )
+        if new_state is old_state:
+            return
+        self.state = new_state
 
-        # Set fan to boost speed
-        await self._set_fan_speed(self.speeds["boost"])
-        self.target_speed = self.speeds["boost"]
-        self.current_mode = "boost"
+        if old_state.day != new_state.day:
+            _LOGGER.info("Daily auto-boost counter reset")
 
-        end_time_str = self.auto_boost_end_time.strftime("%H:%M")
-        _LOGGER.info(
-            "Force boost activated via service (duration: %d min, will return to '%s', will end at %s)",
-            self.auto_boost_duration,
-            self.mode_before_boost,
-            end_time_str,
+        boost_ended = old_state.boost_active and (
+            not new_state.boost_active or new_state.boost_start != old_state.boost_start
+        )
+        boost_started = (
+            new_state.boost_active and new_state.boost_start != old_state.boost_start
+        )
+        if boost_ended:
+            boost_type = "Manual" if old_state.boost_kind == BoostKind.MANUAL else "Auto"
+            _LOGGER.info("%s boost ended", boost_type)
+
+        if boost_started and new_state.boost_kind == BoostKind.AUTO:
+            self.metrics.auto_boosts += 1
+            _LOGGER.info(
+                "Auto-boost activated (%d/%d today), duration: %d min, will end at %s",
+                new_state.boost_count,
+                self.max_boosts_per_day,
+                (new_state.boost_end - new_state.boost_start) / 60,
+                self.auto_boost_end_time.strftime("%H:%M"),
+            )
+
+        if new_state.mode != old_state.mode:
+            _LOGGER.info(
+                "Mode changed from '%s' to '%s'", old_state.mode.label, new_state.mode.label
+            )
+            # Proportional control starts over from the mid speed
+            if new_state.mode == Mode.MID and self.mid_controller is not None:
+                self.mid_controller.reset()
+
+        for speed in commands:
+            self.target_speed = speed
+            self._set_fan_speed(speed)
+
+        if new_state.mode != old_state.mode or commands or boost_started or boost_ended:
+            if trigger is None:
+                if boost_started and new_state.boost_kind == BoostKind.AUTO:
+                    trigger = HISTORY_AUTO_BOOST
+                elif boost_ended:
+                    trigger = HISTORY_BOOST_END
+                else:
+                    trigger = HISTORY_SWITCH
+            self._record(trigger, old_state.mode)
+
+    def _record(self, trigger: str, old_mode: Mode) -> None:
+        """Count the current decision in the usage totals and the decision history.
+
+        Args:
+            trigger: What caused the decision (one of HISTORY_TRIGGERS)
+            old_mode: Mode before the decision
+        """
+        decoder = self.switch_decoder
+        switch_mode = decoder.mode()
+        state = self.state
+        self.usage.update(clock.monotonic(), state.mode, self.target_speed)
+        self.history.append(
+            clock.now().timestamp(),
+            trigger,
+            decoder.position,
+            switch_mode,
+            self.humidity.value,
+            old_mode,
+            state.mode,
+            state.boost_kind,
+            self.target_speed,
+            state.boost_count,
+        )
+
+    def _trace(self, inputs: ZoneInputs, humidity: float | None, old_state: ZoneState) -> None:
+        """Emit one compact decision record for the current evaluation."""
+        history = self.humidity_history
+        state = self.state
+        slope = history.slope
+        TRACE_LOGGER.debug(
+            "zone=%s switch=%s rh=%s ewma=%s base=%s slope=%s trigger=%d recovered=%d "
+            "mode=%s->%s boost=%s boosts=%d speed=%d",
+            self.zone_id,
+            inputs.switch_mode.label,
+            humidity,
+            None if history.ewma is None else round(history.ewma, 1),
+            None if history.baseline is None else round(history.baseline, 1),
+            None if slope is None else round(slope, 2),
+            inputs.boost_trigger,
+            inputs.humidity_recovered,
+            old_state.mode.label,
+            state.mode.label,
+            state.boost_kind.name.lower(),
+            state.boost_count,
+            self.target_speed,
         )
 
-    def _check_auto_boost_timeout(self) -> str | None:
-        """Check if auto-boost has timed out.
+    def next_deadline(self) -> float:
+        """Return the next moment a time-driven state change is due.
+
+        This is the end of the active boost, the next local midnight (when
+        the daily auto-boost counter resets), the moment a humidity sensor
+        may go stale, a held-back humidity reading is due, a new switch
+        position has settled or the fan command is due to be resent. The
+        manager arms a timer for it, so a boost ends on time instead of at
+        the next periodic check.
 
         Returns:
-            Mode to return to if timeout occurred, None otherwise
+            Monotonic time of the next deadline
         """
-        if not self.auto_boost_active:
-            return None
+        now = clock.now()
+        monotonic = clock.monotonic()
+        deadline = monotonic + (clock.next_midnight(now) - now).total_seconds()
+        state = self.state
+        if state.boost_active and state.boost_end is not None:
+            deadline = min(deadline, state.boost_end)
+            # Humidity may already have recovered when the minimum duration
+            # passes, without any new sensor event to trigger an evaluation
+            min_end = min_boost_end(self.kernel_config, state)
+            if min_end is not None and min_end > monotonic:
+                deadline = min(deadline, min_end)
+        # Going stale changes the fused value even without any new sensor
+        # event; report timestamps are wall-clock
+        stale_at = self.humidity.next_check()
+        if stale_at is not None:
+            deadline = min(deadline, monotonic + stale_at - now.timestamp())
+        # Readings held back by the rate limit or the median are passed on
+        # without any new sensor event
+        release_at = self.humidity.next_release()
+        if release_at is not None:
+            deadline = min(deadline, monotonic + release_at - now.timestamp())
+        # A switch combination waiting to settle is adopted without a new event
+        settle_at = self.switch_decoder.settle_deadline()
+        if settle_at is not None:
+            deadline = min(deadline, settle_at)
+        # The unchanged speed command is resent after resend_interval
+        resend_at = self.actuator.next_resend() if self.ready else None
+        if resend_at is not None:
+            deadline = min(deadline, resend_at)
+        return deadline
+
+    @callback
+    def async_update_profile(self, now: datetime) -> bool:
+        """Activate the schedule profile for the given time.
+
+        Called by the manager at startup and at every schedule transition.
+        The new speeds apply to the current mode right away; the kernel only
+        emits speed commands when the mode changes.
 
-        if datetime.now() >= self.auto_boost_end_time:
-            # Determine which mode to return to
-            if self.manual_boost_active:
-                # Manual boost - return to saved mode
-                return_mode = self.mode_before_boost or "mid"
-                _LOGGER.info("Manual boost timeout reached, returning to '%s'", return_mode)
-            else:
-                # Automatic boost - return to mid
-                return_mode = "mid"
-                _LOGGER.info("Auto-boost timeout reached, returning to 'mid'")
-
-            # Clear boost flags
-            self.auto_boost_active = False
-            self.manual_boost_active = False
-            self.auto_boost_end_time = None
-            self.mode_before_boost = None
-
-            return return_mode
-
-        return None
-
-    def _cancel_auto_boost(self) -> None:
-        """Cancel active auto-boost or manual boost."""
-        if self.auto_boost_active:
-            boost_type = "manual" if self.manual_boost_active else "auto"
-            self.auto_boost_active = False
-            self.manual_boost_active = False
-            self.auto_boost_end_time = None
-            self.mode_before_boost = None
-            _LOGGER.info("%s boost cancelled", boost_type.capitalize())
-
-    async def _set_fan_speed(self, percentage: int) -> None:
+        Args:
+            now: Aware datetime in Home Assistant's time zone
+
+        Returns:
+            True if the profile changed and the zone should be evaluated
+        """
+        profile = self.schedule.profile_at(now)
+        if profile is self.profile:
+            return False
+
+        _LOGGER.info(
+            "Zone '%s' schedule profile changed from '%s' to '%s'",
+            self.zone_id,
+            self.profile.name,
+            profile.name,
+        )
+        self.profile = profile
+        self.kernel_config = replace(self.kernel_config, speeds=profile.speeds)
+
+        if self.mid_controller is not None:
+            low, mid, boost = profile.speeds
+            self.mid_controller.bias = mid
+            self.mid_controller.output_min = low
+            self.mid_controller.output_max = boost
+            self.mid_controller.reset()
+
+        speed = profile.speeds[self.state.mode]
+        if speed != self.target_speed:
+            self.target_speed = speed
+            if self.ready:
+                self._set_fan_speed(speed)
+                self._record(HISTORY_SCHEDULE, self.state.mode)
+        return True
+
+    @callback
+    def _set_fan_speed(self, percentage: int) -> None:
         """Set the fan speed to a specific percentage.
 
-        Supports both fan entities (using fan.set_percentage) and light entities
-        (using light.turn_on with brightness_pct) for Shelly Dimmers.
+        The command is queued on the zone's FanActuator, which sends it in the
+        background and skips commands the device is already following. The
+        decision loop never waits on device I/O.
 
         Args:
             percentage: Fan speed percentage (0-100)
         """
-        # Check if fan entity exists
-        fan_state = self.hass.states.get(self.fan_entity)
-        if fan_state is None:
-            _LOGGER.error("Fan entity %s not found, cannot set speed", self.fan_entity)
-            return
-
-        # Check if fan is available
-        if fan_state.state in ("unavailable", "unknown"):
-            _LOGGER.warning(
-                "Fan entity %s is unavailable (state: %s), skipping speed change",
-                self.fan_entity,
-                fan_state.state,
-            )
-            return
+        self.usage.update(clock.monotonic(), self.state.mode, percentage)
+        self.actuator.async_request(percentage)
 
-        # Determine entity type and call appropriate service
-        is_light_entity = self.fan_entity.startswith("light.")
+    @callback
+    def async_set_manual_speed(self, percentage: int) -> None:
+        """Set the fan speed directly, bypassing the mode logic.
 
-        if is_light_entity:
-            # For light entities (Shelly Dimmers), use light.turn_on with brightness_pct
-            service_domain = "light"
-            service_name = "turn_on"
-            service_data = {
-                "entity_id": self.fan_entity,
-                "brightness_pct": percentage,
-            }
-        else:
-            # For fan entities, use fan.set_percentage
-            service_domain = "fan"
-            service_name = "set_percentage"
-            service_data = {
-                "entity_id": self.fan_entity,
-                "percentage": percentage,
-            }
+        The speed holds until the next decision that sets one (a mode
+        change, schedule transition or mid control step). The change is
+        recorded in the decision history and traced like a decision.
 
-        # Call the appropriate service
-        try:
-            await self.hass.services.async_call(
-                service_domain,
-                service_name,
-                service_data,
-                blocking=True,
-            )
-            entity_type = "Light" if is_light_entity else "Fan"
-            _LOGGER.info("%s speed set to %d%%", entity_type, percentage)
-        except Exception as err:
-            _LOGGER.error(
-                "Failed to set speed for %s to %d%%: %s",
-                self.fan_entity,
+        Args:
+            percentage: Fan speed percentage (0-100)
+        """
+        old_speed = self.target_speed
+        self.metrics.refresh_triggers[REFRESH_SERVICE] += 1
+        self.target_speed = percentage
+        self._set_fan_speed(percentage)
+        self._record(HISTORY_MANUAL_SPEED, self.state.mode)
+
+        if self.tracer.enabled(percentage != old_speed, clock.monotonic()):
+            TRACE_LOGGER.debug(
+                "zone=%s manual mode=%s speed=%d->%d",
+                self.zone_id,
+                self.state.mode.label,
+                old_speed,
                 percentage,
-                err,
             )
+        self.async_update_listeners()
+
+    @callback
+    def _update_mid_speed(self, monotonic: float) -> None:
+        """Adjust the mid speed with the PI controller, if the output changed.
+
+        Args:
+            monotonic: Monotonic time of the evaluation
+        """
+        if not self.humidity_history:
+            return
+
+        speed = self.mid_controller.update(self.humidity_history.ewma, monotonic)
+        if speed is None or speed == self.target_speed:
+            return
+
+        _LOGGER.debug(
+            "Proportional mid control: humidity %.1f%% -> speed %d%%",
+            self.humidity_history.ewma,
+            speed,
+        )
+        self.target_speed = speed
+        self._set_fan_speed(speed)
+        self._record(HISTORY_MID_CONTROL, self.state.mode)
 
     async def set_mode(self, mode: str) -> None:
         """Set the ventilation mode and adjust fan speed accordingly.
 
+        Cancels any active boost (manual mode change takes priority).
+
         Args:
             mode: The mode to set ('low', 'mid', or 'boost')
         """
-        # Cancel any active auto-boost (manual mode change takes priority)
-        self._cancel_auto_boost()
-
         # Validate mode
-        if mode not in ("low", "mid", "boost"):
+        if mode not in MODE_LABELS:
             _LOGGER.error("Invalid mode '%s', must be one of: low, mid, boost", mode)
             return
 
-        # Check if mode actually changed
-        if mode == self.current_mode:
-            _LOGGER.debug("Mode already set to '%s', no change needed", mode)
-            return
-
-        # Update current mode
-        old_mode = self.current_mode
-        self.current_mode = mode
+        self.metrics.refresh_triggers[REFRESH_SERVICE] += 1
+        self._apply(
+            *kernel_set_mode(self.kernel_config, self.state, Mode.from_label(mode)),
+            HISTORY_SET_MODE,
+        )
 
-        # Get speed for the new mode
-        speed = self.speeds[mode]
-        self.target_speed = speed
+    async def force_boost(self) -> None:
+        """Force boost mode activation via service call.
 
-        # Set the fan speed
-        await self._set_fan_speed(speed)
+        Does not check daily limit and does not increment counter.
+        Returns to previous mode after timeout.
+        """
+        self.metrics.refresh_triggers[REFRESH_SERVICE] += 1
+        self.metrics.manual_boosts += 1
+        self._apply(
+            *kernel_force_boost(self.kernel_config, self.state, clock.monotonic()),
+            HISTORY_FORCE_BOOST,
+        )
 
-        _LOGGER.info("Mode changed from '%s' to '%s' (speed: %d%%)", old_mode, mode, speed)
+        _LOGGER.info(
+            "Force boost activated via service (duration: %d min, will return to '%s', will end at %s)",
+            self.auto_boost_duration,
+            self.state.mode_before_boost.label,
+            self.auto_boost_end_time.strftime("%H:%M"),
+        )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the system.
 
-        This is called automatically by the DataUpdateCoordinator
-        at the interval specified in update_interval.
+        Reads the inputs, runs the decision kernel and applies its result.
         """
         try:
-            # Reset daily counter if needed (new day)
-            self._reset_daily_counter_if_needed()
+            now = clock.now()
+            monotonic = clock.monotonic()
 
             # Read inputs
             switch_mode = self._determine_switch_mode()
-            humidity = self._get_humidity()
-
-            # Check if auto-boost has timed out (returns mode to restore, or None)
-            timeout_return_mode = self._check_auto_boost_timeout()
-
-            # Detect switch position changes - cancel manual boost if switch moved
-            if self.manual_boost_active and self.last_switch_mode and switch_mode != self.last_switch_mode:
-                _LOGGER.info("Switch position changed from '%s' to '%s', cancelling manual boost",
-                           self.last_switch_mode, switch_mode)
-                self._cancel_auto_boost()
-
-            # Update last known switch position
-            self.last_switch_mode = switch_mode
-
-            # Check if manual boost is active - if so, maintain it regardless of switch
-            if self.manual_boost_active:
-                # Manual boost stays active - only timeout or explicit switch CHANGE cancels it
-                _LOGGER.debug("Manual boost active, maintaining boost speed")
-                # Don't follow switch position while manual boost is active
-
-            # Handle timeout - if boost just timed out, return to saved mode
-            elif timeout_return_mode:
-                # Boost timed out, return to the saved mode
-                if self.current_mode != timeout_return_mode:
-                    await self.set_mode(timeout_return_mode)
-
-            # Otherwise, follow switch position
-            elif switch_mode == "low":
-                # Priority 1: Low mode cancels auto-boost (not manual boost)
-                if self.auto_boost_active and not self.manual_boost_active:
-                    self._cancel_auto_boost()
-                if self.current_mode != "low":
-                    await self.set_mode("low")
-
-            elif switch_mode == "boost":
-                # Priority 2: Manual boost on switch cancels any boost
-                self._cancel_auto_boost()
-                if self.current_mode != "boost":
-                    await self.set_mode("boost")
-
-            elif switch_mode == "mid":
-                # Priority 3: Mid mode - handle auto-boost logic
-                if self.auto_boost_active:
-                    # Auto-boost is still active, keep boost speed
-                    _LOGGER.debug("Auto-boost active, maintaining boost speed")
-                elif self._should_trigger_auto_boost():
-                    # Conditions met for new auto-boost
-                    await self._activate_auto_boost()
-                elif self.current_mode != "mid":
-                    # Normal mid operation
-                    await self.set_mode("mid")
+            humidity = self._read_humidity(now.timestamp(), monotonic)
+
+            inputs = self._build_inputs(now, monotonic, switch_mode, humidity)
+            old_state = self.state
+            old_speed = self.target_speed
+            new_state, commands = decide(self.kernel_config, old_state, inputs)
+
+            if (
+                inputs.boost_trigger
+                and not new_state.boost_active
+                and new_state.boost_count >= self.max_boosts_per_day
+            ):
+                _LOGGER.warning(
+                    "Auto-boost check: daily limit reached (%d/%d)",
+                    new_state.boost_count,
+                    self.max_boosts_per_day,
+                )
+
+            self._apply(new_state, commands)
+
+            # Proportional speed control in plain mid operation
+            if (
+                self.mid_controller is not None
+                and humidity is not None
+                and inputs.switch_mode == Mode.MID
+                and self.state.mode == Mode.MID
+                and not self.state.boost_active
+            ):
+                self._update_mid_speed(monotonic)
+
+            # Correct drift and resend the target speed once it is due
+            if self.ready:
+                self.actuator.async_reconcile(self.target_speed)
+
+            if self.tracer.enabled(
+                self.state is not old_state or self.target_speed != old_speed, monotonic
+            ):
+                self._trace(inputs, humidity, old_state)
 
             data = {
                 "current_mode": self.current_mode,
                 "target_speed": self.target_speed,
                 "auto_boost_active": self.auto_boost_active,
                 "humidity": humidity,
+                "humidity_stale": self.humidity_stale,
+                "humidity_trend": self.humidity_history.slope,
+                "profile": self.profile.name,
             }
-
-            _LOGGER.debug("Update data: %s", data)
             return data
 
         except Exception as err:
+            self.metrics.evaluation_errors += 1
             _LOGGER.error("Error updating Smart Vent data: %s", err)
             raise UpdateFailed(f"Error communicating with Smart Vent: {err}") from err
+
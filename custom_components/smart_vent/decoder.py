@@ -0,0 +1,115 @@
+"""Switch input decoder for Smart Ventilation Controller.
+
+A multi-position switch is wired to N binary inputs, and every position is a
+combination of input states mapped to a mode. The map is compiled once into
+a lookup table indexed by the input bits (input i on = bit i), so decoding
+the switch is one list lookup whatever the number of inputs.
+
+While the switch is moved, the inputs pass through intermediate
+combinations (both contacts open, or briefly both closed) and report one
+after the other. A new combination is only adopted once the inputs kept it
+for the settle time, so these transients never reach the kernel and cause
+no fan writes.
+
+Times are monotonic seconds passed in by the caller; the decoder never
+reads a clock.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+
+from .kernel import Mode
+
+# Index of a combination that contains an unavailable or unexpected input
+INVALID = -1
+
+
+def pattern_index(pattern: str) -> int:
+    """Return the table index of a position pattern such as '10' (input_0 on)."""
+    return sum(1 << bit for bit, char in enumerate(pattern) if char == "1")
+
+
+class SwitchDecoder:
+    """Decode N binary inputs into a mode, ignoring short-lived combinations."""
+
+    __slots__ = ("size", "settle_time", "_table", "position", "_candidate", "_since")
+
+    def __init__(
+        self, size: int, positions: Mapping[str, str], settle_time: float = 0.0
+    ) -> None:
+        """Compile the position map.
+
+        Args:
+            size: Number of inputs
+            positions: Mode name per pattern of input states, one '0' or '1'
+                per input in input order; other combinations are invalid
+            settle_time: Seconds a new combination must hold before it is used
+        """
+        self.size = size
+        self.settle_time = settle_time
+        self._table: list[Mode | None] = [None] * (1 << size)
+        for pattern, label in positions.items():
+            self._table[pattern_index(pattern)] = Mode.from_label(label)
+
+        # Adopted combination, and the one currently waiting to settle
+        self.position: int | None = None
+        self._candidate: int | None = None
+        self._since = 0.0
+
+    def index(self, states: Sequence[str | None]) -> int:
+        """Return the table index of the input states, or INVALID.
+
+        Args:
+            states: State of every input ('on', 'off', or anything else if
+                the input is unavailable)
+        """
+        index = 0
+        for bit, state in enumerate(states):
+            if state == "on":
+                index |= 1 << bit
+            elif state != "off":
+                return INVALID
+        return index
+
+    def update(self, index: int, now: float) -> bool:
+        """Feed the current combination and adopt it once it has settled.
+
+        The very first combination is adopted right away.
+
+        Args:
+            index: Result of index()
+            now: Current monotonic time
+
+        Returns:
+            True if the adopted position changed
+        """
+        if index == self.position:
+            self._candidate = None
+            return False
+        if index != self._candidate:
+            self._candidate = index
+            self._since = now
+        if self.position is not None and now - self._since < self.settle_time:
+            return False
+
+        self.position = index
+        self._candidate = None
+        return True
+
+    def mode(self) -> Mode | None:
+        """Return the mode of the adopted position, or None if it is invalid."""
+        if self.position is None or self.position == INVALID:
+            return None
+        return self._table[self.position]
+
+    def settle_deadline(self) -> float | None:
+        """Return when the combination waiting to settle will be adopted, if any."""
+        if self._candidate is None:
+            return None
+        return self._since + self.settle_time
+
+    def pattern(self, index: int | None) -> str | None:
+        """Return the pattern string of a table index, for logs and diagnostics."""
+        if index is None or index == INVALID:
+            return None
+        return "".join("1" if index >> bit & 1 else "0" for bit in range(self.size))
@@ -0,0 +1,103 @@
+"""Diagnostics for Smart Ventilation Controller.
+
+Collects configuration, runtime state and metrics of every zone, so a slow
+zone, a flapping sensor or a failing fan shows up without debug logging.
+The same data backs Home Assistant diagnostics downloads and the
+get_diagnostics service.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import SmartVentCoordinator
+from .manager import SmartVentManager
+
+
+def zone_diagnostics(zone: SmartVentCoordinator) -> dict[str, Any]:
+    """Return the diagnostics of one zone.
+
+    Args:
+        zone: Zone coordinator
+
+    Returns:
+        JSON-serializable dict with configuration, state and metrics
+    """
+    history = zone.humidity_history
+    return {
+        "name": zone.zone_name,
+        "entities": {
+            "fan": zone.fan_entity,
+            "humidity_sensors": zone.humidity_sensors,
+            "inputs": zone.inputs,
+        },
+        "switch": {
+            "position": zone.switch_decoder.pattern(zone.switch_decoder.position),
+            "settle_time": zone.switch_decoder.settle_time,
+        },
+        "state": zone.get_persistent_state(),
+        "ready": zone.ready,
+        "unready_entities": zone.unready_entities(),
+        "humidity": {
+            "samples": len(history),
+            "last_value": history.last_value,
+            "ewma": history.ewma,
+            "baseline": history.baseline,
+            "slope": history.slope,
+            "stale": zone.humidity_stale,
+            "fusion": {
+                "policy": zone.humidity.policy,
+                "value": zone.humidity.value,
+                "next_check": zone.humidity.next_check(),
+                "sources": zone.humidity.source_diagnostics(),
+            },
+        },
+        "evaluations_requested": zone.evaluations_requested,
+        "evaluations_run": zone.evaluations_run,
+        "schedule": {
+            "profile": zone.profile.name,
+            "speeds": list(zone.profile.speeds),
+            "auto_boost": zone.profile.auto_boost,
+            "table_rows": len(zone.schedule),
+        },
+        "trace": {"mode": zone.tracer.mode, "interval": zone.tracer.interval},
+        "history": {"records": len(zone.history), "size": zone.history.size},
+        "metrics": zone.metrics.as_dict(),
+        "actuator": zone.actuator.as_dict(),
+    }
+
+
+def manager_diagnostics(manager: SmartVentManager) -> dict[str, Any]:
+    """Return the diagnostics of all zones.
+
+    Args:
+        manager: Zone manager
+
+    Returns:
+        JSON-serializable dict keyed by zone id
+    """
+    return {
+        "scheduling": manager.scheduling,
+        "check_interval": manager.check_interval,
+        "airflow_budget": manager.budget.as_dict() if manager.budget is not None else None,
+        "zones": {
+            zone_id: zone_diagnostics(zone) for zone_id, zone in manager.zones.items()
+        },
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for the zone of a config entry."""
+    manager = hass.data[DOMAIN]
+    return {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "scheduling": manager.scheduling,
+        "check_interval": manager.check_interval,
+        "airflow_budget": manager.budget.as_dict() if manager.budget is not None else None,
+        "zone": zone_diagnostics(entry.runtime_data),
+    }
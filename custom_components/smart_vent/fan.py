@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
@@ -10,7 +9,6 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
 from .coordinator import SmartVentCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,10 +24,21 @@ async def async_setup_platform(
     if discovery_info is None:
         return
 
-    coordinator = discovery_info["coordinator"]
+    zones = discovery_info["zones"]
 
-    async_add_entities([SmartVentFan(coordinator)], True)
-    _LOGGER.info("Smart Vent fan entity created")
+    # No update before adding: that would refresh the coordinator and make
+    # the first decision before the zone's inputs are ready
+    async_add_entities([SmartVentFan(coordinator) for coordinator in zones])
+    _LOGGER.info("Smart Vent fan entities created for %d zone(s)", len(zones))
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Smart Vent fan of a config entry zone."""
+    async_add_entities([SmartVentFan(entry.runtime_data)])
 
 
 class SmartVentFan(CoordinatorEntity, FanEntity):
@@ -38,33 +47,63 @@ class SmartVentFan(CoordinatorEntity, FanEntity):
     def __init__(self, coordinator: SmartVentCoordinator) -> None:
         """Initialize the fan entity."""
         super().__init__(coordinator)
-        self._attr_name = "Smart Ventilation"
-        self._attr_unique_id = "smart_vent_fan"
+        if coordinator.zone_name is None:
+            # Single unnamed zone keeps the original entity identity
+            self._attr_name = "Smart Ventilation"
+            self._attr_unique_id = "smart_vent_fan"
+        else:
+            self._attr_name = f"Smart Ventilation {coordinator.zone_name}"
+            self._attr_unique_id = f"smart_vent_{coordinator.zone_id}_fan"
         self._attr_should_poll = False
         self._attr_speed_count = 100
         self._attr_supported_features = FanEntityFeature.SET_SPEED
+        self._attr_percentage = None
+        self._attr_extra_state_attributes = {}
+        self._last_available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Build the initial speed and attributes once the entity is added."""
+        await super().async_added_to_hass()
+        self._async_update_attrs()
 
     @property
     def is_on(self) -> bool:
         """Return true if the fan is on (always on for this controller)."""
         return True
 
-    @property
-    def percentage(self) -> int:
-        """Return the current speed percentage."""
-        return self.coordinator.target_speed
+    def _async_update_attrs(self) -> bool:
+        """Rebuild the speed and attributes from the coordinator.
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return additional state attributes."""
-        attrs = {
-            "mode": self.coordinator.current_mode,
-            "humidity": self.coordinator.data.get("humidity") if self.coordinator.data else None,
-            "auto_boost_active": self.coordinator.auto_boost_active,
-            "auto_boost_count_today": self.coordinator.auto_boost_count_today,
+        The attributes are built once per update and cached, instead of on
+        every read of the state.
+
+        Returns:
+            True if anything shown by the entity changed
+        """
+        coordinator = self.coordinator
+        data = coordinator.data or {}
+        end_time = coordinator.auto_boost_end_time
+        attributes = {
+            "mode": coordinator.current_mode,
+            "humidity": data.get("humidity"),
+            "humidity_trend": data.get("humidity_trend"),
+            "humidity_stale": coordinator.humidity_stale,
+            "auto_boost_active": coordinator.auto_boost_active,
+            "auto_boost_end_time": end_time.isoformat() if end_time else None,
+            "auto_boost_count_today": coordinator.auto_boost_count_today,
+            "schedule_profile": coordinator.profile.name,
+            "writes_sent": coordinator.actuator.writes_sent,
+            "writes_suppressed": coordinator.actuator.writes_suppressed,
+            "writes_failed": coordinator.actuator.writes_failed,
         }
-        _LOGGER.debug("Fan extra_state_attributes: %s", attrs)
-        return attrs
+        if (
+            coordinator.target_speed == self._attr_percentage
+            and attributes == self._attr_extra_state_attributes
+        ):
+            return False
+        self._attr_percentage = coordinator.target_speed
+        self._attr_extra_state_attributes = attributes
+        return True
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan.
@@ -77,13 +116,16 @@ class SmartVentFan(CoordinatorEntity, FanEntity):
             return
 
         _LOGGER.info("Setting fan speed to %d%% via fan entity", percentage)
-        await self.coordinator._set_fan_speed(percentage)
-
-        # Update the coordinator's target speed to reflect the manual change
-        self.coordinator.target_speed = percentage
-        self.async_write_ha_state()
+        self.coordinator.async_set_manual_speed(percentage)
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        """Write the state only if the speed or an attribute changed.
+
+        Most evaluations change nothing visible; skipping their writes keeps
+        identical states off the event bus and out of the recorder.
+        """
+        available = self.available
+        if self._async_update_attrs() or available != self._last_available:
+            self._last_available = available
+            self.async_write_ha_state()
@@ -0,0 +1,184 @@
+"""Input filtering for Smart Ventilation Controller.
+
+Noisy humidity sensors report sub-percent jitter and occasional spikes, and
+every report used to trigger a full zone evaluation. The filter sits between
+the state change event and the zone: median-of-N spike rejection, a
+deadband and a minimum interval decide whether a reading is a meaningful
+change, and report timestamps detect a sensor that stopped reporting.
+
+A reading the rate limit or the median holds back is not lost: it is kept
+with the time it may be passed on, the zone arms its deadline for that time
+and release() passes it on then. Nothing else would deliver it again, as a
+sensor whose state does not change sends no further events.
+
+All times are Home Assistant state timestamps (seconds since the epoch), so
+the filter itself never reads a clock.
+"""
+from __future__ import annotations
+
+from collections import deque
+
+# Readings are decimal (55.1 - 55.0 == 0.0999...), so a change of exactly
+# the deadband must not be lost to floating point rounding
+EPSILON = 1e-6
+
+# Seconds a reading the median held back must remain the sensor's state
+# before it counts as a real step rather than a spike
+MEDIAN_CONFIRM_TIME = 60
+
+
+class InputFilter:
+    """Deadband, rate limit, median and staleness filter for one sensor."""
+
+    __slots__ = (
+        "deadband",
+        "min_interval",
+        "stale_timeout",
+        "_window",
+        "value",
+        "accepted_at",
+        "reported_at",
+        "held",
+        "held_until",
+        "received",
+        "accepted",
+    )
+
+    def __init__(
+        self,
+        deadband: float = 0.0,
+        min_interval: float = 0.0,
+        median: int = 1,
+        stale_timeout: float = 0.0,
+    ) -> None:
+        """Initialize the filter.
+
+        Args:
+            deadband: Minimum change of the filtered value that is passed on
+            min_interval: Minimum seconds between two passed values
+            median: Number of raw readings the median is taken over (1 = off)
+            stale_timeout: Seconds without a valid report after which the
+                value counts as stale (0 = stale only while unavailable)
+        """
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.stale_timeout = stale_timeout
+        self._window: deque[float] = deque(maxlen=median)
+        # Last value passed on, when it was passed and the last valid report
+        self.value: float | None = None
+        self.accepted_at: float | None = None
+        self.reported_at: float | None = None
+        # Reading held back by the rate limit or the median, and when it is
+        # passed on unless a newer reading replaces it first
+        self.held: float | None = None
+        self.held_until: float | None = None
+        # Counters
+        self.received = 0
+        self.accepted = 0
+
+    def add(self, raw: float, timestamp: float) -> bool:
+        """Feed a raw reading and return True if it is a meaningful change.
+
+        The first reading, and the first one after the sensor went stale,
+        always passes.
+
+        Args:
+            raw: Reading from the sensor
+            timestamp: Time the sensor reported it
+
+        Returns:
+            True if `value` was updated and the zone should be evaluated
+        """
+        self.received += 1
+        was_stale = self.is_stale(timestamp)
+        self.report(timestamp)
+
+        window = self._window
+        window.append(raw)
+        if len(window) > 2:
+            candidate = sorted(window)[len(window) // 2]
+        else:
+            # Too few readings for a median to reject anything
+            candidate = raw
+
+        if self.value is not None and not was_stale:
+            if self._unchanged(candidate):
+                if self._unchanged(raw):
+                    # Back at the passed value; nothing left to hold
+                    self.discard()
+                else:
+                    # Held back by the median: a spike is replaced by the
+                    # next report, a real step is still reported later on
+                    self._hold(raw, timestamp + MEDIAN_CONFIRM_TIME)
+                return False
+            if (
+                self.accepted_at is not None
+                and timestamp - self.accepted_at < self.min_interval
+            ):
+                self._hold(candidate, timestamp)
+                return False
+
+        self._accept(candidate, timestamp)
+        return True
+
+    def _unchanged(self, value: float) -> bool:
+        """Return True if a value is within the deadband of the passed one."""
+        return value == self.value or abs(value - self.value) < self.deadband - EPSILON
+
+    def _hold(self, value: float, until: float) -> None:
+        """Keep a reading back until `until`, but no earlier than the rate limit allows."""
+        if self.held is not None and self.held_until < until:
+            # A newer reading replaces the held one but does not restart its wait
+            until = self.held_until
+        if self.accepted_at is not None:
+            until = max(until, self.accepted_at + self.min_interval)
+        self.held = value
+        self.held_until = until
+
+    def _accept(self, value: float, timestamp: float) -> None:
+        """Pass a value on."""
+        self.value = value
+        self.accepted_at = timestamp
+        self.accepted += 1
+        self.held = self.held_until = None
+
+    def release(self, now: float) -> bool:
+        """Pass on the held reading once its time has come.
+
+        Args:
+            now: Current time
+
+        Returns:
+            True if `value` was updated and the zone should be evaluated
+        """
+        if self.held is None or now < self.held_until:
+            return False
+        # The median starts over from the released value
+        self._window.extend([self.held] * self._window.maxlen)
+        self._accept(self.held, now)
+        return True
+
+    def discard(self) -> None:
+        """Drop the held reading, e.g. when the sensor became unavailable."""
+        self.held = self.held_until = None
+
+    def report(self, timestamp: float) -> None:
+        """Record that the sensor reported a valid value (changed or not)."""
+        if self.reported_at is None or timestamp > self.reported_at:
+            self.reported_at = timestamp
+
+    def is_stale(self, now: float) -> bool:
+        """Return True if the sensor has not reported for too long.
+
+        Args:
+            now: Current time
+        """
+        if self.reported_at is None:
+            return True
+        return bool(self.stale_timeout) and now - self.reported_at > self.stale_timeout
+
+    def stale_at(self) -> float | None:
+        """Return when the value will go stale, or None if it never does."""
+        if self.reported_at is None or not self.stale_timeout:
+            return None
+        return self.reported_at + self.stale_timeout
@@ -0,0 +1,256 @@
+"""Multi-sensor humidity fusion for Smart Ventilation Controller.
+
+A zone may read several humidity sensors. Each source has its own input
+filter and staleness; the fresh sources are fused into one humidity value
+with a policy:
+
+- max: the highest reading (any wet spot boosts)
+- median: the middle reading (robust against one faulty sensor)
+- weighted: weighted mean, maintained as running sums
+- fallback: the first fresh source in configuration order
+
+Fusion is incremental: a report only touches its own source, and the other
+sources are only looked at again when one of them may have gone stale or a
+held-back reading is due.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+import math
+from typing import Any
+
+from .const import (
+    DEFAULT_HUMIDITY_FILTER,
+    FUSION_FALLBACK,
+    FUSION_MAX,
+    FUSION_MEDIAN,
+    FUSION_WEIGHTED,
+)
+from .filters import InputFilter
+
+# Returns (humidity, report timestamp) of a source, or None if unavailable
+SourceReader = Callable[[str], "tuple[float, float] | None"]
+
+
+class HumidityFusion:
+    """Fused humidity of one or more filtered sources."""
+
+    __slots__ = (
+        "policy",
+        "entity_ids",
+        "filters",
+        "weights",
+        "available",
+        "fresh",
+        "value",
+        "_index",
+        "_values",
+        "_weighted_sum",
+        "_weight_total",
+        "_next_check",
+    )
+
+    def __init__(
+        self,
+        entity_ids: Sequence[str],
+        policy: str = FUSION_MAX,
+        weights: Sequence[float] | None = None,
+        filter_options: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize the fusion.
+
+        Args:
+            entity_ids: Humidity sensors, in priority order for fallback
+            policy: One of FUSION_POLICIES
+            weights: Weight per sensor for the weighted policy (default 1)
+            filter_options: InputFilter options applied to every source
+        """
+        options = filter_options or DEFAULT_HUMIDITY_FILTER
+        count = len(entity_ids)
+        self.policy = policy
+        self.entity_ids = list(entity_ids)
+        self.filters = [InputFilter(**options) for _ in range(count)]
+        self.weights = [float(weight) for weight in weights] if weights else [1.0] * count
+        self.available = [False] * count
+        self.fresh = [False] * count
+        self.value: float | None = None
+        self._index = {entity_id: index for index, entity_id in enumerate(self.entity_ids)}
+        # Value each fresh source contributes to the fused value
+        self._values: list[float | None] = [None] * count
+        self._weighted_sum = 0.0
+        self._weight_total = 0.0
+        # Earliest time a fresh source may go stale; -inf until the first
+        # refresh has read all sources
+        self._next_check = -math.inf
+
+    def __contains__(self, entity_id: str) -> bool:
+        """Return True if the entity is one of the sources."""
+        return entity_id in self._index
+
+    def add(self, entity_id: str, raw: float, timestamp: float) -> bool:
+        """Feed a reading of one source.
+
+        Args:
+            entity_id: Source that reported
+            raw: Reported humidity
+            timestamp: Time of the report
+
+        Returns:
+            True if the fused value or its availability changed
+        """
+        index = self._index[entity_id]
+        self.available[index] = True
+        accepted = self.filters[index].add(raw, timestamp)
+        if not accepted and self.fresh[index]:
+            return False
+        return self._update(index, True)
+
+    def mark_unavailable(self, entity_id: str) -> bool:
+        """Record that a source became unavailable.
+
+        With a stale timeout the last value stays in use until it expires;
+        without one the source drops out immediately.
+
+        Returns:
+            True if the fused value or its availability changed
+        """
+        index = self._index[entity_id]
+        self.available[index] = False
+        self.filters[index].discard()
+        if self.filters[index].stale_timeout:
+            return False
+        return self._update(index, False)
+
+    def refresh(self, now: float, read: SourceReader) -> bool:
+        """Re-check the sources once one of them may have gone stale.
+
+        Cheap when nothing is due. Otherwise every source is read again:
+        unseeded sources are seeded and unchanged reports count as fresh.
+
+        Args:
+            now: Current time
+            read: Returns the current reading of a source
+
+        Returns:
+            True if the fused value or its availability changed
+        """
+        if now < self._next_check:
+            return False
+
+        changed = False
+        next_check = math.inf
+        for index, entity_id in enumerate(self.entity_ids):
+            input_filter = self.filters[index]
+            reading = read(entity_id)
+            self.available[index] = reading is not None
+            if reading is not None:
+                value, timestamp = reading
+                if input_filter.value is None:
+                    input_filter.add(value, timestamp)
+                else:
+                    input_filter.report(timestamp)
+
+            if input_filter.value is None:
+                fresh = False
+            elif input_filter.stale_timeout:
+                fresh = not input_filter.is_stale(now)
+            else:
+                fresh = self.available[index]
+            changed |= self._update(index, fresh)
+
+            stale_at = input_filter.stale_at()
+            if fresh and stale_at is not None:
+                next_check = min(next_check, stale_at)
+
+        self._next_check = next_check
+        return changed
+
+    def release(self, now: float) -> bool:
+        """Pass on the readings the source filters held back, once due.
+
+        Args:
+            now: Current time
+
+        Returns:
+            True if the fused value changed
+        """
+        changed = False
+        for index, input_filter in enumerate(self.filters):
+            if input_filter.release(now):
+                changed |= self._update(index, self.fresh[index])
+        return changed
+
+    def next_release(self) -> float | None:
+        """Return when the next held-back reading is due, if any."""
+        return min(
+            (f.held_until for f in self.filters if f.held_until is not None),
+            default=None,
+        )
+
+    def next_check(self) -> float | None:
+        """Return the earliest time a source may go stale, if any."""
+        return self._next_check if math.isfinite(self._next_check) else None
+
+    def _update(self, index: int, fresh: bool) -> bool:
+        """Apply the new value and freshness of one source."""
+        old_value = self._values[index]
+        new_value = self.filters[index].value if fresh else None
+        if new_value == old_value:
+            return False
+        self._values[index] = new_value
+
+        if new_value is not None:
+            stale_at = self.filters[index].stale_at()
+            if stale_at is not None and stale_at < self._next_check:
+                self._next_check = stale_at
+        self.fresh[index] = fresh
+
+        fused = self.value
+        self.value = self._fuse(index, old_value, new_value)
+        return self.value != fused or (fused is None) != (self.value is None)
+
+    def _fuse(self, index: int, old_value: float | None, new_value: float | None) -> float | None:
+        """Return the fused value after one source changed."""
+        policy = self.policy
+        if policy == FUSION_WEIGHTED:
+            weight = self.weights[index]
+            if old_value is not None:
+                self._weighted_sum -= weight * old_value
+                self._weight_total -= weight
+            if new_value is not None:
+                self._weighted_sum += weight * new_value
+                self._weight_total += weight
+            if self._weight_total <= 0:
+                # No fresh source left; drop accumulated rounding errors
+                self._weighted_sum = self._weight_total = 0.0
+                return None
+            return self._weighted_sum / self._weight_total
+
+        if policy == FUSION_FALLBACK:
+            return next((value for value in self._values if value is not None), None)
+
+        values = [value for value in self._values if value is not None]
+        if not values:
+            return None
+        if policy == FUSION_MEDIAN:
+            values.sort()
+            middle = len(values) // 2
+            if len(values) % 2:
+                return values[middle]
+            return (values[middle - 1] + values[middle]) / 2
+        return max(values)
+
+    def source_diagnostics(self) -> dict[str, dict[str, Any]]:
+        """Return the state of every source for diagnostics."""
+        return {
+            entity_id: {
+                "value": self.filters[index].value,
+                "fresh": self.fresh[index],
+                "available": self.available[index],
+                "weight": self.weights[index],
+                "received": self.filters[index].received,
+                "accepted": self.filters[index].accepted,
+                "reported_at": self.filters[index].reported_at,
+            }
+            for index, entity_id in enumerate(self.entity_ids)
+        }
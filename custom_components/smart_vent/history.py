@@ -0,0 +1,259 @@
+"""Decision history for Smart Ventilation Controller.
+
+Every decision that changes a zone (mode change, boost start or end, speed
+change) is appended to a fixed-size ring buffer of struct-packed records:
+one preallocated bytearray per zone, about 20 bytes per record, no Python
+objects kept per event. When the buffer is full the oldest records are
+overwritten, so memory never grows.
+
+The export_history service copies the buffer on the event loop (a single
+memcpy) and writes it to CSV or Parquet in an executor job, decoding and
+writing a chunk of records at a time, so weeks of boost behaviour can be
+analysed without grepping the Home Assistant log.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+import csv
+from datetime import datetime, timezone
+import math
+import os
+import struct
+from typing import Any
+
+from .const import EXPORT_PARQUET, HISTORY_TRIGGERS
+from .kernel import MODE_LABELS, BoostKind
+
+# time (epoch seconds), trigger, switch input bits, switch mode, humidity,
+# old mode, new mode, boost kind, speed, boosts today
+RECORD = struct.Struct("<dBhBfBBBBB")
+
+# Switch mode byte of an invalid or unavailable switch
+NO_MODE = 0xFF
+
+# Records decoded and written per chunk during an export
+EXPORT_CHUNK = 4096
+
+# Columns of the exported files
+COLUMNS = (
+    "time",
+    "zone",
+    "trigger",
+    "inputs",
+    "switch_mode",
+    "humidity",
+    "old_mode",
+    "new_mode",
+    "boost",
+    "speed",
+    "boosts_today",
+)
+
+_BOOST_LABELS = tuple(kind.name.lower() for kind in BoostKind)
+
+
+class DecisionHistory:
+    """Ring buffer of struct-packed decision records."""
+
+    __slots__ = ("size", "_buffer", "_head", "_count")
+
+    def __init__(self, size: int) -> None:
+        """Preallocate the buffer.
+
+        Args:
+            size: Number of records kept (0 disables the history)
+        """
+        self.size = size
+        self._buffer = bytearray(size * RECORD.size)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of records in the buffer."""
+        return self._count
+
+    def append(
+        self,
+        timestamp: float,
+        trigger: str,
+        inputs: int | None,
+        switch_mode: int | None,
+        humidity: float | None,
+        old_mode: int,
+        new_mode: int,
+        boost: int,
+        speed: int,
+        boosts_today: int,
+    ) -> None:
+        """Append one record, overwriting the oldest one when full.
+
+        Args:
+            timestamp: Wall-clock time in seconds since the epoch
+            trigger: What caused the decision (one of HISTORY_TRIGGERS)
+            inputs: Switch input bits (input i on = bit i), None if invalid
+            switch_mode: Mode selected by the switch, None if invalid
+            humidity: Fused humidity, None while stale
+            old_mode: Mode before the decision
+            new_mode: Mode after the decision
+            boost: BoostKind after the decision
+            speed: Target speed after the decision
+            boosts_today: Auto-boosts started today
+        """
+        if not self.size:
+            return
+        RECORD.pack_into(
+            self._buffer,
+            self._head * RECORD.size,
+            timestamp,
+            HISTORY_TRIGGERS.index(trigger),
+            -1 if inputs is None or inputs < 0 else inputs,
+            NO_MODE if switch_mode is None else switch_mode,
+            math.nan if humidity is None else humidity,
+            old_mode,
+            new_mode,
+            boost,
+            speed,
+            min(boosts_today, 0xFF),
+        )
+        self._head = (self._head + 1) % self.size
+        if self._count < self.size:
+            self._count += 1
+
+    def snapshot(self) -> bytes:
+        """Return a copy of all records, oldest first."""
+        split = self._head * RECORD.size
+        if self._count < self.size:
+            return bytes(self._buffer[:split])
+        return bytes(self._buffer[split:] + self._buffer[:split])
+
+    def clear(self) -> None:
+        """Drop all records."""
+        self._head = 0
+        self._count = 0
+
+
+def iter_chunks(
+    data: bytes, zone_id: str, input_count: int
+) -> Iterator[list[tuple[Any, ...]]]:
+    """Decode a history snapshot into export rows, one chunk at a time.
+
+    Args:
+        data: Result of DecisionHistory.snapshot()
+        zone_id: Zone the records belong to
+        input_count: Number of switch inputs, for the input pattern column
+    """
+    view = memoryview(data)
+    step = EXPORT_CHUNK * RECORD.size
+    for offset in range(0, len(data), step):
+        rows = []
+        for (
+            timestamp,
+            trigger,
+            inputs,
+            switch_mode,
+            humidity,
+            old_mode,
+            new_mode,
+            boost,
+            speed,
+            boosts_today,
+        ) in RECORD.iter_unpack(view[offset : offset + step]):
+            rows.append(
+                (
+                    datetime.fromtimestamp(timestamp, timezone.utc),
+                    zone_id,
+                    HISTORY_TRIGGERS[trigger],
+                    None
+                    if inputs < 0
+                    else "".join(
+                        "1" if inputs >> bit & 1 else "0" for bit in range(input_count)
+                    ),
+                    None if switch_mode == NO_MODE else MODE_LABELS[switch_mode],
+                    None if math.isnan(humidity) else round(humidity, 2),
+                    MODE_LABELS[old_mode],
+                    MODE_LABELS[new_mode],
+                    _BOOST_LABELS[boost],
+                    speed,
+                    boosts_today,
+                )
+            )
+        yield rows
+
+
+def write_csv(path: str, data: bytes, zone_id: str, input_count: int) -> None:
+    """Write a history snapshot to a CSV file; runs in an executor.
+
+    Args:
+        path: File to write
+        data: Result of DecisionHistory.snapshot()
+        zone_id: Zone the records belong to
+        input_count: Number of switch inputs
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        for rows in iter_chunks(data, zone_id, input_count):
+            writer.writerows((row[0].isoformat(), *row[1:]) for row in rows)
+
+
+def write_parquet(path: str, data: bytes, zone_id: str, input_count: int) -> None:
+    """Write a history snapshot to a Parquet file; runs in an executor.
+
+    Every chunk becomes one row group. Needs pyarrow, which is imported
+    here so the integration does not depend on it.
+
+    Args:
+        path: File to write
+        data: Result of DecisionHistory.snapshot()
+        zone_id: Zone the records belong to
+        input_count: Number of switch inputs
+
+    Raises:
+        ImportError: pyarrow is not installed
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("time", pa.timestamp("ms", tz="UTC")),
+            ("zone", pa.string()),
+            ("trigger", pa.string()),
+            ("inputs", pa.string()),
+            ("switch_mode", pa.string()),
+            ("humidity", pa.float32()),
+            ("old_mode", pa.string()),
+            ("new_mode", pa.string()),
+            ("boost", pa.string()),
+            ("speed", pa.uint8()),
+            ("boosts_today", pa.uint8()),
+        ]
+    )
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in iter_chunks(data, zone_id, input_count):
+            arrays = [
+                pa.array(column, type=field.type)
+                for column, field in zip(zip(*rows), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+def export(
+    path: str, file_format: str, data: bytes, zone_id: str, input_count: int
+) -> None:
+    """Write a history snapshot to a file, creating its directory; runs in an executor.
+
+    Args:
+        path: File to write
+        file_format: One of EXPORT_FORMATS
+        data: Result of DecisionHistory.snapshot()
+        zone_id: Zone the records belong to
+        input_count: Number of switch inputs
+
+    Raises:
+        ImportError: Parquet was requested and pyarrow is not installed
+        OSError: The file could not be written
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    writer = write_parquet if file_format == EXPORT_PARQUET else write_csv
+    writer(path, data, zone_id, input_count)
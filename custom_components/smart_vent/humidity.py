@@ -0,0 +1,192 @@
+"""Rolling humidity statistics for Smart Ventilation Controller.
+
+Each humidity sensor gets a fixed-size ring buffer of samples. Windowed mean
+and least-squares slope are maintained from running sums, and two EWMAs
+(a fast smoothed value and a slow baseline) are updated per sample, so every
+metric costs O(1) per sample and memory never grows.
+
+The window is bounded in time as well: samples older than max_age are
+dropped. Filtered sensors report only changes, so on a humidity plateau no
+new samples arrive, and a window bounded by count alone would keep the
+slope of the last rise forever.
+"""
+from __future__ import annotations
+
+from array import array
+
+# Smoothing factor for the fast EWMA used for level triggering
+EWMA_ALPHA = 0.5
+
+# Smoothing factor for the slow EWMA that tracks the "normal" humidity
+BASELINE_ALPHA = 0.02
+
+# Minimum number of samples before a slope is reported
+MIN_SLOPE_SAMPLES = 3
+
+
+class HumidityHistory:
+    """Fixed-memory sample window with O(1) mean, slope and EWMA updates."""
+
+    __slots__ = (
+        "size",
+        "max_age",
+        "_times",
+        "_values",
+        "_head",
+        "_count",
+        "_origin",
+        "_sum_t",
+        "_sum_v",
+        "_sum_tt",
+        "_sum_tv",
+        "ewma",
+        "baseline",
+        "last_value",
+        "last_time",
+    )
+
+    def __init__(self, size: int, max_age: float = 0.0) -> None:
+        """Initialize an empty history.
+
+        Args:
+            size: Number of samples kept in the window
+            max_age: Seconds after which a sample leaves the window
+                (0 = only when the window is full)
+        """
+        self.size = size
+        self.max_age = max_age
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._head = 0
+        self._count = 0
+        # Times are stored relative to an origin that is moved forward on
+        # every buffer wrap, which keeps the running sums well conditioned
+        self._origin = 0.0
+        self._sum_t = 0.0
+        self._sum_v = 0.0
+        self._sum_tt = 0.0
+        self._sum_tv = 0.0
+        self.ewma: float | None = None
+        self.baseline: float | None = None
+        self.last_value: float | None = None
+        self.last_time: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return self._count
+
+    def add(
+        self,
+        value: float,
+        timestamp: float,
+        update_baseline: bool = True,
+    ) -> None:
+        """Add a sample, evicting the oldest one when the window is full.
+
+        Args:
+            value: Humidity in percent
+            timestamp: Monotonic time of the sample in seconds
+            update_baseline: False to leave the baseline untouched, e.g. while
+                a boost is running and humidity is not at its normal level
+        """
+        if self._count == 0:
+            self._origin = timestamp
+
+        t = timestamp - self._origin
+        head = self._head
+        if self._count == self.size:
+            old_t = self._times[head]
+            old_v = self._values[head]
+            self._sum_t -= old_t
+            self._sum_v -= old_v
+            self._sum_tt -= old_t * old_t
+            self._sum_tv -= old_t * old_v
+        else:
+            self._count += 1
+
+        self._times[head] = t
+        self._values[head] = value
+        self._sum_t += t
+        self._sum_v += value
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+
+        self._head = (head + 1) % self.size
+        if self._head == 0:
+            self._rebase()
+
+        if self.ewma is None:
+            self.ewma = value
+            self.baseline = value
+        else:
+            self.ewma += EWMA_ALPHA * (value - self.ewma)
+            if update_baseline:
+                self.baseline += BASELINE_ALPHA * (value - self.baseline)
+
+        self.last_value = value
+        self.last_time = timestamp
+
+    def expire(self, now: float) -> None:
+        """Drop the samples that are older than max_age.
+
+        Each sample is dropped at most once, so the amortized cost stays O(1).
+
+        Args:
+            now: Current monotonic time in seconds
+        """
+        if not self.max_age:
+            return
+        cutoff = now - self.max_age - self._origin
+        while self._count:
+            oldest = (self._head - self._count) % self.size
+            old_t = self._times[oldest]
+            if old_t >= cutoff:
+                return
+            old_v = self._values[oldest]
+            self._sum_t -= old_t
+            self._sum_v -= old_v
+            self._sum_tt -= old_t * old_t
+            self._sum_tv -= old_t * old_v
+            self._count -= 1
+        # Drop accumulated rounding errors
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+
+    def _rebase(self) -> None:
+        """Shift the time origin to the oldest sample and recompute the sums.
+
+        Runs once per `size` samples, so the amortized cost stays O(1).
+        """
+        oldest = (self._head - self._count) % self.size
+        shift = self._times[oldest]
+        self._origin += shift
+        self._sum_t = self._sum_tt = self._sum_tv = 0.0
+        for k in range(self._count):
+            i = (oldest + k) % self.size
+            t = self._times[i] - shift
+            self._times[i] = t
+            self._sum_t += t
+            self._sum_tt += t * t
+            self._sum_tv += t * self._values[i]
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean humidity over the window."""
+        if self._count == 0:
+            return None
+        return self._sum_v / self._count
+
+    @property
+    def slope(self) -> float | None:
+        """Return the least-squares humidity trend in percent per minute.
+
+        None with fewer than MIN_SLOPE_SAMPLES samples in the window, e.g. on
+        a plateau once the samples of the last rise have expired.
+        """
+        n = self._count
+        if n < MIN_SLOPE_SAMPLES:
+            return None
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        per_second = (n * self._sum_tv - self._sum_t * self._sum_v) / denominator
+        return per_second * 60
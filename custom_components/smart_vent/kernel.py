@@ -0,0 +1,258 @@
+"""Pure decision kernel for Smart Ventilation Controller.
+
+The mode state machine of a zone as a side-effect-free function: an
+immutable input snapshot and the current zone state go in, the new zone
+state and the actuator commands come out. No Home Assistant objects, clocks
+or logging are involved, so the kernel can be evaluated in bulk, replayed
+and fuzzed without Home Assistant.
+
+States are immutable and only rebuilt when something changes, so a steady
+evaluation allocates nothing and returns the very same state object.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from enum import IntEnum
+
+
+class Mode(IntEnum):
+    """Ventilation mode; the value indexes the speed table."""
+
+    LOW = 0
+    MID = 1
+    BOOST = 2
+
+    @property
+    def label(self) -> str:
+        """Return the mode name used in configuration and services."""
+        return MODE_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label: str) -> Mode:
+        """Return the mode for a name such as 'mid'."""
+        return cls[label.upper()]
+
+
+MODE_LABELS = ("low", "mid", "boost")
+
+
+class BoostKind(IntEnum):
+    """Kind of the boost that is currently running."""
+
+    NONE = 0
+    AUTO = 1
+    MANUAL = 2
+
+
+@dataclass(frozen=True, slots=True)
+class KernelConfig:
+    """Static zone configuration used by the kernel.
+
+    Durations are in seconds.
+    """
+
+    speeds: tuple[int, int, int]
+    max_boosts_per_day: int
+    auto_boost_duration: float
+    closed_loop: bool = False
+    min_boost_duration: float = 0.0
+    max_boost_duration: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class ZoneInputs:
+    """Snapshot of everything the kernel needs from the outside world.
+
+    Attributes:
+        now: Current monotonic time in seconds, so wall-clock steps do not
+            shorten or extend a boost
+        day: Ordinal of the current local day, for the daily counter reset
+        switch_mode: Mode selected by the physical switch
+        boost_trigger: Humidity calls for an auto-boost
+        humidity_recovered: Humidity is back to normal, so a closed-loop
+            auto-boost may end early
+    """
+
+    now: float
+    day: int
+    switch_mode: Mode
+    boost_trigger: bool = False
+    humidity_recovered: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class ZoneState:
+    """Runtime state of a zone. Times are in seconds, like ZoneInputs.now."""
+
+    mode: Mode = Mode.LOW
+    boost_kind: BoostKind = BoostKind.NONE
+    boost_start: float | None = None
+    boost_end: float | None = None
+    boost_count: int = 0
+    day: int | None = None
+    mode_before_boost: Mode | None = None
+    last_switch_mode: Mode | None = None
+
+    @property
+    def boost_active(self) -> bool:
+        """Return True if an automatic or manual boost is running."""
+        return self.boost_kind != BoostKind.NONE
+
+
+NO_COMMANDS: tuple[int, ...] = ()
+
+
+def _clear_boost(state: ZoneState) -> ZoneState:
+    """Return the state with all boost fields cleared."""
+    if not state.boost_active:
+        return state
+    return replace(
+        state,
+        boost_kind=BoostKind.NONE,
+        boost_start=None,
+        boost_end=None,
+        mode_before_boost=None,
+    )
+
+
+def _enter_mode(
+    config: KernelConfig, state: ZoneState, mode: Mode
+) -> tuple[ZoneState, tuple[int, ...]]:
+    """Switch to a mode, emitting its speed if the mode actually changes."""
+    if state.mode == mode:
+        return state, NO_COMMANDS
+    return replace(state, mode=mode), (config.speeds[mode],)
+
+
+def min_boost_end(config: KernelConfig, state: ZoneState) -> float | None:
+    """Return the earliest time a closed-loop auto-boost may end early."""
+    if (
+        not config.closed_loop
+        or state.boost_kind != BoostKind.AUTO
+        or state.boost_start is None
+    ):
+        return None
+    return state.boost_start + config.min_boost_duration
+
+
+def _boost_expired(config: KernelConfig, state: ZoneState, inputs: ZoneInputs) -> Mode | None:
+    """Return the mode to return to if the running boost is over."""
+    if not state.boost_active:
+        return None
+
+    min_end = min_boost_end(config, state)
+    if min_end is not None and inputs.now >= min_end and inputs.humidity_recovered:
+        return Mode.MID
+
+    if state.boost_end is not None and inputs.now >= state.boost_end:
+        if state.boost_kind == BoostKind.MANUAL:
+            return state.mode_before_boost if state.mode_before_boost is not None else Mode.MID
+        return Mode.MID
+
+    return None
+
+
+def decide(
+    config: KernelConfig, state: ZoneState, inputs: ZoneInputs
+) -> tuple[ZoneState, tuple[int, ...]]:
+    """Evaluate one step of the zone state machine.
+
+    Priorities:
+    1. A running manual boost holds until it times out or the switch moves
+    2. A boost that just ended returns to its saved mode
+    3. Switch in low cancels auto-boost and selects low
+    4. Switch in boost cancels any boost and selects boost
+    5. Switch in mid keeps a running auto-boost, starts a new one when
+       humidity calls for it and the daily limit allows, otherwise selects mid
+
+    Args:
+        config: Static zone configuration
+        state: Current zone state
+        inputs: Input snapshot
+
+    Returns:
+        Tuple of (new state, fan speed commands); the state object is
+        returned unchanged when nothing changed
+    """
+    commands = NO_COMMANDS
+
+    # Reset the daily counter on a new day
+    if state.day != inputs.day:
+        state = replace(state, boost_count=0, day=inputs.day)
+
+    switch_mode = inputs.switch_mode
+
+    # Check if the boost is over (returns mode to restore, or None)
+    timeout_return_mode = _boost_expired(config, state, inputs)
+    if timeout_return_mode is not None:
+        state = _clear_boost(state)
+
+    # Moving the switch cancels a manual boost
+    if (
+        state.boost_kind == BoostKind.MANUAL
+        and state.last_switch_mode is not None
+        and switch_mode != state.last_switch_mode
+    ):
+        state = _clear_boost(state)
+
+    if state.last_switch_mode != switch_mode:
+        state = replace(state, last_switch_mode=switch_mode)
+
+    if state.boost_kind == BoostKind.MANUAL:
+        # Manual boost stays active regardless of the switch position
+        pass
+
+    elif timeout_return_mode is not None:
+        state, commands = _enter_mode(config, state, timeout_return_mode)
+
+    elif switch_mode == Mode.LOW:
+        state, commands = _enter_mode(config, _clear_boost(state), Mode.LOW)
+
+    elif switch_mode == Mode.BOOST:
+        state, commands = _enter_mode(config, _clear_boost(state), Mode.BOOST)
+
+    elif state.boost_kind == BoostKind.AUTO:
+        # Auto-boost is still running in mid, keep boost speed
+        pass
+
+    elif inputs.boost_trigger and state.boost_count < config.max_boosts_per_day:
+        duration = config.max_boost_duration if config.closed_loop else config.auto_boost_duration
+        state = replace(
+            state,
+            mode=Mode.BOOST,
+            boost_kind=BoostKind.AUTO,
+            boost_start=inputs.now,
+            boost_end=inputs.now + duration,
+            boost_count=state.boost_count + 1,
+        )
+        commands = (config.speeds[Mode.BOOST],)
+
+    else:
+        state, commands = _enter_mode(config, state, Mode.MID)
+
+    return state, commands
+
+
+def set_mode(
+    config: KernelConfig, state: ZoneState, mode: Mode
+) -> tuple[ZoneState, tuple[int, ...]]:
+    """Select a mode directly (service call); cancels any running boost."""
+    return _enter_mode(config, _clear_boost(state), mode)
+
+
+def force_boost(
+    config: KernelConfig, state: ZoneState, now: float
+) -> tuple[ZoneState, tuple[int, ...]]:
+    """Start a manual boost that returns to the current mode when it ends.
+
+    Does not check the daily limit and does not increment the counter.
+    """
+    state = replace(
+        _clear_boost(state),
+        mode=Mode.BOOST,
+        boost_kind=BoostKind.MANUAL,
+        boost_start=now,
+        boost_end=now + config.auto_boost_duration,
+        mode_before_boost=state.mode,
+    )
+    return state, (config.speeds[Mode.BOOST],)
@@ -0,0 +1,505 @@
+"""Zone manager for Smart Ventilation Controller.
+
+One manager owns every configured zone, drives all of them from a single
+shared timer and listens to all zone inputs through a single state-change
+subscription.
+
+In both scheduling modes one timer is armed for the earliest upcoming
+deadline of any zone (boost expiry, daily counter rollover), so a boost ends
+on time rather than at the next periodic check. Deadlines are monotonic
+times, armed as relative delays, so wall-clock steps do not move them. In
+event-driven scheduling there is no periodic timer at all: zones are only
+evaluated on input changes and at their deadlines.
+
+Time-of-day profiles are switched by one more point-in-time callback, armed
+for the next schedule transition of any zone.
+
+At startup zones only show their restored state. Their first decision waits
+until Home Assistant has started and the fan and all inputs of the zone
+report valid states (or the startup timeout passed), so half-loaded entities
+neither produce a wrong mode nor a fan command.
+
+Zones can be added and removed at runtime. Reloading a config entry removes
+and re-adds only its own zone: the shared listener and timers are re-armed
+for the new set of zones, and the runtime state of the removed zone (mode,
+running boost, daily count, decision history) is handed to its replacement.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_time,
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.start import async_at_started
+
+from . import clock
+from .budget import AirflowBudget
+from .const import (
+    DEFAULT_AIRFLOW_BUDGET,
+    DEFAULT_STARTUP_TIMEOUT,
+    REFRESH_BUDGET,
+    REFRESH_DEADLINE,
+    REFRESH_SCHEDULE,
+    REFRESH_TIMER,
+    SCHEDULING_EVENT,
+)
+from .coordinator import SmartVentCoordinator
+from .history import DecisionHistory
+from .store import SmartVentStore
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds a timer may fire before its deadline and still count it as reached
+DEADLINE_TOLERANCE = 0.01
+
+
+class SmartVentManager:
+    """Own all zone coordinators and schedule their evaluations."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        scheduling: str,
+        airflow_budget: float = DEFAULT_AIRFLOW_BUDGET,
+        startup_timeout: int = DEFAULT_STARTUP_TIMEOUT,
+    ) -> None:
+        """Initialize the manager.
+
+        Zones are added with async_add_zones() once the saved state is
+        loaded, and can be removed and added again at runtime (config entry
+        reload) without touching the other zones.
+
+        Args:
+            hass: Home Assistant instance
+            scheduling: 'interval' for fixed polling, 'event' for deadline scheduling
+            airflow_budget: Combined airflow of all boosting zones (0 = unlimited)
+            startup_timeout: Seconds a new zone waits for valid inputs before
+                its first decision is made anyway
+        """
+        self.hass = hass
+        self.scheduling = scheduling
+        self.zones: dict[str, SmartVentCoordinator] = {}
+
+        # Map every monitored entity to the zones that read it, so a state
+        # change only wakes up the zones that actually depend on it
+        self._entity_index: dict[str, list[SmartVentCoordinator]] = {}
+        self._unsub_state: Callable[[], None] | None = None
+
+        # Zones waiting for valid inputs before their first decision, and
+        # the entities (fan and inputs) each of them waits for
+        self.startup_timeout = startup_timeout
+        self._hass_started = False
+        self._unsub_started: Callable[[], None] | None = None
+        self._pending: dict[str, SmartVentCoordinator] = {}
+        self._pending_index: dict[str, list[SmartVentCoordinator]] = {}
+
+        # Whole-house airflow budget shared by all zones
+        self.budget: AirflowBudget | None = None
+        if airflow_budget:
+            self.budget = AirflowBudget(airflow_budget, self._async_wake_zone)
+
+        # Listeners registered on each zone, removed with the zone
+        self._zone_unsub: dict[str, list[Callable[[], None]]] = {}
+
+        # Runtime state persisted across restarts. Zones that are not loaded
+        # (removed for a reload, disabled entries) keep their last state here
+        self.store = SmartVentStore(hass, self._persistent_snapshot)
+        self._stored: dict[str, dict] = {}
+        # In-memory decision history of removed zones, handed to the
+        # replacement on a reload
+        self._histories: dict[str, DecisionHistory] = {}
+
+        # Shared periodic timer; runs at the shortest interval of all zones
+        self.check_interval: int | None = None
+        self._unsub_interval: Callable[[], None] | None = None
+
+        # Event-driven scheduling: the single armed deadline timer
+        self._deadline: float | None = None
+        self._unsub_deadline: Callable[[], None] | None = None
+        # Deadline of every zone when the timer was armed; the timer refreshes
+        # the zones that were due, even if their next deadline has moved on
+        # (e.g. to the following midnight)
+        self._zone_deadlines: dict[str, float] = {}
+
+        # The single timer armed for the next schedule transition
+        self._unsub_schedule: Callable[[], None] | None = None
+
+    async def async_start(self) -> None:
+        """Load the saved state of all zones."""
+        self._stored = await self.store.async_load()
+        self._unsub_started = async_at_started(self.hass, self._async_hass_started)
+        _LOGGER.info("Smart Vent manager started, %s scheduling", self.scheduling)
+
+    async def async_add_zones(self, zones: list[SmartVentCoordinator]) -> None:
+        """Restore the saved state of new zones and start listening.
+
+        Once Home Assistant is running, zones whose inputs are already valid
+        are evaluated before this returns; the others start as soon as
+        their inputs are valid or the startup timeout passed.
+
+        Args:
+            zones: Zone coordinators whose zone ids are not in use yet
+        """
+        now = clock.now()
+        for zone in zones:
+            zone_id = zone.zone_id
+            self.zones[zone_id] = zone
+            if (data := self._stored.get(zone_id)) is not None:
+                zone.restore_persistent_state(data)
+            history = self._histories.pop(zone_id, None)
+            if history is not None and history.size == zone.history.size:
+                zone.history = history
+            zone.budget = self.budget
+            self._zone_unsub[zone_id] = [
+                # Save (debounced) whenever the zone finishes an evaluation
+                zone.async_add_listener(self.store.async_schedule_save),
+                # Re-check the deadline every time the zone finishes an evaluation
+                zone.async_add_listener(self._zone_updated_callback(zone)),
+            ]
+            zone.async_update_profile(now)
+            self._pending[zone_id] = zone
+        self._async_arm_schedule(now)
+        self._async_zones_changed()
+
+        if self._hass_started:
+            await self._async_start_ready_zones(zones)
+        _LOGGER.info(
+            "Smart Vent zone(s) %s added: %d zone(s), %d monitored entities",
+            ", ".join(zone.zone_id for zone in zones),
+            len(self.zones),
+            len(self._entity_index),
+        )
+
+    @callback
+    def async_remove_zone(self, zone_id: str) -> None:
+        """Stop a zone and keep its runtime state for when it is added again.
+
+        Args:
+            zone_id: Zone to remove
+        """
+        zone = self.zones.pop(zone_id)
+        self._pending.pop(zone_id, None)
+        for unsub in self._zone_unsub.pop(zone_id):
+            unsub()
+        zone.async_stop()
+
+        self._stored[zone_id] = zone.get_persistent_state()
+        self._histories[zone_id] = zone.history
+        self.store.async_schedule_save()
+
+        # Hand a held or requested boost share back to the other zones
+        if self.budget is not None:
+            monotonic = clock.monotonic()
+            self.budget.withdraw(zone_id, monotonic)
+            self.budget.update(zone_id, False, zone.boost_airflow, monotonic)
+
+        self._zone_deadlines.pop(zone_id, None)
+        self._async_arm_schedule(clock.now())
+        self._async_zones_changed()
+        _LOGGER.info("Smart Vent zone '%s' removed", zone_id)
+
+    @callback
+    def async_forget_zone(self, zone_id: str) -> None:
+        """Drop the saved state of a zone that was deleted."""
+        self._histories.pop(zone_id, None)
+        if self._stored.pop(zone_id, None) is not None:
+            self.store.async_schedule_save()
+
+    @callback
+    def async_stop(self) -> None:
+        """Remove the timers and the state listener and stop all zones."""
+        for zone_id in list(self.zones):
+            for unsub in self._zone_unsub.pop(zone_id):
+                unsub()
+            self.zones[zone_id].async_stop()
+        self._async_cancel_deadline()
+        for unsub in (
+            self._unsub_state,
+            self._unsub_interval,
+            self._unsub_schedule,
+            self._unsub_started,
+        ):
+            if unsub is not None:
+                unsub()
+        self._unsub_state = self._unsub_interval = self._unsub_schedule = None
+        self._unsub_started = None
+
+    @callback
+    def _async_hass_started(self, _hass: HomeAssistant) -> None:
+        """Start the zones that waited for Home Assistant to finish starting."""
+        self._hass_started = True
+        self._unsub_started = None
+        self.hass.async_create_task(
+            self._async_start_ready_zones(list(self._pending.values()))
+        )
+
+    async def _async_start_ready_zones(self, zones: list[SmartVentCoordinator]) -> None:
+        """Start the zones whose inputs are valid; give the others a deadline."""
+        ready = [zone for zone in zones if not zone.unready_entities()]
+        for zone in ready:
+            self._pending.pop(zone.zone_id, None)
+        await asyncio.gather(*(zone.async_start() for zone in ready))
+
+        for zone in zones:
+            if zone.zone_id not in self._pending:
+                continue
+            _LOGGER.debug(
+                "Zone '%s' waiting up to %d s for %s",
+                zone.zone_id,
+                self.startup_timeout,
+                ", ".join(zone.unready_entities()),
+            )
+            self._zone_unsub[zone.zone_id].append(
+                async_call_later(
+                    self.hass,
+                    self.startup_timeout,
+                    self._startup_timeout_callback(zone),
+                )
+            )
+
+    def _startup_timeout_callback(
+        self, zone: SmartVentCoordinator
+    ) -> Callable[[datetime], None]:
+        """Build the callback that starts a zone whose inputs stayed invalid."""
+
+        @callback
+        def _async_startup_timeout(_now: datetime) -> None:
+            if zone.zone_id not in self._pending:
+                return
+            _LOGGER.warning(
+                "Zone '%s' starting without valid states for %s after %d s",
+                zone.zone_id,
+                ", ".join(zone.unready_entities()),
+                self.startup_timeout,
+            )
+            self._async_start_zone(zone)
+
+        return _async_startup_timeout
+
+    @callback
+    def _async_start_zone(self, zone: SmartVentCoordinator) -> None:
+        """Make the first decision of a zone that waited for its inputs."""
+        del self._pending[zone.zone_id]
+        _LOGGER.debug("Zone '%s' inputs ready, starting", zone.zone_id)
+        self.hass.async_create_task(zone.async_start())
+
+    def get_zones(self, zone_id: str | None) -> list[SmartVentCoordinator]:
+        """Return the zones addressed by a service call.
+
+        Args:
+            zone_id: Zone to select, or None for all zones
+
+        Returns:
+            List of matching zone coordinators (empty if the zone is unknown)
+        """
+        if zone_id is None:
+            return list(self.zones.values())
+        zone = self.zones.get(zone_id)
+        return [zone] if zone is not None else []
+
+    @callback
+    def _persistent_snapshot(self) -> dict[str, dict]:
+        """Return the persistent state of all zones for the store."""
+        return {
+            **self._stored,
+            **{zone_id: zone.get_persistent_state() for zone_id, zone in self.zones.items()},
+        }
+
+    @callback
+    def _async_zones_changed(self) -> None:
+        """Re-subscribe the state listener and re-arm the timers for the zones."""
+        self._entity_index = {}
+        for zone in self.zones.values():
+            for entity_id in zone.monitored_entities:
+                self._entity_index.setdefault(entity_id, []).append(zone)
+
+        self._pending_index = {}
+        for zone in self._pending.values():
+            for entity_id in (zone.fan_entity, *zone.monitored_entities):
+                self._pending_index.setdefault(entity_id, []).append(zone)
+
+        if self._unsub_state is not None:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._entity_index:
+            self._unsub_state = async_track_state_change_event(
+                self.hass,
+                list(self._entity_index.keys() | self._pending_index.keys()),
+                self._async_state_changed_listener,
+            )
+
+        self._async_arm_deadline()
+        self._async_arm_interval()
+
+    @callback
+    def _async_arm_interval(self) -> None:
+        """(Re-)arm the periodic timer for the shortest zone check interval."""
+        interval = None
+        if self.scheduling != SCHEDULING_EVENT and self.zones:
+            interval = min(zone.check_interval for zone in self.zones.values())
+        if interval == self.check_interval:
+            return
+
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+        self.check_interval = interval
+        if interval is not None:
+            self._unsub_interval = async_track_time_interval(
+                self.hass, self._async_periodic_update, timedelta(seconds=interval)
+            )
+
+    async def _async_refresh_zones(self, zones, source: str) -> None:
+        """Evaluate the given zones concurrently and wait for the results."""
+        await asyncio.gather(*(zone.async_evaluate(source) for zone in zones))
+
+    @callback
+    def _async_state_changed_listener(self, event: Event) -> None:
+        """Handle state changes of any monitored entity."""
+        entity_id = event.data.get("entity_id")
+        new_state = event.data.get("new_state")
+
+        # Attribute-only updates (battery, signal strength, ...) carry no
+        # new input value
+        old_state = event.data.get("old_state")
+        if old_state is not None and new_state is not None and old_state.state == new_state.state:
+            return
+
+        if self._pending and self._hass_started:
+            for zone in self._pending_index.get(entity_id, ()):
+                if zone.zone_id in self._pending and not zone.unready_entities():
+                    self._async_start_zone(zone)
+
+        zones = self._entity_index.get(entity_id)
+        if not zones:
+            return
+
+        _LOGGER.debug(
+            "State change detected for %s, refreshing %d zone(s)", entity_id, len(zones)
+        )
+        # Bypass the debouncer for low latency; the single-flight pipeline
+        # collapses bursts into at most one extra evaluation per zone.
+        # Unavailable states are passed on too: a zone with several humidity
+        # sensors drops the unavailable one from its fused value
+        for zone in zones:
+            if zone.ready:
+                zone.async_input_changed(entity_id, new_state)
+
+    @callback
+    def _async_wake_zone(self, zone_id: str) -> None:
+        """Evaluate a zone whose queued auto-boost was granted."""
+        self.zones[zone_id].async_schedule_evaluation(REFRESH_BUDGET)
+
+    @callback
+    def _async_periodic_update(self, now) -> None:
+        """Shared periodic update callback for all zones."""
+        _LOGGER.debug("Periodic update triggered (every %d seconds)", self.check_interval)
+        for zone in self.zones.values():
+            if zone.ready:
+                zone.async_schedule_evaluation(REFRESH_TIMER)
+
+    def _zone_updated_callback(self, zone: SmartVentCoordinator) -> Callable[[], None]:
+        """Build the listener that re-arms the deadline after a zone update."""
+
+        @callback
+        def _async_zone_updated() -> None:
+            deadline = zone.next_deadline()
+            self._zone_deadlines[zone.zone_id] = deadline
+            # Only an earlier deadline needs re-arming; a later one is picked
+            # up when the currently armed timer fires and rescans all zones
+            if self._deadline is None or deadline < self._deadline:
+                self._async_arm_timer(deadline)
+
+        return _async_zone_updated
+
+    @callback
+    def _async_arm_deadline(self) -> None:
+        """Arm the single deadline timer for the earliest zone deadline."""
+        # Zones still waiting for their inputs are not evaluated yet
+        self._zone_deadlines = {
+            zone_id: zone.next_deadline()
+            for zone_id, zone in self.zones.items()
+            if zone.ready
+        }
+        if not self._zone_deadlines:
+            self._async_cancel_deadline()
+            return
+        self._async_arm_timer(min(self._zone_deadlines.values()))
+
+    @callback
+    def _async_arm_timer(self, deadline: float) -> None:
+        """(Re-)arm the deadline timer for a monotonic time."""
+        self._async_cancel_deadline()
+        self._deadline = deadline
+        self._unsub_deadline = async_call_later(
+            self.hass, max(0.0, deadline - clock.monotonic()), self._async_deadline_reached
+        )
+        _LOGGER.debug("Next deadline armed at %s", clock.to_datetime(deadline).isoformat())
+
+    @callback
+    def _async_cancel_deadline(self) -> None:
+        """Cancel the armed deadline timer, if any."""
+        if self._unsub_deadline is not None:
+            self._unsub_deadline()
+            self._unsub_deadline = None
+        self._deadline = None
+
+    @callback
+    def _async_deadline_reached(self, _now: datetime) -> None:
+        """Evaluate the zones whose deadline has passed and re-arm."""
+        self._unsub_deadline = None
+        self._deadline = None
+
+        now = clock.monotonic() + DEADLINE_TOLERANCE
+        due = [
+            zone
+            for zone_id, zone in self.zones.items()
+            if zone.ready and self._zone_deadlines.get(zone_id, now) <= now
+        ]
+        _LOGGER.debug("Deadline reached, refreshing %d zone(s)", len(due))
+        self.hass.async_create_task(self._async_refresh_due_zones(due))
+
+    async def _async_refresh_due_zones(self, zones: list[SmartVentCoordinator]) -> None:
+        """Refresh zones at their deadline, then arm the next deadline."""
+        await self._async_refresh_zones(zones, REFRESH_DEADLINE)
+        self._async_arm_deadline()
+
+    @callback
+    def _async_arm_schedule(self, now: datetime) -> None:
+        """Arm the schedule timer for the earliest profile transition, if any."""
+        if self._unsub_schedule is not None:
+            self._unsub_schedule()
+            self._unsub_schedule = None
+
+        transitions = [
+            transition
+            for zone in self.zones.values()
+            if (transition := zone.schedule.next_transition(now)) is not None
+        ]
+        if not transitions:
+            return
+
+        transition = min(transitions)
+        self._unsub_schedule = async_track_point_in_time(
+            self.hass, self._async_schedule_transition, transition
+        )
+        _LOGGER.debug("Next schedule transition armed at %s", transition.isoformat())
+
+    @callback
+    def _async_schedule_transition(self, now: datetime) -> None:
+        """Switch the profiles of all zones whose schedule changed and re-arm."""
+        self._unsub_schedule = None
+
+        now = clock.now()
+        for zone in self.zones.values():
+            if zone.async_update_profile(now) and zone.ready:
+                zone.async_schedule_evaluation(REFRESH_SCHEDULE)
+        self._async_arm_schedule(now)
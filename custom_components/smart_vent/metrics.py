@@ -0,0 +1,149 @@
+"""Runtime metrics for Smart Ventilation Controller.
+
+Fixed-memory instrumentation of the hot paths: latency histograms with
+fixed log-spaced buckets and plain counters. Recording a sample is a bisect
+and two additions, so metrics are always on; they are exposed through the
+diagnostics sensor, the get_diagnostics service and Home Assistant
+diagnostics instead of debug logging.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+from typing import Any
+
+from .const import REFRESH_SOURCES
+
+# Upper bounds of the latency buckets in milliseconds; one more bucket
+# collects everything slower than the last bound
+LATENCY_BUCKETS_MS = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+
+class LatencyHistogram:
+    """Latency distribution with fixed buckets, O(1) per sample."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration.
+
+        Args:
+            seconds: Measured duration in seconds
+        """
+        milliseconds = seconds * 1000
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+
+    def time(self) -> _Timer:
+        """Return a context manager that records the duration of its block."""
+        return _Timer(self)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean duration in milliseconds."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bucket bound below which a share q of samples fall.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Bucket bound in milliseconds (the maximum for the overflow
+            bucket), or None without samples
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(LATENCY_BUCKETS_MS[index], self.max)
+                return self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary with quantiles and the non-empty buckets."""
+        mean = self.mean
+        buckets = {}
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                bound = (
+                    f"le_{LATENCY_BUCKETS_MS[index]}"
+                    if index < len(LATENCY_BUCKETS_MS)
+                    else "inf"
+                )
+                buckets[bound] = bucket_count
+        return {
+            "count": self.count,
+            "mean_ms": round(mean, 3) if mean is not None else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class _Timer:
+    """Context manager feeding one duration into a histogram."""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: LatencyHistogram) -> None:
+        """Initialize the timer for a histogram."""
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        """Start timing."""
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Record the elapsed time, also when the block raised."""
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class ZoneMetrics:
+    """Counters and latency histograms of one zone."""
+
+    __slots__ = (
+        "evaluation",
+        "refresh_triggers",
+        "evaluation_errors",
+        "auto_boosts",
+        "manual_boosts",
+    )
+
+    def __init__(self) -> None:
+        """Initialize all metrics at zero."""
+        self.evaluation = LatencyHistogram()
+        self.refresh_triggers = dict.fromkeys(REFRESH_SOURCES, 0)
+        self.evaluation_errors = 0
+        self.auto_boosts = 0
+        self.manual_boosts = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        return {
+            "evaluation": self.evaluation.as_dict(),
+            "refresh_triggers": dict(self.refresh_triggers),
+            "evaluation_errors": self.evaluation_errors,
+            "auto_boosts": self.auto_boosts,
+            "manual_boosts": self.manual_boosts,
+        }
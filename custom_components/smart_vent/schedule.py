@@ -0,0 +1,143 @@
+"""Time-of-day schedule for Smart Ventilation Controller.
+
+Schedule entries select a profile (speed overrides, auto-boost on or off)
+for a daily time window on some weekdays, e.g. quiet nights or a weekend
+profile. The entries are compiled once into a sorted weekly transition
+table: finding the active profile is a bisect on the second of the week,
+and the next transition tells the manager when to arm its single schedule
+timer, so nothing re-parses time rules on every tick.
+
+Lookups use local wall-clock time of an aware datetime (Home Assistant's
+configured time zone), and transition times are built from wall-clock
+dates, so a profile starting at 22:00 starts at 22:00 on both sides of a
+DST change.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any
+
+from .const import WEEKDAYS
+from .kernel import MODE_LABELS
+
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+# Name of the profile that applies outside all schedule entries
+DEFAULT_PROFILE = "default"
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    """Settings that apply while a schedule entry is active."""
+
+    name: str
+    speeds: tuple[int, int, int]
+    auto_boost: bool = True
+
+
+def _seconds(value: time) -> int:
+    """Return the seconds since midnight of a time of day."""
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+class ScheduleTable:
+    """Weekly transition table compiled from schedule entries."""
+
+    __slots__ = ("default", "_starts", "_profiles")
+
+    def __init__(
+        self, entries: Iterable[Mapping[str, Any]], speeds: Mapping[str, int]
+    ) -> None:
+        """Compile the schedule.
+
+        Entries may overlap; a later entry wins. An entry whose end is not
+        after its start runs past midnight (end equal to start: 24 hours).
+
+        Args:
+            entries: Schedule entries (name, days, start, end, speeds, auto_boost)
+            speeds: Zone speeds, used outside all entries and for every speed
+                an entry does not override
+        """
+        self.default = Profile(DEFAULT_PROFILE, tuple(speeds[label] for label in MODE_LABELS))
+
+        # Active windows as (start, length, profile) in seconds of the week
+        windows: list[tuple[int, int, Profile]] = []
+        for entry in entries:
+            overrides = entry.get("speeds") or {}
+            profile = Profile(
+                entry["name"],
+                tuple(overrides.get(label, speeds[label]) for label in MODE_LABELS),
+                entry.get("auto_boost", True),
+            )
+            start = _seconds(entry["start"])
+            length = (_seconds(entry["end"]) - start) % DAY_SECONDS or DAY_SECONDS
+            for day in entry.get("days") or WEEKDAYS:
+                windows.append((WEEKDAYS.index(day) * DAY_SECONDS + start, length, profile))
+
+        boundaries = {0}
+        for start, length, _ in windows:
+            boundaries.add(start % WEEK_SECONDS)
+            boundaries.add((start + length) % WEEK_SECONDS)
+
+        # One row per boundary with the last entry covering it; rows that do
+        # not change the profile are merged away
+        self._starts: list[int] = []
+        self._profiles: list[Profile] = []
+        for boundary in sorted(boundaries):
+            profile = self.default
+            for start, length, candidate in windows:
+                if (boundary - start) % WEEK_SECONDS < length:
+                    profile = candidate
+            if self._profiles and self._profiles[-1] is profile:
+                continue
+            self._starts.append(boundary)
+            self._profiles.append(profile)
+
+    def __len__(self) -> int:
+        """Return the number of rows in the transition table."""
+        return len(self._starts)
+
+    def profile_at(self, now: datetime) -> Profile:
+        """Return the profile active at a local time.
+
+        Args:
+            now: Aware datetime in the configured time zone
+        """
+        return self._profiles[bisect_right(self._starts, _second_of_week(now)) - 1]
+
+    def next_transition(self, now: datetime) -> datetime | None:
+        """Return when the active profile changes next, or None if it never does.
+
+        Args:
+            now: Aware datetime in the configured time zone
+        """
+        count = len(self._starts)
+        if count == 1:
+            return None
+
+        index = bisect_right(self._starts, _second_of_week(now)) - 1
+        current = self._profiles[index]
+        # The last row and the first one may hold the same profile across
+        # the week boundary, so look for the next row that differs
+        for step in range(1, count + 1):
+            row = (index + step) % count
+            if self._profiles[row] is not current:
+                break
+        offset = self._starts[row] + (WEEK_SECONDS if row <= index else 0)
+
+        week_start = now.date() - timedelta(days=now.weekday())
+        day, seconds = divmod(offset, DAY_SECONDS)
+        return datetime.combine(
+            week_start + timedelta(days=day),
+            time(seconds // 3600, seconds // 60 % 60, seconds % 60),
+            tzinfo=now.tzinfo,
+        )
+
+
+def _second_of_week(now: datetime) -> int:
+    """Return the local wall-clock second of the week (Monday 00:00 = 0)."""
+    return now.weekday() * DAY_SECONDS + now.hour * 3600 + now.minute * 60 + now.second
@@ -0,0 +1,349 @@
+"""Sensor platform for Smart Ventilation Controller."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    MATCH_ALL,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import clock
+from .budget import AirflowBudget
+from .coordinator import SmartVentCoordinator
+from .kernel import Mode
+
+_LOGGER = logging.getLogger(__name__)
+
+# How often the usage totals are brought up to date between decisions; the
+# states only change (and are written) once per whole minute or Wh
+USAGE_UPDATE_INTERVAL = timedelta(minutes=1)
+
+# How often the evaluation metrics are published; they change on nearly
+# every evaluation and would otherwise be written on every tick
+METRICS_UPDATE_INTERVAL = timedelta(minutes=5)
+
+# Decimal places of the published latencies, in milliseconds
+METRICS_PRECISION = 2
+
+
+def _zone_sensors(coordinator: SmartVentCoordinator) -> list[SensorEntity]:
+    """Return the diagnostic and statistics sensors of one zone."""
+    entities: list[SensorEntity] = [
+        SmartVentEvaluationTimeSensor(coordinator),
+        SmartVentSpeedSensor(coordinator),
+        *(SmartVentModeTimeSensor(coordinator, mode) for mode in Mode),
+    ]
+    if coordinator.usage.power_curve is not None:
+        entities.append(SmartVentEnergySensor(coordinator))
+    return entities
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: dict,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: dict | None = None,
+) -> None:
+    """Set up the Smart Vent sensor platform."""
+    if discovery_info is None:
+        return
+
+    manager = discovery_info["manager"]
+    zones = discovery_info["zones"]
+    entities: list[SensorEntity] = [
+        entity for coordinator in zones for entity in _zone_sensors(coordinator)
+    ]
+    if manager.budget is not None:
+        entities.append(SmartVentAirflowBudgetSensor(manager.budget))
+    async_add_entities(entities)
+    _LOGGER.info("Smart Vent sensors created for %d zone(s)", len(zones))
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the sensors of a config entry zone."""
+    async_add_entities(_zone_sensors(entry.runtime_data))
+
+
+class SmartVentEvaluationTimeSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor with the evaluation latency and zone counters.
+
+    The state is the 95th percentile evaluation time; the attributes carry
+    the refresh trigger counts, boost activations and fan write statistics.
+    Both change on nearly every evaluation, so they are published once per
+    METRICS_UPDATE_INTERVAL, and only if something changed.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+    # Counters change on every evaluation; keep them out of the recorder
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def __init__(self, coordinator: SmartVentCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        if coordinator.zone_name is None:
+            self._attr_name = "Smart Vent Evaluation Time"
+            self._attr_unique_id = "smart_vent_evaluation_time"
+        else:
+            self._attr_name = f"Smart Vent {coordinator.zone_name} Evaluation Time"
+            self._attr_unique_id = f"smart_vent_{coordinator.zone_id}_evaluation_time"
+        self._attr_extra_state_attributes = {}
+        self._last_available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Build the initial state and start the periodic publication."""
+        await super().async_added_to_hass()
+        self._async_update_attrs()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_periodic_update, METRICS_UPDATE_INTERVAL
+            )
+        )
+
+    def _async_update_attrs(self) -> bool:
+        """Rebuild the state and attributes from the zone metrics.
+
+        Returns:
+            True if the state or an attribute changed
+        """
+        metrics = self.coordinator.metrics
+        actuator = self.coordinator.actuator
+        evaluation = metrics.evaluation
+        write_latency = actuator.write_latency
+        p95 = evaluation.quantile(0.95)
+        value = round(p95, METRICS_PRECISION) if p95 is not None else None
+        attributes = {
+            "evaluations": evaluation.count,
+            "evaluation_mean_ms": (
+                round(evaluation.mean, METRICS_PRECISION) if evaluation.count else None
+            ),
+            "evaluation_max_ms": round(evaluation.max, METRICS_PRECISION),
+            "evaluation_errors": metrics.evaluation_errors,
+            **{f"refresh_{source}": count for source, count in metrics.refresh_triggers.items()},
+            "auto_boosts": metrics.auto_boosts,
+            "manual_boosts": metrics.manual_boosts,
+            "write_p95_ms": write_latency.quantile(0.95),
+            "write_max_ms": round(write_latency.max, METRICS_PRECISION),
+            "writes_sent": actuator.writes_sent,
+            "writes_suppressed": actuator.writes_suppressed,
+            "writes_failed": actuator.writes_failed,
+            "writes_dropped": actuator.writes_dropped,
+        }
+        if value == self._attr_native_value and attributes == self._attr_extra_state_attributes:
+            return False
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        return True
+
+    @callback
+    def _async_periodic_update(self, _now: datetime) -> None:
+        """Publish the metrics if they changed since the last publication."""
+        if self._async_update_attrs():
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the availability changed."""
+        available = self.available
+        if available != self._last_available:
+            self._last_available = available
+            self.async_write_ha_state()
+
+
+class SmartVentAirflowBudgetSensor(SensorEntity):
+    """Diagnostic sensor with the whole-house airflow budget in use.
+
+    The state is the airflow currently taken by boosting zones; the
+    attributes carry the queue and the granted/queued boost counters.
+    """
+
+    _attr_name = "Smart Vent Airflow Budget"
+    _attr_unique_id = "smart_vent_airflow_budget"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:air-filter"
+    _attr_should_poll = False
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def __init__(self, budget: AirflowBudget) -> None:
+        """Initialize the sensor."""
+        self._budget = budget
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state whenever the budget changes."""
+        self.async_on_remove(self._budget.async_add_listener(self._async_budget_changed))
+
+    @callback
+    def _async_budget_changed(self) -> None:
+        """Write the new budget state."""
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float:
+        """Return the airflow currently used by boosting zones."""
+        return round(self._budget.load, 3)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the queue and the boost counters."""
+        budget = self._budget
+        return {
+            "capacity": budget.capacity,
+            "peak_load": round(budget.peak_load, 3),
+            "queue_length": budget.queue_length,
+            "max_queue_length": budget.max_queue_length,
+            "requests": budget.requests,
+            "granted": budget.granted,
+            "queued": budget.queued,
+            "granted_from_queue": budget.granted_from_queue,
+            "withdrawn": budget.withdrawn,
+            "forced": budget.forced,
+            "wait_max_s": round(budget.wait_max, 1),
+        }
+
+
+class SmartVentUsageSensor(CoordinatorEntity, SensorEntity, ABC):
+    """Base class of the sensors that feed Home Assistant statistics.
+
+    The state is rebuilt after every evaluation and, for totals that grow
+    between decisions, once per USAGE_UPDATE_INTERVAL; it is only written
+    when it changed.
+    """
+
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+    # Totals grow between decisions and need the periodic update
+    _periodic = True
+
+    def __init__(self, coordinator: SmartVentCoordinator, key: str, name: str) -> None:
+        """Initialize the sensor.
+
+        Args:
+            coordinator: Zone coordinator
+            key: Suffix of the unique id
+            name: Suffix of the entity name
+        """
+        super().__init__(coordinator)
+        if coordinator.zone_name is None:
+            self._attr_name = f"Smart Vent {name}"
+            self._attr_unique_id = f"smart_vent_{key}"
+        else:
+            self._attr_name = f"Smart Vent {coordinator.zone_name} {name}"
+            self._attr_unique_id = f"smart_vent_{coordinator.zone_id}_{key}"
+        self._last_available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Build the initial state and start the periodic update."""
+        await super().async_added_to_hass()
+        self._attr_native_value = self._value()
+        if self._periodic:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass, self._async_periodic_update, USAGE_UPDATE_INTERVAL
+                )
+            )
+
+    @abstractmethod
+    def _value(self) -> float | int | None:
+        """Return the current state."""
+
+    @callback
+    def _async_periodic_update(self, _now: datetime) -> None:
+        """Bring a growing total up to date between decisions."""
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it or the availability changed."""
+        value = self._value()
+        available = self.available
+        if value != self._attr_native_value or available != self._last_available:
+            self._attr_native_value = value
+            self._last_available = available
+            self.async_write_ha_state()
+
+
+class SmartVentModeTimeSensor(SmartVentUsageSensor):
+    """Total time the zone spent in one mode, in whole minutes.
+
+    A total_increasing sensor: the long-term statistics show the minutes
+    per hour, day or month in each mode, e.g. boost minutes per day.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(self, coordinator: SmartVentCoordinator, mode: Mode) -> None:
+        """Initialize the sensor for one mode."""
+        super().__init__(coordinator, f"{mode.label}_time", f"{mode.label.title()} Time")
+        self._mode = mode
+
+    def _value(self) -> int:
+        """Return the whole minutes spent in the mode."""
+        return int(self.coordinator.usage.seconds_in(self._mode, clock.monotonic()) // 60)
+
+
+class SmartVentEnergySensor(SmartVentUsageSensor):
+    """Estimated fan energy from the target speed and the power curve.
+
+    Only created for zones with a power_curve. Can be added to the energy
+    dashboard as an individual device.
+    """
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_suggested_display_precision = 3
+
+    def __init__(self, coordinator: SmartVentCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, "energy", "Energy")
+
+    def _value(self) -> float:
+        """Return the energy in kWh, counted in whole Wh."""
+        return int(self.coordinator.usage.energy(clock.monotonic())) / 1000
+
+
+class SmartVentSpeedSensor(SmartVentUsageSensor):
+    """Target fan speed as a measurement.
+
+    The fan entity's speed is not kept in long-term statistics; this
+    sensor's hourly time-weighted mean is the fan's duty cycle.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_icon = "mdi:fan"
+    _periodic = False
+
+    def __init__(self, coordinator: SmartVentCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, "speed", "Fan Speed")
+
+    def _value(self) -> int:
+        """Return the target speed in percent."""
+        return self.coordinator.target_speed
@@ -0,0 +1,81 @@
+"""Persistent runtime state for Smart Ventilation Controller.
+
+Boost counters, active boosts and the last mode of every zone are kept in a
+single Home Assistant storage file, so a restart neither resets the daily
+boost limit nor loses a running boost.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.state"
+
+# Seconds at most between a change and its write; all changes in between
+# end up in one write
+SAVE_DELAY = 30
+
+
+class SmartVentStore:
+    """Load and save the runtime state of all zones in one storage file."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        snapshot: Callable[[], dict[str, dict[str, Any]]],
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            hass: Home Assistant instance
+            snapshot: Callable returning the current state of all zones,
+                keyed by zone id; called only when the file is written
+        """
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._snapshot = snapshot
+        # A write is armed and has not taken its snapshot yet
+        self._save_pending = False
+
+    async def async_load(self) -> dict[str, dict[str, Any]]:
+        """Load the stored zone states.
+
+        Returns:
+            Stored state per zone id (empty if nothing was stored yet)
+        """
+        try:
+            data = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.error("Failed to load stored Smart Vent state: %s", err)
+            return {}
+        return data or {}
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Make sure a write happens within SAVE_DELAY seconds.
+
+        Store.async_delay_save() restarts its delay on every call, and zones
+        call this after every evaluation, which may come more often than
+        SAVE_DELAY; the file would then only be written at shutdown. Only the
+        first call arms the write, later ones are covered by it.
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._async_write_data, SAVE_DELAY)
+
+    @callback
+    def _async_write_data(self) -> dict[str, dict[str, Any]]:
+        """Return the state to write; the next change arms a new write."""
+        self._save_pending = False
+        return self._snapshot()
@@ -0,0 +1,79 @@
+"""Per-zone decision tracing for Smart Ventilation Controller.
+
+Instead of several debug lines per evaluation, each evaluation can emit one
+compact decision record on the `custom_components.smart_vent.trace` logger.
+Which evaluations are traced is set per zone at runtime (set_trace
+service), and nothing is formatted unless that logger is enabled for debug.
+"""
+from __future__ import annotations
+
+import logging
+
+from .const import (
+    DEFAULT_TRACE_INTERVAL,
+    DEFAULT_TRACE_MODE,
+    TRACE_ALL,
+    TRACE_CHANGES,
+    TRACE_SAMPLED,
+)
+
+TRACE_LOGGER = logging.getLogger(f"{__package__}.trace")
+
+
+class DecisionTracer:
+    """Decide which evaluations of a zone produce a trace record.
+
+    Modes:
+    - off: never
+    - changes: evaluations that changed the zone state or sent a command
+    - sampled: changes, plus at most one unchanged evaluation per interval
+    - all: every evaluation
+    """
+
+    __slots__ = ("mode", "interval", "_last_record")
+
+    def __init__(
+        self, mode: str = DEFAULT_TRACE_MODE, interval: float = DEFAULT_TRACE_INTERVAL
+    ) -> None:
+        """Initialize the tracer.
+
+        Args:
+            mode: One of TRACE_MODES
+            interval: Seconds between sampled records of unchanged evaluations
+        """
+        self.mode = mode
+        self.interval = interval
+        self._last_record: float | None = None
+
+    def configure(self, mode: str, interval: float | None = None) -> None:
+        """Switch the trace mode at runtime."""
+        self.mode = mode
+        if interval is not None:
+            self.interval = interval
+        self._last_record = None
+
+    def enabled(self, changed: bool, now: float) -> bool:
+        """Return True if the current evaluation should be traced.
+
+        Cheap enough to call on every evaluation: the logger level is
+        checked first, so nothing else runs while debug logging is off.
+
+        Args:
+            changed: The evaluation changed the zone state or sent a command
+            now: Monotonic time of the evaluation
+        """
+        if not TRACE_LOGGER.isEnabledFor(logging.DEBUG):
+            return False
+
+        mode = self.mode
+        if mode == TRACE_ALL:
+            return True
+        if mode == TRACE_CHANGES:
+            return changed
+        if mode != TRACE_SAMPLED:
+            return False
+
+        if changed or self._last_record is None or now - self._last_record >= self.interval:
+            self._last_record = now
+            return True
+        return False
@@ -0,0 +1,141 @@
+"""Usage totals for Smart Ventilation Controller.
+
+The zone's mode and target speed are piecewise constant between decisions,
+so the time spent in each mode and the fan energy are integrated one
+segment at a time: every decision closes the running segment and adds its
+duration (and the energy at its speed) to the totals. Nothing is sampled
+and nothing is stored per segment.
+
+The totals are published as total_increasing sensors, from which Home
+Assistant compiles hourly long-term statistics, and are persisted with the
+zone state so they keep counting across restarts.
+
+Times are monotonic seconds passed in by the caller; the module never reads
+a clock.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Mapping
+from typing import Any
+
+from .kernel import MODE_LABELS, Mode
+
+
+class PowerCurve:
+    """Electrical power of the fan as a function of its speed.
+
+    The power is interpolated linearly between the configured points and
+    held constant below the first and above the last one.
+    """
+
+    __slots__ = ("_speeds", "_watts")
+
+    def __init__(self, points: Mapping[int, float]) -> None:
+        """Compile the curve.
+
+        Args:
+            points: Power in watts per speed percentage, at least one point
+        """
+        ordered = sorted(points.items())
+        self._speeds = [speed for speed, _ in ordered]
+        self._watts = [watts for _, watts in ordered]
+
+    def __call__(self, speed: float) -> float:
+        """Return the power in watts at a speed percentage."""
+        speeds = self._speeds
+        watts = self._watts
+        index = bisect_right(speeds, speed)
+        if index == 0:
+            return watts[0]
+        if index == len(speeds):
+            return watts[-1]
+        share = (speed - speeds[index - 1]) / (speeds[index] - speeds[index - 1])
+        return watts[index - 1] + (watts[index] - watts[index - 1]) * share
+
+
+class ZoneUsage:
+    """Time in each mode and estimated fan energy of one zone."""
+
+    __slots__ = ("mode_seconds", "energy_wh", "power_curve", "_since", "_mode", "_speed")
+
+    def __init__(self, power_curve: PowerCurve | None = None) -> None:
+        """Initialize all totals at zero.
+
+        Args:
+            power_curve: Fan power per speed; without one no energy is counted
+        """
+        self.mode_seconds = [0.0] * len(MODE_LABELS)
+        self.energy_wh = 0.0
+        self.power_curve = power_curve
+        # Start, mode and speed of the running segment
+        self._since: float | None = None
+        self._mode = Mode.LOW
+        self._speed = 0
+
+    def update(self, now: float, mode: Mode, speed: int) -> None:
+        """Close the running segment if the mode or speed changed.
+
+        The first call starts counting.
+
+        Args:
+            now: Current monotonic time
+            mode: Mode from now on
+            speed: Target speed from now on
+        """
+        if self._since is not None:
+            if mode == self._mode and speed == self._speed:
+                return
+            self._close(now)
+        self._since = now
+        self._mode = mode
+        self._speed = speed
+
+    def _close(self, now: float) -> None:
+        """Add the running segment up to now to the totals."""
+        seconds = max(0.0, now - self._since)
+        self.mode_seconds[self._mode] += seconds
+        if self.power_curve is not None:
+            self.energy_wh += self.power_curve(self._speed) * seconds / 3600
+        self._since = now
+
+    def seconds_in(self, mode: Mode, now: float) -> float:
+        """Return the total time in a mode, including the running segment."""
+        seconds = self.mode_seconds[mode]
+        if self._since is not None and mode == self._mode:
+            seconds += max(0.0, now - self._since)
+        return seconds
+
+    def energy(self, now: float) -> float:
+        """Return the total energy in Wh, including the running segment."""
+        energy = self.energy_wh
+        if self._since is not None and self.power_curve is not None:
+            energy += self.power_curve(self._speed) * max(0.0, now - self._since) / 3600
+        return energy
+
+    def power(self) -> float | None:
+        """Return the estimated power in watts at the current speed."""
+        if self.power_curve is None or self._since is None:
+            return None
+        return self.power_curve(self._speed)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the totals up to now, for the persisted zone state."""
+        return {
+            **{f"{mode.label}_seconds": self.seconds_in(mode, now) for mode in Mode},
+            "energy_wh": self.energy(now),
+        }
+
+    def restore(self, data: Mapping[str, Any]) -> None:
+        """Continue from totals returned by as_dict() before a restart.
+
+        Args:
+            data: Stored totals; missing or invalid values are left at zero
+        """
+        try:
+            for mode in Mode:
+                self.mode_seconds[mode] = float(data.get(f"{mode.label}_seconds", 0.0))
+            self.energy_wh = float(data.get("energy_wh", 0.0))
+        except (TypeError, ValueError):
+            self.mode_seconds = [0.0] * len(MODE_LABELS)
+            self.energy_wh = 0.0
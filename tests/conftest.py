@@ -0,0 +1,23 @@
+"""Test configuration.
+
+The tests cover the pure modules of the integration (kernel, filters,
+schedule, budget, ...), which do not use Home Assistant. Importing them the
+regular way would run the package __init__, which sets up the integration
+and imports Home Assistant, so the packages are registered here without
+executing it.
+"""
+from pathlib import Path
+import sys
+import types
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = ROOT / "custom_components" / "smart_vent"
+
+for name, path in (
+    ("custom_components", PACKAGE.parent),
+    ("custom_components.smart_vent", PACKAGE),
+):
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [str(path)]
+        sys.modules[name] = module
@@ -0,0 +1,166 @@
+"""Tests for the retry and backoff of the fan actuator worker."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.smart_vent import actuator as actuator_module  # noqa: E402
+from custom_components.smart_vent.actuator import (  # noqa: E402
+    MAX_RETRIES,
+    FanActuator,
+)
+
+ENTITY_ID = "fan.bathroom"
+
+
+class FakeHass:
+    """Home Assistant double with one fan whose service calls can fail.
+
+    Args:
+        failures: Number of service calls that raise before they succeed
+        on_call: Called with the percentage of every service call, before it
+            fails or succeeds
+    """
+
+    def __init__(self, failures=0, on_call=None):
+        self.failures = failures
+        self.on_call = on_call
+        self.calls = []
+        self.fan = SimpleNamespace(state="off", attributes={"percentage": 0})
+        self.states = SimpleNamespace(get=lambda entity_id: self.fan)
+        self.services = SimpleNamespace(async_call=self._async_call)
+
+    async def _async_call(self, domain, service, data, blocking=False):
+        percentage = data["percentage"]
+        self.calls.append(percentage)
+        if self.on_call is not None:
+            self.on_call(percentage)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("device did not answer")
+        self.fan = SimpleNamespace(state="on", attributes={"percentage": percentage})
+
+    def async_create_background_task(self, coro, name):
+        return asyncio.get_running_loop().create_task(coro, name=name)
+
+
+def make_actuator(hass, delays):
+    """Return an actuator that records its backoff delays instead of sleeping."""
+    actuator = FanActuator(hass, ENTITY_ID, resend_interval=0)
+    backoff = actuator._async_backoff
+
+    async def record_backoff(delay):
+        delays.append(delay)
+        return await backoff(0)
+
+    actuator._async_backoff = record_backoff
+    return actuator
+
+
+async def settle(actuator):
+    """Let the worker run until nothing is left to send."""
+    for _ in range(1000):
+        await asyncio.sleep(0)
+        if actuator._pending is None and not actuator._wake.is_set():
+            break
+    actuator.async_stop()
+
+
+def run(actuator, percentage):
+    async def scenario():
+        actuator.async_request(percentage)
+        await settle(actuator)
+
+    asyncio.run(scenario())
+
+
+def test_retries_until_write_succeeds():
+    delays = []
+    hass = FakeHass(failures=2)
+    actuator = make_actuator(hass, delays)
+    run(actuator, 40)
+
+    assert hass.calls == [40, 40, 40]
+    assert delays == [1, 2]
+    assert (actuator.writes_sent, actuator.writes_failed, actuator.writes_dropped) == (1, 2, 0)
+    assert actuator.last_commanded == 40
+
+
+def test_drops_command_after_max_retries():
+    delays = []
+    hass = FakeHass(failures=100)
+    actuator = make_actuator(hass, delays)
+    run(actuator, 40)
+
+    assert len(hass.calls) == MAX_RETRIES + 1
+    assert delays == [1, 2, 4, 8, 16]
+    assert (actuator.writes_sent, actuator.writes_failed, actuator.writes_dropped) == (
+        0,
+        MAX_RETRIES + 1,
+        1,
+    )
+    assert actuator.last_commanded is None
+    assert actuator._pending is None
+
+
+def test_backoff_is_capped(monkeypatch):
+    monkeypatch.setattr(actuator_module, "MAX_RETRIES", 8)
+    monkeypatch.setattr(actuator_module, "BACKOFF_MAX", 30)
+    delays = []
+    actuator = make_actuator(FakeHass(failures=100), delays)
+    run(actuator, 40)
+
+    assert delays == [1, 2, 4, 8, 16, 30, 30, 30]
+    assert actuator.writes_dropped == 1
+
+
+def test_newer_command_cuts_backoff_short():
+    delays = []
+    hass = FakeHass(failures=3)
+    actuator = make_actuator(hass, delays)
+    backoff = actuator._async_backoff
+
+    async def backoff_with_request(delay):
+        if len(delays) == 1:
+            # The user picks another speed during the second backoff
+            actuator.async_request(70)
+        return await backoff(delay)
+
+    actuator._async_backoff = backoff_with_request
+    run(actuator, 40)
+
+    assert hass.calls == [40, 40, 70, 70]
+    # The newer command starts again at the first retry delay
+    assert delays == [1, 2, 1]
+    assert (actuator.writes_sent, actuator.writes_failed, actuator.writes_dropped) == (1, 3, 0)
+    assert actuator.last_commanded == 70
+
+
+def test_command_replaced_during_successful_write_is_sent():
+    delays = []
+    hass = FakeHass()
+    actuator = make_actuator(hass, delays)
+    hass.on_call = lambda percentage: percentage == 40 and actuator.async_request(80)
+    run(actuator, 40)
+
+    assert hass.calls == [40, 80]
+    assert delays == []
+    assert actuator.writes_sent == 2
+    assert actuator.last_commanded == 80
+    assert actuator._pending is None
+
+
+def test_command_replaced_during_failed_write_is_sent_without_backoff():
+    delays = []
+    hass = FakeHass(failures=1)
+    actuator = make_actuator(hass, delays)
+    hass.on_call = lambda percentage: percentage == 40 and actuator.async_request(80)
+    run(actuator, 40)
+
+    # The backoff after the failed write ends at once, the retry sends 80
+    assert hass.calls == [40, 80]
+    assert delays == [1]
+    assert (actuator.writes_sent, actuator.writes_failed, actuator.writes_dropped) == (1, 1, 0)
+    assert actuator.last_commanded == 80
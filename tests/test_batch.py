@@ -0,0 +1,45 @@
+"""Cross-check of the vectorized batch evaluator against the scalar kernel."""
+import pytest
+
+pytest.importorskip("numpy")
+
+from custom_components.smart_vent.batch import (  # noqa: E402
+    BatchEvaluator,
+    CrossCheckError,
+    cross_check,
+)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_batch_matches_kernel(seed):
+    evaluations, _, _ = cross_check(zones=50, steps=100, seed=seed)
+    assert evaluations == 50 * 100
+
+
+def _ignore_recovery(evaluate):
+    """Batch update that never ends a closed-loop boost early."""
+
+    def broken(self, now, day, switch_mode, boost_trigger=False, humidity_recovered=False):
+        return evaluate(self, now, day, switch_mode, boost_trigger, False)
+
+    return broken
+
+
+def _no_daily_reset(evaluate):
+    """Batch update that never resets the daily boost counter."""
+
+    def broken(self, now, day, switch_mode, boost_trigger=False, humidity_recovered=False):
+        self.day[:] = day
+        return evaluate(self, now, day, switch_mode, boost_trigger, humidity_recovered)
+
+    return broken
+
+
+@pytest.mark.parametrize("bug", [_ignore_recovery, _no_daily_reset])
+def test_cross_check_detects_broken_batch_update(monkeypatch, bug):
+    monkeypatch.setattr(BatchEvaluator, "evaluate", bug(BatchEvaluator.evaluate))
+
+    with pytest.raises(CrossCheckError) as excinfo:
+        cross_check(zones=50, steps=100, seed=0)
+    assert excinfo.value.mismatches
+    assert all(mismatch.startswith("zone ") for mismatch in excinfo.value.mismatches)
@@ -0,0 +1,99 @@
+"""Tests for the whole-house airflow budget."""
+from custom_components.smart_vent.budget import AirflowBudget
+
+
+def make_budget(capacity=2.0):
+    woken = []
+    return AirflowBudget(capacity, woken.append), woken
+
+
+def test_requests_granted_while_they_fit():
+    budget, woken = make_budget()
+    assert budget.request("a", 1.0, 10.0, 0.0)
+    assert budget.request("b", 1.0, 5.0, 0.0)
+    assert budget.load == 2.0
+    # Asking again while holding a share is granted
+    assert budget.request("a", 1.0, 10.0, 1.0)
+    assert budget.granted == 2
+    assert woken == []
+
+
+def test_queue_is_served_by_severity_then_arrival():
+    budget, woken = make_budget(capacity=1.0)
+    assert budget.request("a", 1.0, 5.0, 0.0)
+    assert not budget.request("low", 1.0, 3.0, 10.0)
+    assert not budget.request("high", 1.0, 9.0, 20.0)
+    assert not budget.request("high_later", 1.0, 9.0, 30.0)
+    assert budget.queue_length == 3
+
+    budget.update("a", False, 1.0, 100.0)
+    assert woken == ["high"]
+    budget.update("high", True, 1.0, 100.0)
+    budget.update("high", False, 1.0, 200.0)
+    assert woken == ["high", "high_later"]
+    budget.update("high_later", False, 1.0, 300.0)
+    assert woken == ["high", "high_later", "low"]
+
+    assert budget.granted_from_queue == 3
+    assert budget.wait_max == 290.0
+
+
+def test_severity_change_moves_a_waiting_zone():
+    budget, woken = make_budget(capacity=1.0)
+    budget.request("a", 1.0, 5.0, 0.0)
+    budget.request("b", 1.0, 3.0, 0.0)
+    budget.request("c", 1.0, 4.0, 0.0)
+    # Humidity in b rises above c
+    assert not budget.request("b", 1.0, 8.0, 10.0)
+    budget.update("a", False, 1.0, 20.0)
+    assert woken == ["b"]
+
+
+def test_large_request_blocks_smaller_ones_behind_it():
+    budget, woken = make_budget(capacity=2.0)
+    budget.request("a", 1.0, 5.0, 0.0)
+    assert not budget.request("big", 2.0, 9.0, 0.0)
+    # Would fit, but waits behind the more severe request
+    assert not budget.request("small", 1.0, 1.0, 0.0)
+
+    budget.update("a", False, 1.0, 10.0)
+    assert woken == ["big"]
+    assert budget.load == 2.0
+
+
+def test_request_larger_than_capacity_runs_alone():
+    budget, woken = make_budget(capacity=1.0)
+    assert budget.request("huge", 3.0, 1.0, 0.0)
+    assert budget.load == 3.0
+
+
+def test_withdraw_unblocks_the_queue():
+    budget, woken = make_budget(capacity=2.0)
+    budget.request("a", 1.0, 5.0, 0.0)
+    budget.request("big", 2.0, 9.0, 0.0)
+    budget.request("small", 1.0, 1.0, 0.0)
+    budget.withdraw("big", 10.0)
+    assert woken == ["small"]
+    assert budget.withdrawn == 1
+    assert budget.queue_length == 0
+
+
+def test_forced_boost_counts_against_the_budget():
+    budget, woken = make_budget(capacity=1.0)
+    budget.update("manual", True, 1.0, 0.0)
+    assert budget.forced == 1
+    assert not budget.request("auto", 1.0, 9.0, 0.0)
+    budget.update("manual", False, 1.0, 60.0)
+    assert woken == ["auto"]
+    assert budget.load == 1.0
+
+
+def test_listeners_are_notified():
+    budget, _ = make_budget()
+    calls = []
+    remove = budget.async_add_listener(lambda: calls.append(budget.load))
+    budget.request("a", 1.0, 1.0, 0.0)
+    budget.update("a", False, 1.0, 1.0)
+    remove()
+    budget.request("b", 1.0, 1.0, 2.0)
+    assert calls == [1.0, 0.0]
@@ -0,0 +1,70 @@
+"""Tests for the switch input decoder."""
+from custom_components.smart_vent.decoder import INVALID, SwitchDecoder, pattern_index
+from custom_components.smart_vent.kernel import Mode
+
+POSITIONS = {"00": "low", "10": "mid", "01": "boost"}
+
+
+def test_pattern_index_uses_input_order():
+    assert pattern_index("00") == 0
+    assert pattern_index("10") == 1
+    assert pattern_index("01") == 2
+    assert pattern_index("0011") == 12
+
+
+def test_index_of_states():
+    decoder = SwitchDecoder(2, POSITIONS)
+    assert decoder.index(["off", "off"]) == 0
+    assert decoder.index(["on", "off"]) == 1
+    assert decoder.index(["off", "unavailable"]) == INVALID
+    assert decoder.index(["on", None]) == INVALID
+
+
+def test_first_combination_is_adopted_right_away():
+    decoder = SwitchDecoder(2, POSITIONS, settle_time=1.0)
+    assert decoder.update(pattern_index("10"), 0.0)
+    assert decoder.mode() == Mode.MID
+
+
+def test_unmapped_and_invalid_combinations_have_no_mode():
+    decoder = SwitchDecoder(2, POSITIONS)
+    decoder.update(pattern_index("11"), 0.0)
+    assert decoder.mode() is None
+    decoder.update(INVALID, 1.0)
+    assert decoder.mode() is None
+    assert decoder.pattern(decoder.position) is None
+
+
+def test_transient_combination_is_ignored():
+    decoder = SwitchDecoder(2, POSITIONS, settle_time=1.5)
+    decoder.update(pattern_index("10"), 0.0)
+
+    # Moving from mid to boost passes through 00 (low) for a moment
+    assert not decoder.update(pattern_index("00"), 10.0)
+    assert decoder.settle_deadline() == 11.5
+    assert not decoder.update(pattern_index("01"), 10.3)
+    assert decoder.settle_deadline() == 11.8
+    assert decoder.mode() == Mode.MID
+
+    assert decoder.update(pattern_index("01"), 11.8)
+    assert decoder.mode() == Mode.BOOST
+    assert decoder.settle_deadline() is None
+
+
+def test_return_to_adopted_position_cancels_candidate():
+    decoder = SwitchDecoder(2, POSITIONS, settle_time=1.0)
+    decoder.update(pattern_index("10"), 0.0)
+    decoder.update(pattern_index("00"), 5.0)
+    assert not decoder.update(pattern_index("10"), 5.5)
+    assert decoder.settle_deadline() is None
+    assert decoder.mode() == Mode.MID
+
+
+def test_more_positions():
+    positions = {"000": "low", "100": "mid", "010": "mid", "001": "boost"}
+    decoder = SwitchDecoder(3, positions)
+    assert decoder.update(decoder.index(["off", "on", "off"]), 0.0)
+    assert decoder.mode() == Mode.MID
+    assert decoder.pattern(decoder.position) == "010"
+    assert decoder.update(decoder.index(["off", "off", "on"]), 1.0)
+    assert decoder.mode() == Mode.BOOST
@@ -0,0 +1,140 @@
+"""Tests for the humidity input filters and their fusion."""
+from custom_components.smart_vent.filters import MEDIAN_CONFIRM_TIME, InputFilter
+from custom_components.smart_vent.fusion import HumidityFusion
+from custom_components.smart_vent.humidity import HumidityHistory
+from custom_components.smart_vent.kernel import (
+    BoostKind,
+    KernelConfig,
+    Mode,
+    ZoneInputs,
+    ZoneState,
+    decide,
+)
+
+SENSOR = "sensor.bathroom_humidity"
+
+# Same rule as the coordinator's delta trigger with the default delta
+DELTA = 10
+
+
+def test_first_reading_passes():
+    input_filter = InputFilter(deadband=1.0, min_interval=60)
+    assert input_filter.add(55.0, 0.0)
+    assert input_filter.value == 55.0
+
+
+def test_deadband_drops_jitter():
+    input_filter = InputFilter(deadband=1.0)
+    input_filter.add(55.0, 0.0)
+    assert not input_filter.add(55.5, 10.0)
+    assert input_filter.held is None
+    # A change of exactly the deadband passes despite float rounding
+    assert input_filter.add(56.0, 20.0)
+    assert input_filter.value == 56.0
+
+
+def test_rate_limited_step_is_released():
+    input_filter = InputFilter(min_interval=60)
+    input_filter.add(55.0, 0.0)
+
+    assert not input_filter.add(85.0, 10.0)
+    assert input_filter.value == 55.0
+    assert input_filter.held == 85.0
+    assert input_filter.held_until == 60.0
+
+    assert not input_filter.release(30.0)
+    assert input_filter.release(60.0)
+    assert input_filter.value == 85.0
+    assert input_filter.accepted_at == 60.0
+    assert input_filter.held is None
+
+
+def test_newer_reading_replaces_held_one():
+    input_filter = InputFilter(min_interval=60)
+    input_filter.add(55.0, 0.0)
+    input_filter.add(70.0, 10.0)
+    input_filter.add(85.0, 20.0)
+    assert input_filter.held == 85.0
+    assert input_filter.held_until == 60.0
+
+
+def test_median_step_is_confirmed():
+    input_filter = InputFilter(median=3)
+    for timestamp in (0.0, 10.0):
+        input_filter.add(55.0, timestamp)
+
+    # 55, 55, 85: the median still says 55
+    assert not input_filter.add(85.0, 20.0)
+    assert input_filter.held == 85.0
+    assert input_filter.held_until == 20.0 + MEDIAN_CONFIRM_TIME
+
+    assert not input_filter.release(20.0 + MEDIAN_CONFIRM_TIME - 1)
+    assert input_filter.release(20.0 + MEDIAN_CONFIRM_TIME)
+    assert input_filter.value == 85.0
+    # The window starts over from the released value, so the next report
+    # of the same humidity is not a change
+    assert not input_filter.add(85.0, 100.0)
+
+
+def test_median_spike_is_discarded():
+    input_filter = InputFilter(median=3)
+    for timestamp in (0.0, 10.0):
+        input_filter.add(55.0, timestamp)
+    input_filter.add(95.0, 20.0)
+    assert input_filter.held == 95.0
+
+    assert not input_filter.add(55.0, 30.0)
+    assert input_filter.held is None
+    assert not input_filter.release(1000.0)
+    assert input_filter.value == 55.0
+
+
+def test_stale_value_passes_unfiltered():
+    input_filter = InputFilter(deadband=5.0, min_interval=60, stale_timeout=300)
+    input_filter.add(55.0, 0.0)
+    assert input_filter.is_stale(301.0)
+    assert input_filter.add(56.0, 400.0)
+    assert input_filter.value == 56.0
+
+
+def test_unavailable_source_drops_held_reading():
+    fusion = HumidityFusion([SENSOR], filter_options={"min_interval": 60})
+    fusion.add(SENSOR, 55.0, 0.0)
+    fusion.add(SENSOR, 85.0, 10.0)
+    assert fusion.next_release() == 60.0
+
+    fusion.mark_unavailable(SENSOR)
+    assert fusion.next_release() is None
+
+
+def test_held_step_starts_boost_after_release():
+    """Replay a shower step the rate limit holds back until the zone deadline."""
+    fusion = HumidityFusion([SENSOR], filter_options={"min_interval": 60})
+    history = HumidityHistory(10)
+    config = KernelConfig(speeds=(20, 50, 100), max_boosts_per_day=5, auto_boost_duration=900)
+    state = ZoneState(mode=Mode.MID, day=1, last_switch_mode=Mode.MID)
+
+    def evaluate(now: float) -> ZoneState:
+        if fusion.release(now):
+            history.add(fusion.value, now)
+        trigger = history.ewma - history.baseline >= DELTA
+        inputs = ZoneInputs(now=now, day=1, switch_mode=Mode.MID, boost_trigger=trigger)
+        return decide(config, state, inputs)[0]
+
+    assert fusion.add(SENSOR, 55.0, 0.0)
+    history.add(fusion.value, 0.0)
+    state = evaluate(0.0)
+
+    # The step arrives inside the rate limit and the sensor stays at 85
+    assert not fusion.add(SENSOR, 85.0, 10.0)
+    state = evaluate(10.0)
+    assert state.boost_kind == BoostKind.NONE
+
+    # The zone deadline fires when the held reading is due
+    release_at = fusion.next_release()
+    assert release_at == 60.0
+    state = evaluate(release_at)
+    assert fusion.value == 85.0
+    assert state.boost_kind == BoostKind.AUTO
+    assert state.mode == Mode.BOOST
+    assert state.boost_start == release_at
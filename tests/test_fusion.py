@@ -0,0 +1,76 @@
+"""Tests for multi-sensor humidity fusion."""
+import pytest
+
+from custom_components.smart_vent.const import (
+    FUSION_FALLBACK,
+    FUSION_MAX,
+    FUSION_MEDIAN,
+    FUSION_WEIGHTED,
+)
+from custom_components.smart_vent.fusion import HumidityFusion
+
+SENSORS = ["sensor.a", "sensor.b", "sensor.c"]
+NO_FILTER = {"deadband": 0.0, "min_interval": 0, "median": 1, "stale_timeout": 0}
+
+
+def fused(policy, readings, **kwargs):
+    fusion = HumidityFusion(SENSORS, policy, filter_options=NO_FILTER, **kwargs)
+    for entity_id, value in readings.items():
+        fusion.add(entity_id, value, 0.0)
+    return fusion
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected"),
+    [(FUSION_MAX, 80.0), (FUSION_MEDIAN, 60.0), (FUSION_WEIGHTED, 67.5), (FUSION_FALLBACK, 50.0)],
+)
+def test_policies(policy, expected):
+    fusion = fused(
+        policy,
+        {"sensor.a": 50.0, "sensor.b": 60.0, "sensor.c": 80.0},
+        weights=[1.0, 1.0, 2.0],
+    )
+    assert fusion.value == pytest.approx(expected)
+
+
+def test_unavailable_source_drops_out():
+    fusion = fused(FUSION_MAX, {"sensor.a": 50.0, "sensor.b": 60.0, "sensor.c": 80.0})
+    assert fusion.mark_unavailable("sensor.c")
+    assert fusion.value == 60.0
+
+    fusion = fused(FUSION_FALLBACK, {"sensor.a": 50.0, "sensor.b": 60.0})
+    fusion.mark_unavailable("sensor.a")
+    assert fusion.value == 60.0
+
+
+def test_weighted_mean_after_all_sources_leave():
+    fusion = fused(FUSION_WEIGHTED, {"sensor.a": 50.0, "sensor.b": 70.0})
+    assert fusion.value == 60.0
+    fusion.mark_unavailable("sensor.a")
+    fusion.mark_unavailable("sensor.b")
+    assert fusion.value is None
+    fusion.add("sensor.a", 40.0, 1.0)
+    assert fusion.value == 40.0
+
+
+def test_stale_source_expires_on_refresh():
+    options = {**NO_FILTER, "stale_timeout": 300}
+    fusion = HumidityFusion(SENSORS[:2], FUSION_MAX, filter_options=options)
+    reports = {"sensor.a": (50.0, 0.0), "sensor.b": (70.0, 0.0)}
+    assert fusion.refresh(0.0, reports.get)
+    assert fusion.value == 70.0
+    assert fusion.next_check() == 300.0
+
+    # sensor.a keeps reporting the same value, sensor.b went silent
+    reports["sensor.a"] = (50.0, 250.0)
+    assert not fusion.refresh(100.0, reports.get)
+    assert fusion.refresh(301.0, reports.get)
+    assert fusion.value == 50.0
+    assert fusion.next_check() == 550.0
+
+
+def test_unchanged_fused_value_is_not_a_change():
+    fusion = fused(FUSION_MAX, {"sensor.a": 50.0, "sensor.b": 80.0})
+    assert not fusion.add("sensor.a", 55.0, 1.0)
+    assert fusion.add("sensor.b", 75.0, 1.0)
+    assert fusion.value == 75.0
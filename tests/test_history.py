@@ -0,0 +1,119 @@
+"""Tests for the decision history ring buffer and its export."""
+import csv
+
+import pytest
+
+from custom_components.smart_vent.const import (
+    EXPORT_CSV,
+    EXPORT_PARQUET,
+    HISTORY_AUTO_BOOST,
+    HISTORY_SWITCH,
+    HISTORY_TRIGGERS,
+)
+from custom_components.smart_vent.history import (
+    RECORD,
+    DecisionHistory,
+    export,
+    iter_chunks,
+)
+from custom_components.smart_vent.kernel import BoostKind, Mode
+
+
+def append(history, timestamp, **kwargs):
+    record = {
+        "trigger": HISTORY_SWITCH,
+        "inputs": 1,
+        "switch_mode": Mode.MID,
+        "humidity": 55.5,
+        "old_mode": Mode.LOW,
+        "new_mode": Mode.MID,
+        "boost": BoostKind.NONE,
+        "speed": 50,
+        "boosts_today": 0,
+        **kwargs,
+    }
+    history.append(timestamp, **record)
+
+
+def rows(history, input_count=2):
+    return [row for chunk in iter_chunks(history.snapshot(), "bath", input_count) for row in chunk]
+
+
+def test_records_are_decoded():
+    history = DecisionHistory(4)
+    append(history, 1_700_000_000.0)
+    append(
+        history,
+        1_700_000_060.0,
+        trigger=HISTORY_AUTO_BOOST,
+        inputs=None,
+        switch_mode=None,
+        humidity=None,
+        old_mode=Mode.MID,
+        new_mode=Mode.BOOST,
+        boost=BoostKind.AUTO,
+        speed=100,
+        boosts_today=1,
+    )
+    assert len(history) == 2
+    assert len(history.snapshot()) == 2 * RECORD.size
+
+    first, second = rows(history)
+    assert first[1:] == ("bath", "switch", "10", "mid", 55.5, "low", "mid", "none", 50, 0)
+    assert first[0].timestamp() == 1_700_000_000.0
+    assert second[1:] == ("bath", "auto_boost", None, None, None, "mid", "boost", "auto", 100, 1)
+
+
+def test_every_trigger_is_decoded():
+    history = DecisionHistory(len(HISTORY_TRIGGERS))
+    for second, trigger in enumerate(HISTORY_TRIGGERS):
+        append(history, float(second), trigger=trigger)
+    assert [row[2] for row in rows(history)] == list(HISTORY_TRIGGERS)
+
+
+def test_ring_buffer_keeps_the_newest_records():
+    history = DecisionHistory(3)
+    for second in range(5):
+        append(history, float(second), speed=second)
+    assert len(history) == 3
+    assert [row[9] for row in rows(history)] == [2, 3, 4]
+
+    history.clear()
+    assert len(history) == 0
+    assert history.snapshot() == b""
+
+
+def test_size_zero_disables_the_history():
+    history = DecisionHistory(0)
+    append(history, 0.0)
+    assert len(history) == 0
+
+
+def test_boost_counter_is_capped():
+    history = DecisionHistory(1)
+    append(history, 0.0, boosts_today=1000)
+    assert rows(history)[0][10] == 255
+
+
+def test_export_csv(tmp_path):
+    history = DecisionHistory(10)
+    for second in range(3):
+        append(history, float(second))
+    path = tmp_path / "nested" / "bath.csv"
+    export(str(path), EXPORT_CSV, history.snapshot(), "bath", 2)
+
+    with open(path, newline="", encoding="utf-8") as file:
+        lines = list(csv.reader(file))
+    assert lines[0][:3] == ["time", "zone", "trigger"]
+    assert len(lines) == 4
+    assert lines[1][0] == "1970-01-01T00:00:00+00:00"
+
+
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    history = DecisionHistory(10)
+    for second in range(3):
+        append(history, float(second))
+    path = tmp_path / "bath.parquet"
+    export(str(path), EXPORT_PARQUET, history.snapshot(), "bath", 2)
+    assert pq.read_table(path).num_rows == 3
@@ -0,0 +1,52 @@
+"""Tests for the rolling humidity statistics."""
+import numpy as np
+import pytest
+
+from custom_components.smart_vent.humidity import HumidityHistory
+
+
+def test_slope_matches_least_squares_across_wraps():
+    history = HumidityHistory(5)
+    times = [10.0 * i for i in range(23)]
+    values = [50 + 0.3 * i + (-1) ** i * 0.2 for i in range(23)]
+    for timestamp, value in zip(times, values):
+        history.add(value, timestamp)
+
+    expected = np.polyfit(times[-5:], values[-5:], 1)[0] * 60
+    assert len(history) == 5
+    assert history.slope == pytest.approx(expected)
+    assert history.mean == pytest.approx(np.mean(values[-5:]))
+
+
+def test_plateau_slope_expires():
+    history = HumidityHistory(12, max_age=600)
+    # A shower: humidity rises by 2% per minute, then the sensor stays at 85
+    for minute in range(6):
+        history.add(75 + 2 * minute, minute * 60.0)
+    assert history.slope == pytest.approx(2.0)
+
+    history.expire(600.0)
+    assert history.slope == pytest.approx(2.0)
+
+    # Ten minutes after the last rise no sample is left for a trend
+    history.expire(300.0 + 601)
+    assert len(history) == 0
+    assert history.slope is None
+    assert history.ewma > 80
+
+
+def test_expire_keeps_sums_consistent():
+    history = HumidityHistory(4, max_age=100)
+    for i in range(10):
+        history.add(50.0 + i, i * 30.0)
+        history.expire(i * 30.0)
+
+    # Samples of the last 100 seconds: 180..270
+    times = [180.0, 210.0, 240.0, 270.0]
+    values = [56.0, 57.0, 58.0, 59.0]
+    assert len(history) == 4
+    assert history.slope == pytest.approx(np.polyfit(times, values, 1)[0] * 60)
+
+    history.expire(330.0)
+    assert len(history) == 2
+    assert history.mean == pytest.approx(58.5)
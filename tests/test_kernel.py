@@ -0,0 +1,164 @@
+"""Tests for the zone decision kernel."""
+import pytest
+
+from custom_components.smart_vent.kernel import (
+    NO_COMMANDS,
+    BoostKind,
+    KernelConfig,
+    Mode,
+    ZoneInputs,
+    ZoneState,
+    decide,
+    force_boost,
+    min_boost_end,
+    set_mode,
+)
+
+SPEEDS = (20, 50, 100)
+CONFIG = KernelConfig(speeds=SPEEDS, max_boosts_per_day=2, auto_boost_duration=1200)
+CLOSED_LOOP = KernelConfig(
+    speeds=SPEEDS,
+    max_boosts_per_day=2,
+    auto_boost_duration=1200,
+    closed_loop=True,
+    min_boost_duration=600,
+    max_boost_duration=3600,
+)
+
+
+def inputs(now=0.0, day=1, switch=Mode.MID, **kwargs):
+    return ZoneInputs(now=now, day=day, switch_mode=switch, **kwargs)
+
+
+def mid_state(**kwargs):
+    return ZoneState(mode=Mode.MID, day=1, last_switch_mode=Mode.MID, **kwargs)
+
+
+@pytest.mark.parametrize("switch", list(Mode))
+def test_switch_selects_mode(switch):
+    state, commands = decide(CONFIG, ZoneState(), inputs(switch=switch))
+    assert state.mode == switch
+    assert commands == (() if switch == Mode.LOW else (SPEEDS[switch],))
+
+
+def test_unchanged_evaluation_returns_same_state():
+    state = mid_state()
+    new_state, commands = decide(CONFIG, state, inputs(now=10.0))
+    assert new_state is state
+    assert commands == NO_COMMANDS
+
+
+def test_auto_boost_runs_for_its_duration():
+    state, commands = decide(CONFIG, mid_state(), inputs(now=100.0, boost_trigger=True))
+    assert state.mode == Mode.BOOST
+    assert state.boost_kind == BoostKind.AUTO
+    assert (state.boost_start, state.boost_end) == (100.0, 1300.0)
+    assert state.boost_count == 1
+    assert commands == (100,)
+
+    # The trigger going away does not end a fixed-duration boost
+    state, commands = decide(CONFIG, state, inputs(now=1299.0))
+    assert state.boost_kind == BoostKind.AUTO
+    assert commands == NO_COMMANDS
+
+    state, commands = decide(CONFIG, state, inputs(now=1300.0))
+    assert state.mode == Mode.MID
+    assert state.boost_kind == BoostKind.NONE
+    assert state.boost_end is None
+    assert commands == (50,)
+
+
+def test_daily_limit_and_reset():
+    state = mid_state(boost_count=2)
+    state, commands = decide(CONFIG, state, inputs(boost_trigger=True))
+    assert state.boost_kind == BoostKind.NONE
+    assert commands == NO_COMMANDS
+
+    # A new day resets the counter
+    state, _ = decide(CONFIG, state, inputs(day=2, boost_trigger=True))
+    assert state.boost_kind == BoostKind.AUTO
+    assert (state.day, state.boost_count) == (2, 1)
+
+
+@pytest.mark.parametrize("switch", [Mode.LOW, Mode.BOOST])
+def test_switch_cancels_auto_boost(switch):
+    state, _ = decide(CONFIG, mid_state(), inputs(boost_trigger=True))
+    state, commands = decide(CONFIG, state, inputs(now=10.0, switch=switch))
+    assert state.boost_kind == BoostKind.NONE
+    assert state.mode == switch
+    assert commands == (() if switch == Mode.BOOST else (20,))
+
+
+def test_no_auto_boost_outside_mid():
+    state = ZoneState(day=1, last_switch_mode=Mode.LOW)
+    state, _ = decide(CONFIG, state, inputs(switch=Mode.LOW, boost_trigger=True))
+    assert state.boost_kind == BoostKind.NONE
+    assert state.mode == Mode.LOW
+
+
+def test_manual_boost_returns_to_previous_mode():
+    state = ZoneState(mode=Mode.LOW, day=1, last_switch_mode=Mode.LOW)
+    state, commands = force_boost(CONFIG, state, 0.0)
+    assert state.boost_kind == BoostKind.MANUAL
+    assert state.mode_before_boost == Mode.LOW
+    assert commands == (100,)
+    # Does not count against the daily limit
+    assert state.boost_count == 0
+
+    # Holds regardless of the switch while it stays put
+    state, commands = decide(CONFIG, state, inputs(now=600.0, switch=Mode.LOW))
+    assert state.boost_kind == BoostKind.MANUAL
+    assert commands == NO_COMMANDS
+
+    state, commands = decide(CONFIG, state, inputs(now=1200.0, switch=Mode.LOW))
+    assert state.mode == Mode.LOW
+    assert state.boost_kind == BoostKind.NONE
+    assert commands == (20,)
+
+
+def test_moving_the_switch_cancels_manual_boost():
+    state, _ = force_boost(CONFIG, mid_state(), 0.0)
+    state, commands = decide(CONFIG, state, inputs(now=10.0, switch=Mode.LOW))
+    assert state.boost_kind == BoostKind.NONE
+    assert state.mode == Mode.LOW
+    assert commands == (20,)
+
+
+def test_set_mode_cancels_boost():
+    state, _ = decide(CONFIG, mid_state(), inputs(boost_trigger=True))
+    state, commands = set_mode(CONFIG, state, Mode.LOW)
+    assert state.boost_kind == BoostKind.NONE
+    assert state.mode == Mode.LOW
+    assert commands == (20,)
+
+
+def test_closed_loop_ends_after_minimum_once_recovered():
+    state, _ = decide(CLOSED_LOOP, mid_state(), inputs(boost_trigger=True))
+    assert state.boost_end == 3600.0
+    assert min_boost_end(CLOSED_LOOP, state) == 600.0
+
+    # Recovered too early: the minimum duration holds
+    state, commands = decide(CLOSED_LOOP, state, inputs(now=300.0, humidity_recovered=True))
+    assert state.boost_kind == BoostKind.AUTO
+    assert commands == NO_COMMANDS
+
+    state, commands = decide(CLOSED_LOOP, state, inputs(now=600.0, humidity_recovered=True))
+    assert state.mode == Mode.MID
+    assert state.boost_kind == BoostKind.NONE
+    assert commands == (50,)
+
+
+def test_closed_loop_ends_at_maximum_without_recovery():
+    state, _ = decide(CLOSED_LOOP, mid_state(), inputs(boost_trigger=True))
+    state, _ = decide(CLOSED_LOOP, state, inputs(now=3599.0))
+    assert state.boost_kind == BoostKind.AUTO
+    state, commands = decide(CLOSED_LOOP, state, inputs(now=3600.0))
+    assert state.boost_kind == BoostKind.NONE
+    assert commands == (50,)
+
+
+def test_min_boost_end_only_for_closed_loop_auto_boost():
+    state, _ = decide(CONFIG, mid_state(), inputs(boost_trigger=True))
+    assert min_boost_end(CONFIG, state) is None
+    state, _ = force_boost(CLOSED_LOOP, mid_state(), 0.0)
+    assert min_boost_end(CLOSED_LOOP, state) is None
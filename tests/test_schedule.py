@@ -0,0 +1,108 @@
+"""Tests for the time-of-day schedule table."""
+from datetime import UTC, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from custom_components.smart_vent.schedule import DEFAULT_PROFILE, ScheduleTable
+
+TZ = ZoneInfo("Europe/Berlin")
+SPEEDS = {"low": 20, "mid": 50, "boost": 100}
+
+NIGHT = {
+    "name": "night",
+    "start": time(22, 0),
+    "end": time(7, 0),
+    "speeds": {"low": 15, "mid": 30},
+    "auto_boost": False,
+}
+WEEKEND = {
+    "name": "weekend",
+    "days": ["sat", "sun"],
+    "start": time(9, 0),
+    "end": time(23, 0),
+    "speeds": {"mid": 60},
+}
+
+
+def local(*args, fold=0):
+    return datetime(*args, tzinfo=TZ, fold=fold)
+
+
+def test_without_entries_default_always_applies():
+    table = ScheduleTable([], SPEEDS)
+    assert len(table) == 1
+    profile = table.profile_at(local(2026, 10, 14, 12, 0))
+    assert profile.name == DEFAULT_PROFILE
+    assert profile.speeds == (20, 50, 100)
+    assert table.next_transition(local(2026, 10, 14, 12, 0)) is None
+
+
+def test_entry_past_midnight():
+    table = ScheduleTable([NIGHT], SPEEDS)
+    # Wednesday 2026-10-14
+    assert table.profile_at(local(2026, 10, 14, 21, 59, 59)).name == DEFAULT_PROFILE
+    night = table.profile_at(local(2026, 10, 14, 22, 0))
+    assert night.name == "night"
+    assert night.speeds == (15, 30, 100)
+    assert not night.auto_boost
+    assert table.profile_at(local(2026, 10, 15, 6, 59)).name == "night"
+    assert table.profile_at(local(2026, 10, 15, 7, 0)).name == DEFAULT_PROFILE
+
+
+def test_later_entry_wins_overlap():
+    table = ScheduleTable([NIGHT, WEEKEND], SPEEDS)
+    # Saturday 2026-10-17: 22:00-23:00 is covered by both entries
+    assert table.profile_at(local(2026, 10, 17, 22, 30)).name == "weekend"
+    assert table.profile_at(local(2026, 10, 17, 23, 0)).name == "night"
+    assert table.next_transition(local(2026, 10, 17, 22, 30)) == local(2026, 10, 17, 23, 0)
+
+    table = ScheduleTable([WEEKEND, NIGHT], SPEEDS)
+    assert table.profile_at(local(2026, 10, 17, 22, 30)).name == "night"
+    # The weekend starts 2 hours after the night ends on Saturday
+    assert table.next_transition(local(2026, 10, 17, 3, 0)) == local(2026, 10, 17, 7, 0)
+    assert table.next_transition(local(2026, 10, 17, 7, 0)) == local(2026, 10, 17, 9, 0)
+
+
+def test_inner_entry_interrupts_outer_one():
+    late = {"name": "late", "start": time(23, 0), "end": time(1, 0), "speeds": {"mid": 40}}
+    table = ScheduleTable([NIGHT, late], SPEEDS)
+    names = [
+        table.profile_at(local(2026, 10, 14, 22, 30)).name,
+        table.profile_at(local(2026, 10, 14, 23, 30)).name,
+        table.profile_at(local(2026, 10, 15, 1, 30)).name,
+    ]
+    assert names == ["night", "late", "night"]
+    assert table.next_transition(local(2026, 10, 14, 22, 30)) == local(2026, 10, 14, 23, 0)
+    assert table.next_transition(local(2026, 10, 14, 23, 30)) == local(2026, 10, 15, 1, 0)
+
+
+def test_next_transition_wraps_the_week():
+    table = ScheduleTable([{**NIGHT, "days": ["sun"]}], SPEEDS)
+    # From Monday noon the next start is Sunday 22:00
+    assert table.next_transition(local(2026, 10, 12, 12, 0)) == local(2026, 10, 18, 22, 0)
+    # Sunday's night ends on Monday morning of the next week
+    assert table.next_transition(local(2026, 10, 18, 23, 0)) == local(2026, 10, 19, 7, 0)
+
+
+def test_spring_forward_keeps_wall_clock_times():
+    table = ScheduleTable([NIGHT], SPEEDS)
+    # Clocks go from 02:00 to 03:00 in the night to 2026-03-29
+    before = local(2026, 3, 29, 1, 30)
+    end = table.next_transition(before)
+    assert end == local(2026, 3, 29, 7, 0)
+    assert end.utcoffset() == timedelta(hours=2)
+    # Only 4.5 real hours pass until the night profile ends at 07:00
+    assert end.astimezone(UTC) - before.astimezone(UTC) == timedelta(hours=4, minutes=30)
+    assert table.profile_at(local(2026, 3, 29, 3, 30)).name == "night"
+
+
+def test_fall_back_keeps_wall_clock_times():
+    table = ScheduleTable([NIGHT], SPEEDS)
+    # Clocks go from 03:00 back to 02:00 in the night to 2026-10-25
+    start = local(2026, 10, 24, 22, 0)
+    end = table.next_transition(start + timedelta(minutes=1))
+    assert end == local(2026, 10, 25, 7, 0)
+    assert end.utcoffset() == timedelta(hours=1)
+    assert end.astimezone(UTC) - start.astimezone(UTC) == timedelta(hours=10)
+    # Both passes through 02:30 are in the night
+    assert table.profile_at(local(2026, 10, 25, 2, 30, fold=0)).name == "night"
+    assert table.profile_at(local(2026, 10, 25, 2, 30, fold=1)).name == "night"
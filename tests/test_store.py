@@ -0,0 +1,63 @@
+"""Tests for the delayed writes of the runtime state file."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.smart_vent import store  # noqa: E402
+
+
+class DebouncedStore:
+    """Store double with the trailing debounce of Store.async_delay_save."""
+
+    def __init__(self, hass, version, key):
+        self.now = 0.0
+        self.due = None
+        self.data_func = None
+        self.writes = []
+
+    def async_delay_save(self, data_func, delay):
+        # Every call replaces the armed write and restarts its delay
+        self.data_func = data_func
+        self.due = self.now + delay
+
+    def advance(self, seconds):
+        end = self.now + seconds
+        if self.due is not None and self.due <= end:
+            self.now, self.due = self.due, None
+            self.writes.append((self.now, self.data_func()))
+        self.now = end
+
+
+@pytest.fixture
+def state_store(monkeypatch):
+    monkeypatch.setattr(store, "Store", DebouncedStore)
+    snapshots = iter(range(1000))
+    return store.SmartVentStore(None, lambda: next(snapshots))
+
+
+def test_save_happens_while_evaluations_keep_arriving(state_store):
+    backend = state_store._store
+    # Evaluations every 20 s, more often than SAVE_DELAY
+    for _ in range(10):
+        state_store.async_schedule_save()
+        backend.advance(20)
+
+    times = [time for time, _ in backend.writes]
+    assert times
+    assert times[0] <= store.SAVE_DELAY
+    assert all(b - a <= store.SAVE_DELAY + 20 for a, b in zip(times, times[1:]))
+
+
+def test_changes_are_collected_into_one_write(state_store):
+    backend = state_store._store
+    for _ in range(5):
+        state_store.async_schedule_save()
+    backend.advance(store.SAVE_DELAY)
+    # The snapshot is taken once, at write time
+    assert backend.writes == [(store.SAVE_DELAY, 0)]
+
+    backend.advance(store.SAVE_DELAY)
+    assert len(backend.writes) == 1
+    state_store.async_schedule_save()
+    backend.advance(store.SAVE_DELAY)
+    assert backend.writes[1] == (3 * store.SAVE_DELAY, 1)
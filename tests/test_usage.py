@@ -0,0 +1,64 @@
+"""Tests for the per-zone usage totals."""
+import pytest
+
+from custom_components.smart_vent.kernel import Mode
+from custom_components.smart_vent.usage import PowerCurve, ZoneUsage
+
+CURVE = PowerCurve({0: 0.0, 50: 10.0, 100: 40.0})
+
+
+@pytest.mark.parametrize(
+    ("speed", "watts"),
+    [(-5, 0.0), (0, 0.0), (25, 5.0), (50, 10.0), (75, 25.0), (100, 40.0), (120, 40.0)],
+)
+def test_power_curve_interpolates_and_clamps(speed, watts):
+    assert CURVE(speed) == pytest.approx(watts)
+
+
+def test_single_point_curve_is_constant():
+    curve = PowerCurve({40: 8.0})
+    assert curve(0) == curve(40) == curve(100) == 8.0
+
+
+def test_time_and_energy_per_segment():
+    usage = ZoneUsage(CURVE)
+    usage.update(0.0, Mode.MID, 50)
+    # Same mode and speed: the segment keeps running
+    usage.update(1800.0, Mode.MID, 50)
+    usage.update(3600.0, Mode.BOOST, 100)
+
+    assert usage.seconds_in(Mode.MID, 3600.0) == 3600.0
+    assert usage.seconds_in(Mode.BOOST, 4500.0) == 900.0
+    assert usage.energy(3600.0) == pytest.approx(10.0)
+    assert usage.energy(4500.0) == pytest.approx(20.0)
+    assert usage.power() == 40.0
+
+
+def test_without_curve_no_energy():
+    usage = ZoneUsage()
+    usage.update(0.0, Mode.LOW, 20)
+    assert usage.energy(3600.0) == 0.0
+    assert usage.power() is None
+    assert usage.seconds_in(Mode.LOW, 3600.0) == 3600.0
+
+
+def test_restore_continues_the_totals():
+    usage = ZoneUsage(CURVE)
+    usage.update(0.0, Mode.MID, 50)
+    stored = usage.as_dict(7200.0)
+    assert stored["mid_seconds"] == 7200.0
+    assert stored["energy_wh"] == pytest.approx(20.0)
+
+    restored = ZoneUsage(CURVE)
+    restored.restore(stored)
+    restored.update(100.0, Mode.LOW, 0)
+    assert restored.seconds_in(Mode.MID, 200.0) == 7200.0
+    assert restored.seconds_in(Mode.LOW, 200.0) == 100.0
+    assert restored.energy(200.0) == pytest.approx(20.0)
+
+
+def test_restore_ignores_invalid_data():
+    usage = ZoneUsage(CURVE)
+    usage.restore({"mid_seconds": "later", "energy_wh": 5})
+    assert usage.mode_seconds == [0.0, 0.0, 0.0]
+    assert usage.energy_wh == 0.0